@@ -1,41 +1,58 @@
+from functools import lru_cache
 from agno.agent import Agent
 from apps.chatbot.views import storage
-from decouple import config
+from django.conf import settings
 from agno.tools.yfinance import YFinanceTools
 from agno.tools.youtube import YouTubeTools
-from agno.models.groq import Groq
 from agno.models.openai import OpenAIChat
 from agno.memory.v2.db.sqlite import SqliteMemoryDb
 from agno.memory.v2.memory import Memory
 from textwrap import dedent
+from .registry import AgentPool, PooledGroq
 
-def finance_agent(message, session_id):
-    finance_agent = Agent(
+
+@lru_cache(maxsize=None)
+def finance_tools():
+    return [YFinanceTools(stock_price=True, analyst_recommendations=True, company_info=True)]
+
+
+@lru_cache(maxsize=None)
+def study_buddy_tools():
+    return [YouTubeTools()]
+
+
+@lru_cache(maxsize=None)
+def study_buddy_memory_db():
+    return SqliteMemoryDb(table_name="memory", db_file="tmp/memory.db")
+
+
+def build_finance_agent(session_id, user_id):
+    return Agent(
         name="Finance Agent",
         role="Get financial data",
-        model=Groq(id="llama-3.3-70b-versatile", api_key=config('GROQ_API_KEY')),
-        tools=[YFinanceTools(stock_price=True, analyst_recommendations=True, company_info=True)],
+        model=PooledGroq(id="llama-3.3-70b-versatile"),
+        tools=list(finance_tools()),
         instructions="You are a financial assistant. Only provide stock information for companies explicitly mentioned by the user. If no specific company or stock symbol is mentioned, explain what financial information you can provide and ask the user to specify which company they're interested in. Use tables to display data when showing specific stock information.",
         markdown=True,
         storage=storage,
-        session_id=session_id
+        session_id=session_id,
+        user_id=user_id
     )
-    response = finance_agent.run(message)
-    return response.content
 
-def study_buddy_agent(message, session_id):
-    # Initialize memory for StudyBuddy
-    memory_db = SqliteMemoryDb(table_name="memory", db_file="tmp/memory.db")
-    memory = Memory(db=memory_db)
-    
-    study_buddy = Agent(
+
+def build_study_buddy_agent(session_id, user_id):
+    # Memory for StudyBuddy; the database handle is shared, the user memories are per agent
+    memory = Memory(db=study_buddy_memory_db())
+
+    return Agent(
         name="StudyBuddy",
         memory=memory,
-        model=Groq(id="llama-3.3-70b-versatile", api_key=config('GROQ_API_KEY')),
+        model=PooledGroq(id="llama-3.3-70b-versatile"),
         enable_user_memories=True,
         storage=storage,
         session_id=session_id,
-        tools=[YouTubeTools()],
+        user_id=user_id,
+        tools=list(study_buddy_tools()),
         description=dedent("""\        You are StudyBuddy, an expert educational mentor with deep expertise in personalized learning! 📚
 
         Your mission is to be an engaging, adaptive learning companion that helps users achieve their
@@ -93,5 +110,17 @@ def study_buddy_agent(message, session_id):
         show_tool_calls=True,
         markdown=True,
     )
-    response = study_buddy.run(message)
-    return response.content
\ No newline at end of file
+
+
+finance_agents = AgentPool(build_finance_agent, settings.AGENT_POOL_SIZE)
+study_buddy_agents = AgentPool(build_study_buddy_agent, settings.AGENT_POOL_SIZE)
+
+
+def finance_agent(message, session_id, user_id=None):
+    response = finance_agents.run(message, session_id, user_id)
+    return response.content
+
+
+def study_buddy_agent(message, session_id, user_id=None):
+    response = study_buddy_agents.run(message, session_id, user_id)
+    return response.content
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from agno.models.groq import Groq
+from decouple import config
+from groq import AsyncGroq as AsyncGroqClient, Groq as GroqClient
+
+
+@lru_cache(maxsize=None)
+def groq_client():
+    """One Groq API client per process, so every agent shares its connection pool"""
+    return GroqClient(api_key=config('GROQ_API_KEY'), max_retries=2)
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def async_groq_client():
+    """One async Groq client per event loop; its connections cannot outlive the loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncGroqClient(api_key=config('GROQ_API_KEY'), max_retries=2)
+    return client
+
+
+class PooledGroq(Groq):
+    """
+    Groq model that always talks through the shared clients. agno deep-copies
+    an agent's model for its memory managers and would otherwise open a new
+    client, and a new connection pool, for each copy and each async call.
+    """
+
+    def get_client(self):
+        return groq_client()
+
+    def get_async_client(self):
+        return async_groq_client()
+
+
+class AgentPool:
+    """
+    Per-session agents kept in a size-bounded LRU.
+
+    ``build(session_id, user_id)`` creates an agent on a miss. An agent is
+    taken out of the pool while a request uses it and put back afterwards,
+    so two concurrent requests never share one instance; the second simply
+    builds its own. Session and user ids are bound on every run.
+    """
+
+    def __init__(self, build, max_entries):
+        self.build = build
+        self.max_entries = max_entries
+        self._agents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _acquire(self, session_id, user_id):
+        with self._lock:
+            agent = self._agents.pop(session_id, None)
+        return agent if agent is not None else self.build(session_id, user_id)
+
+    def run(self, message, session_id, user_id=None, **kwargs):
+        agent = self._acquire(session_id, user_id)
+        try:
+            # agno remembers stream=True from earlier runs of the same agent
+            return agent.run(message, stream=False, session_id=session_id, user_id=user_id, **kwargs)
+        finally:
+            self._release(session_id, agent)
+
+    async def astream(self, message, session_id, user_id=None, **kwargs):
+        """Yield the run's events (content chunks, tool calls, completion) as they arrive"""
+        agent = self._acquire(session_id, user_id)
+        try:
+            events = await agent.arun(
+                message, stream=True, stream_intermediate_steps=True,
+                session_id=session_id, user_id=user_id, **kwargs
+            )
+            async for event in events:
+                yield event
+        finally:
+            self._release(session_id, agent)
+
+    def _release(self, session_id, agent):
+        with self._lock:
+            self._agents[session_id] = agent
+            self._agents.move_to_end(session_id)
+            while len(self._agents) > self.max_entries:
+                self._agents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._agents.clear()
@@ -0,0 +1,53 @@
+import json
+import logging
+from agno.run.response import RunEvent
+from django.http import StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def agent_event_stream(events, meta):
+    """
+    Turn an agent's run events into Server-Sent Events.
+
+    ``session`` comes first so the client learns its session id before any
+    token, then ``token`` for each content chunk and ``tool_call`` as tools
+    start and finish, and ``done`` at the end, or ``error`` instead.
+    """
+    yield sse('session', meta)
+    try:
+        async for event in events:
+            kind = getattr(event, 'event', None)
+            if kind == RunEvent.run_response_content.value:
+                if event.content:
+                    yield sse('token', {'content': str(event.content)})
+            elif kind == RunEvent.tool_call_started.value:
+                yield sse('tool_call', {
+                    'status': 'started', 'tool': event.tool.tool_name, 'args': event.tool.tool_args
+                })
+            elif kind == RunEvent.tool_call_completed.value:
+                yield sse('tool_call', {
+                    'status': 'completed', 'tool': event.tool.tool_name, 'error': bool(event.tool.tool_call_error)
+                })
+            elif kind == RunEvent.run_error.value:
+                logger.error(f"Agent run failed for session {meta.get('session_id')}: {event.content}")
+                yield sse('error', {'error': 'Internal server error'})
+                return
+    except Exception as e:
+        logger.error(f"Agent stream failed for session {meta.get('session_id')}: {e}")
+        yield sse('error', {'error': 'Internal server error'})
+        return
+    yield sse('done', meta)
+
+
+def event_stream_response(stream):
+    """Streaming response for Server-Sent Events; only served incrementally under ASGI"""
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
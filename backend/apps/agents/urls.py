@@ -5,4 +5,5 @@ app_name = 'agents'
 
 urlpatterns = [
     path('chat/', views.agent_chat, name='agent-chat'),
+    path('chat/stream/', views.agent_chat_stream, name='agent-chat-stream'),
 ]
\ No newline at end of file
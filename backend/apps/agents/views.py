@@ -2,8 +2,12 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
+from django.http import HttpResponseNotAllowed, JsonResponse
+from agno.run.response import RunResponseContentEvent
+import json
 import uuid
-from .agents import finance_agent, study_buddy_agent
+from .agents import finance_agent, finance_agents, study_buddy_agent, study_buddy_agents
+from .streaming import agent_event_stream, event_stream_response
 
 
 @api_view(['POST'])
@@ -52,10 +56,54 @@ def generate_agent_response(message, agent_type, session_id, user_id):
     This method is kept empty as requested - backend implementation to be added later
     """
     if agent_type == 'finance':
-        return finance_agent(message, session_id)
+        return finance_agent(message, session_id, user_id)
     elif agent_type == 'study_buddy':
-        return study_buddy_agent(message, session_id)
+        return study_buddy_agent(message, session_id, user_id)
     
     # TODO: Implement agent-specific logic here
     # For now, return a placeholder response for other agent types
-    return f"Hello! I'm a {agent_type} agent. You said: {message}"
\ No newline at end of file
+    return f"Hello! I'm a {agent_type} agent. You said: {message}"
+
+
+async def agent_chat_stream(request):
+    """
+    Stream an agent reply as Server-Sent Events: tokens and tool calls as they happen
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    message = data.get('message', '')
+    agent_type = data.get('agent_type', 'finance')
+    session_id = data.get('session_id') or str(uuid.uuid4())
+    user_id = data.get('user_id', 'anonymous')
+    if not message:
+        return JsonResponse({'error': 'Message is required'}, status=400)
+
+    events = stream_agent_response(message, agent_type, session_id, user_id)
+    return event_stream_response(
+        agent_event_stream(events, {'session_id': session_id, 'agent_type': agent_type})
+    )
+
+
+# csrf_exempt() in Django 4.2 wraps the view in a sync function, which would hide the coroutine
+agent_chat_stream.csrf_exempt = True
+
+
+async def stream_agent_response(message, agent_type, session_id, user_id):
+    """
+    Streaming counterpart of generate_agent_response, yielding the agent's run events
+    """
+    if agent_type == 'finance':
+        pool = finance_agents
+    elif agent_type == 'study_buddy':
+        pool = study_buddy_agents
+    else:
+        # Placeholder agents answer in one piece
+        yield RunResponseContentEvent(content=generate_agent_response(message, agent_type, session_id, user_id))
+        return
+    async for event in pool.astream(message, session_id, user_id):
+        yield event
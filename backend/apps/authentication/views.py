@@ -27,6 +27,7 @@ from .serializers import (
     PasswordResetConfirmSerializer
 )
 from apps.users.serializers import UserSerializer
+from apps.integrations.conditional import conditional_get
 
 User = get_user_model()
 
@@ -133,8 +134,16 @@ def logout(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _profile_validator(request):
+    """The profile only changes when the user row is saved or on login"""
+    user = request.user
+    last_modified = max(filter(None, [user.updated_at, user.last_login]))
+    return f'{user.updated_at.isoformat()}:{user.last_login}', last_modified
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(_profile_validator)
 def user_profile(request):
     """
     Get current user profile
@@ -5,4 +5,5 @@ app_name = 'chatbot'
 
 urlpatterns = [
     path('', views.chatbot_message, name='chatbot-message'),
+    path('stream/', views.chatbot_message_stream, name='chatbot-message-stream'),
 ]
\ No newline at end of file
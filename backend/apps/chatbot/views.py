@@ -6,10 +6,12 @@ from django.views.decorators.csrf import csrf_exempt
 import json
 import uuid
 from langchain_groq import ChatGroq
-from decouple import config
 from agno.agent import Agent
-from agno.models.groq import Groq
 from agno.storage.sqlite import SqliteStorage
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, JsonResponse
+from apps.agents.registry import AgentPool, PooledGroq
+from apps.agents.streaming import agent_event_stream, event_stream_response
 
 # Store agent sessions in a SQLite database
 storage = SqliteStorage(table_name="agent_sessions", db_file="tmp/agent.db")
@@ -51,32 +53,63 @@ def chatbot_message(request):
         )
 
 
+async def chatbot_message_stream(request):
+    """
+    Stream the chatbot reply as Server-Sent Events, token by token
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    message = data.get('message', '')
+    session_id = data.get('session_id') or str(uuid.uuid4())
+    user_id = data.get('user_id', 'anonymous')
+    if not message:
+        return JsonResponse({'error': 'Message is required'}, status=400)
+
+    # Unique session per user
+    events = bot_agents.astream(message, f"{user_id}_{session_id}", user_id)
+    return event_stream_response(agent_event_stream(events, {'session_id': session_id}))
+
+
+# csrf_exempt() in Django 4.2 wraps the view in a sync function, which would hide the coroutine
+chatbot_message_stream.csrf_exempt = True
+
+
+def build_bot_agent(session_id, user_id):
+    """
+    Create the chatbot agent for one session; later messages reuse it through the pool
+    """
+    return Agent(
+        model=PooledGroq(
+            id="gemma2-9b-it",
+            temperature=0,
+            max_tokens=None
+        ),
+        description="A chatbot that responds to user messages",
+        instructions="""
+            You are a helpful assistant named Mona. Always respond in plain text without any markdown formatting, emojis, or special characters. Keep your responses conversational and friendly. Remember our previous conversations in this session.""",
+        markdown=False,
+        storage=storage,
+        add_history_to_messages=True,
+        session_id=session_id,
+        user_id=user_id,
+    )
+
+
+bot_agents = AgentPool(build_bot_agent, settings.AGENT_POOL_SIZE)
+
+
 def generate_bot_response(message, session_id, user_id):
     """
     Generate a bot response based on the user message with session management
     """
     try:
-        # Create agent with session-specific configuration
-        agent = Agent(
-            model=Groq(
-                id="gemma2-9b-it",
-                temperature=0,
-                max_tokens=None,
-                timeout=None,
-                max_retries=2,
-                api_key=config('GROQ_API_KEY')
-            ),
-            description="A chatbot that responds to user messages",
-            instructions="""
-            You are a helpful assistant named Mona. Always respond in plain text without any markdown formatting, emojis, or special characters. Keep your responses conversational and friendly. Remember our previous conversations in this session.""",
-            markdown=False,
-            storage=storage,
-            add_history_to_messages=True,
-            session_id=f"{user_id}_{session_id}",  # Unique session per user
-            user_id=user_id,
-        )
-        
-        response = agent.run(message)
+        # Unique session per user
+        response = bot_agents.run(message, f"{user_id}_{session_id}", user_id)
 
         # Extract the content from the response
         if hasattr(response, 'content'):
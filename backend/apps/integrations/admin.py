@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Integration, CalendarEvent, EmailMessage, SyncLog
+from .models import (
+    Integration, CalendarEvent, EmailMessage, EmailBody, EmailAttachment, SyncLog, CalendarFeedToken, CalendarShare, WatchChannel,
+    WebhookSubscription, WebhookDelivery, SlackChannel, SlackMessage,
+    SlackNotification
+)
 
 
 @admin.register(Integration)
@@ -53,21 +57,40 @@ class CalendarEventAdmin(admin.ModelAdmin):
     )
 
 
+class EmailBodyInline(admin.StackedInline):
+    model = EmailBody
+    fields = ['body_text', 'body_html']
+    readonly_fields = ['body_text', 'body_html']
+    can_delete = False
+    classes = ['collapse']
+    
+    def body_text(self, obj):
+        return obj.get_text()
+    
+    def body_html(self, obj):
+        return obj.get_html()
+
+
+class EmailAttachmentInline(admin.TabularInline):
+    model = EmailAttachment
+    fields = ['filename', 'mime_type', 'size', 'is_inline']
+    readonly_fields = ['filename', 'mime_type', 'size', 'is_inline']
+    extra = 0
+    can_delete = False
+
+
 @admin.register(EmailMessage)
 class EmailMessageAdmin(admin.ModelAdmin):
     list_display = ['subject', 'sender', 'integration', 'received_at', 'is_read', 'synced_at']
     list_filter = ['integration__provider', 'is_read', 'is_important', 'has_attachments', 'synced_at']
-    search_fields = ['subject', 'sender', 'body_text']
+    search_fields = ['subject', 'sender']
     readonly_fields = ['provider_message_id', 'synced_at', 'created_at', 'updated_at']
     date_hierarchy = 'received_at'
+    inlines = [EmailBodyInline, EmailAttachmentInline]
     
     fieldsets = (
         ('Message Info', {
-            'fields': ('integration', 'subject', 'sender', 'recipients')
-        }),
-        ('Content', {
-            'fields': ('body_text', 'body_html'),
-            'classes': ('collapse',)
+            'fields': ('integration', 'subject', 'sender', 'recipients', 'snippet')
         }),
         ('Metadata', {
             'fields': ('received_at', 'is_read', 'is_important', 'labels')
@@ -88,7 +111,7 @@ class SyncLogAdmin(admin.ModelAdmin):
     list_display = ['integration', 'sync_type', 'status', 'items_processed', 'started_at', 'completed_at']
     list_filter = ['sync_type', 'status', 'started_at']
     search_fields = ['integration__user__email', 'error_message']
-    readonly_fields = ['started_at', 'completed_at']
+    readonly_fields = ['started_at', 'completed_at', 'metrics']
     date_hierarchy = 'started_at'
     
     fieldsets = (
@@ -96,7 +119,7 @@ class SyncLogAdmin(admin.ModelAdmin):
             'fields': ('integration', 'sync_type', 'status')
         }),
         ('Statistics', {
-            'fields': ('items_processed', 'items_created', 'items_updated', 'items_deleted')
+            'fields': ('items_processed', 'items_created', 'items_updated', 'items_deleted', 'metrics')
         }),
         ('Error Info', {
             'fields': ('error_message', 'error_details'),
@@ -105,4 +128,66 @@ class SyncLogAdmin(admin.ModelAdmin):
         ('Timestamps', {
             'fields': ('started_at', 'completed_at')
         })
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(CalendarFeedToken)
+class CalendarFeedTokenAdmin(admin.ModelAdmin):
+    list_display = ['user', 'name', 'is_active', 'last_used_at', 'created_at']
+    list_filter = ['is_active', 'created_at']
+    search_fields = ['user__email', 'name']
+    readonly_fields = ['token', 'last_used_at', 'created_at']
+
+
+@admin.register(CalendarShare)
+class CalendarShareAdmin(admin.ModelAdmin):
+    list_display = ['owner', 'email', 'created_at']
+    search_fields = ['owner__email', 'email']
+    readonly_fields = ['created_at']
+
+
+@admin.register(WatchChannel)
+class WatchChannelAdmin(admin.ModelAdmin):
+    list_display = ['integration', 'resource_type', 'calendar_id', 'expires_at', 'created_at']
+    list_filter = ['resource_type', 'expires_at']
+    search_fields = ['integration__user__email', 'channel_id', 'resource_id']
+    readonly_fields = ['channel_id', 'resource_id', 'token', 'created_at']
+
+
+@admin.register(WebhookSubscription)
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ['integration', 'resource', 'expires_at', 'created_at']
+    search_fields = ['integration__user__email', 'subscription_id']
+    readonly_fields = ['subscription_id', 'secret', 'created_at']
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['integration', 'event_type', 'status', 'attempts', 'received_at', 'processed_at']
+    list_filter = ['status', 'event_type', 'received_at']
+    search_fields = ['integration__user__email', 'delivery_id']
+    readonly_fields = ['delivery_id', 'payload', 'received_at', 'processed_at']
+
+
+@admin.register(SlackChannel)
+class SlackChannelAdmin(admin.ModelAdmin):
+    list_display = ['name', 'integration', 'is_private', 'is_member', 'is_archived', 'num_members', 'synced_at']
+    list_filter = ['is_private', 'is_member', 'is_archived']
+    search_fields = ['name', 'channel_id', 'integration__user__email']
+    readonly_fields = ['channel_id', 'last_message_ts', 'synced_at', 'created_at']
+
+
+@admin.register(SlackMessage)
+class SlackMessageAdmin(admin.ModelAdmin):
+    list_display = ['channel', 'slack_user_id', 'sent_at', 'reply_count']
+    list_filter = ['sent_at']
+    search_fields = ['text', 'channel__name']
+    readonly_fields = ['ts', 'created_at', 'updated_at']
+
+
+@admin.register(SlackNotification)
+class SlackNotificationAdmin(admin.ModelAdmin):
+    list_display = ['integration', 'channel', 'event_type', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status', 'event_type', 'created_at']
+    search_fields = ['integration__user__email', 'channel', 'text']
+    readonly_fields = ['created_at', 'sent_at']
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class IntegrationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.integrations'
\ No newline at end of file
+    name = 'apps.integrations'
+    
+    def ready(self):
+        from . import receivers  # noqa: F401
@@ -0,0 +1,144 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from pathlib import Path
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class AttachmentCache:
+    """
+    Content-addressed on-disk store for attachment bytes.
+
+    Files are named by their SHA-256 digest, so identical attachments shared
+    by many emails are stored once. The total size is bounded and the least
+    recently used files are evicted first (file mtime is bumped on every hit).
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes_since_scan = None
+
+    def path_for(self, digest):
+        """Return the on-disk path for a digest"""
+        return self.root / digest[:2] / digest
+
+    def get(self, digest):
+        """Return the path of a cached file and mark it as recently used"""
+        if not digest:
+            return None
+        path = self.path_for(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def open(self, digest):
+        """
+        Open a cached file for reading and mark it as recently used.
+
+        The open descriptor keeps the bytes readable even if eviction or
+        another worker removes the file afterwards.
+        """
+        if not digest:
+            return None
+        try:
+            cached_file = open(self.path_for(digest), 'rb')
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(cached_file.fileno())
+        except OSError:
+            pass
+        return cached_file
+
+    def put(self, content):
+        """Store content and return its SHA-256 digest"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.path_for(digest)
+
+        if self.get(digest) is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see partial content
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    tmp_file.write(content)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._maybe_evict(len(content))
+
+        return digest
+
+    def _maybe_evict(self, written):
+        """Run an eviction pass once enough new bytes have been written"""
+        with self._lock:
+            if self._bytes_since_scan is not None:
+                self._bytes_since_scan += written
+                if self._bytes_since_scan < self.max_bytes // 10:
+                    return
+            self._bytes_since_scan = 0
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used files until the cache fits its budget"""
+        entries = []
+        total = 0
+        for shard in self.root.glob('??'):
+            for entry in os.scandir(shard):
+                if entry.name.startswith('.tmp-') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, file_path in entries:
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+        logger.info(f"Attachment cache evicted down to {total} bytes")
+
+
+def iter_file_mmap(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream an open file through a read-only memory map, closing it at the end"""
+    with file as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, size, chunk_size):
+                yield mapped[offset:offset + chunk_size]
+
+
+_cache = None
+
+
+def get_attachment_cache():
+    """Return the process-wide attachment cache configured in settings"""
+    global _cache
+    if _cache is None:
+        _cache = AttachmentCache(
+            settings.ATTACHMENT_CACHE_DIR,
+            settings.ATTACHMENT_CACHE_MAX_BYTES,
+        )
+    return _cache
@@ -0,0 +1,128 @@
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+# Characters that must be escaped in PostgreSQL's COPY text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bytes, memoryview)):
+        return '\\\\x' + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class BulkWriter:
+    """
+    Insert plain row tuples into a model's table, bypassing model instances.
+
+    Rows carry their primary key (see reserve_ids) and every column listed
+    in ``fields``; save(), signals and auto_now are not involved. On
+    PostgreSQL batches are streamed with COPY, elsewhere they go through
+    executemany. ``parents`` are flushed first so foreign keys always point
+    at rows that already exist.
+    """
+
+    def __init__(self, model, fields, batch_size=10000, parents=()):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.batch_size = batch_size
+        self.parents = parents
+        self.rows = []
+        self.written = 0
+        self.table = model._meta.db_table
+        self.columns = [field.column for field in self.fields]
+        self.converters = [self._converter(field) for field in self.fields]
+
+    @staticmethod
+    def _converter(field):
+        internal_type = field.get_internal_type()
+        if internal_type == 'JSONField':
+            return lambda value: None if value is None else json.dumps(value)
+        if internal_type == 'DateTimeField':
+            if connection.vendor in ('sqlite', 'mysql') and settings.USE_TZ:
+                # What adapt_datetimefield_value produces for these backends, minus its per-value checks
+                return lambda value: None if value is None else str(
+                    value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+                )
+            return connection.ops.adapt_datetimefield_value
+        return None
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for parent in self.parents:
+            parent.flush()
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                self._copy(cursor, rows)
+            else:
+                self._executemany(cursor, rows)
+        self.written += len(rows)
+
+    def _copy(self, cursor, rows):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(map(_copy_value, row)))
+            buffer.write('\n')
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        cursor.cursor.copy_expert(
+            f"COPY {quote(self.table)} ({', '.join(map(quote, self.columns))}) FROM STDIN",
+            buffer
+        )
+
+    def _executemany(self, cursor, rows):
+        converters = [(index, convert) for index, convert in enumerate(self.converters) if convert]
+        if converters:
+            converted = []
+            for row in rows:
+                row = list(row)
+                for index, convert in converters:
+                    row[index] = convert(row[index])
+                converted.append(row)
+            rows = converted
+        quote = connection.ops.quote_name
+        placeholders = ', '.join(['%s'] * len(self.columns))
+        cursor.executemany(
+            f"INSERT INTO {quote(self.table)} ({', '.join(map(quote, self.columns))}) VALUES ({placeholders})",
+            rows
+        )
+
+
+def reserve_ids(model):
+    """Return the first free primary key; rows written with explicit ids count up from it"""
+    return (model.objects.aggregate(highest=Max('pk'))['highest'] or 0) + 1
+
+
+def finish_load(models):
+    """Move sequences past explicitly inserted ids and refresh planner statistics"""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+        if connection.vendor == 'postgresql':
+            for model in models:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        elif connection.vendor == 'sqlite':
+            cursor.execute('ANALYZE')
@@ -0,0 +1,17 @@
+from django.db.models import Exists, OuterRef
+
+
+def exclude_duplicate_events(queryset):
+    """
+    Collapse events that share a fingerprint, keeping the oldest row.
+
+    The check is a correlated ``NOT EXISTS`` on the indexed fingerprint column,
+    run against the same (already filtered) queryset, so filtering by provider
+    still returns that provider's copy of a meeting. Cancelled copies never
+    hide a live one.
+    """
+    duplicates = queryset.filter(
+        fingerprint=OuterRef('fingerprint'),
+        id__lt=OuterRef('id'),
+    ).exclude(fingerprint='').exclude(event_status='cancelled')
+    return queryset.filter(~Exists(duplicates.values('id')))
@@ -0,0 +1,95 @@
+import csv
+import json
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from .ical import calendar_footer, calendar_header, event_to_vevent, recurring_master_keys
+
+EXPORT_BATCH_SIZE = 2000
+
+EVENT_EXPORT_FIELDS = [
+    'id', 'provider', 'provider_event_id', 'title', 'description', 'location',
+    'start_time', 'end_time', 'is_all_day', 'timezone', 'attendees', 'created_by',
+    'event_status', 'recurrence', 'is_recurring', 'recurring_event_id',
+    'original_start_time', 'last_modified',
+]
+
+EMAIL_EXPORT_FIELDS = [
+    'id', 'provider', 'provider_message_id', 'thread_id', 'subject', 'sender',
+    'recipients', 'snippet', 'received_at', 'is_read', 'is_important', 'labels',
+    'has_attachments', 'attachment_count',
+]
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'ics': 'text/calendar; charset=utf-8',
+}
+
+
+def iter_export_rows(queryset, fields, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield rows as dicts in id order, one short keyset query per batch.
+
+    Each batch is a separate ``WHERE id > last ORDER BY id LIMIT n`` query, so
+    memory stays bounded by the batch size and no cursor or transaction stays
+    open while the client is slowly reading the response.
+    """
+    columns = [field for field in fields if field != 'provider']
+    queryset = queryset.order_by('id').values(*columns, provider=F('integration__provider'))
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]['id']
+
+
+class _Echo:
+    """Pseudo-buffer that hands back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None:
+        return ''
+    return value
+
+
+def stream_ndjson(batches):
+    for batch in batches:
+        yield ''.join(json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in batch)
+
+
+def stream_csv(batches, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for batch in batches:
+        yield ''.join(writer.writerow([_csv_value(row[field]) for field in fields]) for row in batch)
+
+
+def stream_ics(batches, name=None, masters=frozenset()):
+    yield calendar_header(name)
+    for batch in batches:
+        yield ''.join(event_to_vevent(row, masters) for row in batch)
+    yield calendar_footer()
+
+
+def stream_export(queryset, fields, export_format, name=None):
+    """Return a generator of text chunks for an export in the given format"""
+    batches = iter_export_rows(queryset, fields)
+    if export_format == 'ndjson':
+        return stream_ndjson(batches)
+    if export_format == 'csv':
+        return stream_csv(batches, fields)
+    if export_format == 'ics':
+        return stream_ics(batches, name, recurring_master_keys(queryset))
+    raise ValueError(f'Unsupported export format: {export_format}')
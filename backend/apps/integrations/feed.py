@@ -0,0 +1,82 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .ical import calendar_footer, calendar_header, event_to_vevent, recurring_master_keys
+from .models import CalendarEvent
+
+VEVENT_CACHE_TIMEOUT = 7 * 24 * 3600
+FEED_CACHE_TIMEOUT = 600
+
+FEED_EVENT_FIELDS = [
+    'id', 'provider_event_id', 'title', 'description', 'location', 'start_time',
+    'end_time', 'is_all_day', 'timezone', 'attendees', 'created_by', 'event_status',
+    'recurrence', 'recurring_event_id', 'original_start_time', 'last_modified',
+]
+
+
+def _vevent_key(event_id, updated_at, in_series):
+    # An override renders differently once its master leaves or joins the feed
+    return f'ics-vevent:{event_id}:{updated_at.timestamp()}:{int(in_series)}'
+
+
+def feed_window_start():
+    """Feeds cover recent history and everything ahead"""
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS)
+
+
+def feed_events(user_id):
+    """Events in a user's feed; recurring masters are kept whenever they started"""
+    return CalendarEvent.objects.filter(integration__user_id=user_id).filter(
+        Q(end_time__gte=feed_window_start()) | Q(is_recurring=True)
+    )
+
+
+def render_feed(user_id):
+    """
+    Render a user's feed, reusing cached VEVENT blocks.
+
+    Only ids, ``updated_at`` and series ids are read for the whole feed, plus
+    the keys of its recurring masters; full rows are fetched and rendered just
+    for events whose block is not cached for that ``updated_at``, so an
+    unchanged calendar costs two narrow queries.
+    """
+    events = feed_events(user_id)
+    masters = recurring_master_keys(events)
+    versions = list(events.order_by('start_time', 'id').values_list(
+        'id', 'updated_at', 'integration__provider', 'recurring_event_id'
+    ))
+    keys = {
+        event_id: _vevent_key(event_id, updated_at, (provider, series_id) in masters)
+        for event_id, updated_at, provider, series_id in versions
+    }
+    blocks = cache.get_many(list(keys.values()))
+
+    missing = [event_id for event_id, key in keys.items() if key not in blocks]
+    if missing:
+        rendered = {}
+        rows = events.filter(id__in=missing).values(
+            *FEED_EVENT_FIELDS, 'updated_at', provider=F('integration__provider')
+        )
+        for row in rows.iterator(chunk_size=2000):
+            rendered[keys[row['id']]] = event_to_vevent(row, masters)
+        cache.set_many(rendered, VEVENT_CACHE_TIMEOUT)
+        blocks.update(rendered)
+
+    parts = [calendar_header('Integrato')]
+    parts.extend(blocks[keys[event_id]] for event_id, *_ in versions if keys[event_id] in blocks)
+    parts.append(calendar_footer())
+    return ''.join(parts)
+
+
+def get_feed(user_id, generation):
+    """Return the rendered feed, cached per data generation and feed window"""
+    cache_key = f'ics-feed:{user_id}:{generation}:{feed_window_start().date().isoformat()}'
+    body = cache.get(cache_key)
+    if body is None:
+        body = render_feed(user_id)
+        cache.set(cache_key, body, FEED_CACHE_TIMEOUT)
+    return body
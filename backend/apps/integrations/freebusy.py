@@ -0,0 +1,118 @@
+import heapq
+from django.core.cache import cache
+
+from .dedupe import exclude_duplicate_events
+from .models import CalendarEvent
+from .recurrence import expand_masters
+
+FREEBUSY_CACHE_TIMEOUT = 300
+
+
+def merge_busy_intervals(events, range_start, range_end):
+    """
+    Merge events into busy intervals and find overlapping events.
+
+    ``events`` is an iterable of ``(event_id, start, end)`` sorted by start.
+    A single sweep merges touching or overlapping intervals into busy blocks
+    and groups events that strictly overlap into conflicts.
+    """
+    busy = []
+    conflicts = []
+
+    block_start = block_end = None
+    cluster_ids = []
+    cluster_start = cluster_end = None
+
+    for event_id, start, end in events:
+        start = max(start, range_start)
+        end = min(end, range_end)
+        if end <= start:
+            continue
+
+        # Busy blocks: merge anything that touches the current block
+        if block_end is not None and start <= block_end:
+            block_end = max(block_end, end)
+        else:
+            if block_end is not None:
+                busy.append((block_start, block_end))
+            block_start, block_end = start, end
+
+        # Conflicts: events that start before the current cluster ends
+        if cluster_end is not None and start < cluster_end:
+            cluster_ids.append(event_id)
+            cluster_end = max(cluster_end, end)
+        else:
+            if len(cluster_ids) > 1:
+                conflicts.append((cluster_start, cluster_end, cluster_ids))
+            cluster_ids = [event_id]
+            cluster_start, cluster_end = start, end
+
+    if block_end is not None:
+        busy.append((block_start, block_end))
+    if len(cluster_ids) > 1:
+        conflicts.append((cluster_start, cluster_end, cluster_ids))
+
+    return busy, conflicts
+
+
+def _version_key(user_id):
+    return f'calendar-version:{user_id}'
+
+
+def get_calendar_version(user_id):
+    """Return the version number embedded in a user's calendar cache keys"""
+    return cache.get_or_set(_version_key(user_id), 1, None)
+
+
+def invalidate_freebusy(user_id):
+    """Invalidate every cached free/busy computation of a user in O(1)"""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 1, None)
+
+
+def get_freebusy(user, range_start, range_end, include_all_day=False):
+    """Return cached busy intervals and conflicts for a user's calendars"""
+    version = get_calendar_version(user.id)
+    cache_key = (
+        f'freebusy:{user.id}:{version}:{range_start.isoformat()}:'
+        f'{range_end.isoformat()}:{int(include_all_day)}'
+    )
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+
+    events = CalendarEvent.objects.filter(integration__user=user).exclude(event_status='cancelled')
+    if not include_all_day:
+        events = events.filter(is_all_day=False)
+    # The same meeting synced from two providers is not a conflict
+    events = exclude_duplicate_events(events)
+
+    masters = events.filter(is_recurring=True, start_time__lt=range_end)
+    occurrences = sorted(
+        (occurrence.id, occurrence.start_time, occurrence.end_time)
+        for occurrence in expand_masters(masters, range_start, range_end)
+    )
+    rows = events.filter(
+        is_recurring=False,
+        start_time__lt=range_end,
+        end_time__gt=range_start,
+    ).order_by('start_time').values_list('id', 'start_time', 'end_time')
+    busy, conflicts = merge_busy_intervals(
+        heapq.merge(rows.iterator(chunk_size=2000), occurrences, key=lambda event: event[1]),
+        range_start,
+        range_end,
+    )
+
+    result = {
+        'start': range_start,
+        'end': range_end,
+        'busy': [{'start': start, 'end': end} for start, end in busy],
+        'conflicts': [
+            {'start': start, 'end': end, 'event_ids': event_ids}
+            for start, end, event_ids in conflicts
+        ],
+    }
+    cache.set(cache_key, result, FREEBUSY_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,146 @@
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+CRLF = '\r\n'
+EVENT_STATUSES = {'confirmed': 'CONFIRMED', 'tentative': 'TENTATIVE', 'cancelled': 'CANCELLED'}
+
+
+def escape_text(value):
+    """Escape a TEXT value (RFC 5545 section 3.3.11)"""
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """Fold a content line into 75-octet pieces without splitting UTF-8 sequences"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + CRLF
+
+    pieces = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Step back off UTF-8 continuation bytes
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(encoded[start:end].decode('utf-8'))
+        start = end
+        limit = 74  # continuation lines start with a space
+    return (CRLF + ' ').join(pieces) + CRLF
+
+
+def format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def format_date(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%d')
+
+
+def datetime_property(name, value, zone=None):
+    """A DATE-TIME property in UTC, or as wall time in ``zone`` with a TZID parameter"""
+    if zone is None:
+        return f'{name}:{format_datetime(value)}'
+    return f"{name};TZID={zone.key}:{value.astimezone(zone).strftime('%Y%m%dT%H%M%S')}"
+
+
+def event_zone(event):
+    """The event's zone, if it is a known IANA name; Graph may send Windows names"""
+    try:
+        return ZoneInfo(event.get('timezone') or '')
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def recurring_master_keys(queryset):
+    """``(provider, provider_event_id)`` of the recurring masters in an event queryset"""
+    return set(queryset.filter(is_recurring=True).values_list('integration__provider', 'provider_event_id'))
+
+
+def calendar_header(name=None):
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Integrato//Calendar Export//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+    ]
+    if name:
+        lines.append(f'X-WR-CALNAME:{escape_text(name)}')
+    return ''.join(fold_line(line) for line in lines)
+
+
+def calendar_footer():
+    return 'END:VCALENDAR' + CRLF
+
+
+def event_to_vevent(event, masters=frozenset()):
+    """
+    Render one event as a VEVENT block.
+
+    ``event`` is a dict with CalendarEvent field names plus ``provider``, as
+    produced by ``QuerySet.values()``, so exports never build model instances.
+    ``masters`` holds the ``recurring_master_keys`` of the calendar being
+    rendered. A modified occurrence joins its series (master UID plus
+    RECURRENCE-ID) only when the master is in it; otherwise it is written as
+    a standalone event, which clients would drop or mis-merge as an orphan.
+    Series are written in their own zone so they keep their wall time across
+    DST changes.
+    """
+    provider = event['provider']
+    series_id = event.get('recurring_event_id')
+    in_series = bool(series_id) and (provider, series_id) in masters
+    recurrence = event.get('recurrence') or []
+    zone = event_zone(event) if (recurrence or in_series) and not event['is_all_day'] else None
+
+    uid_source = series_id if in_series else event['provider_event_id']
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{escape_text(uid_source)}@{provider}.integrato',
+        f"DTSTAMP:{format_datetime(event['last_modified'])}",
+    ]
+    if event['is_all_day']:
+        lines.append(f"DTSTART;VALUE=DATE:{format_date(event['start_time'])}")
+        lines.append(f"DTEND;VALUE=DATE:{format_date(event['end_time'])}")
+    else:
+        lines.append(datetime_property('DTSTART', event['start_time'], zone))
+        lines.append(datetime_property('DTEND', event['end_time'], zone))
+
+    if in_series and event.get('original_start_time'):
+        if event['is_all_day']:
+            lines.append(f"RECURRENCE-ID;VALUE=DATE:{format_date(event['original_start_time'])}")
+        else:
+            lines.append(datetime_property('RECURRENCE-ID', event['original_start_time'], zone))
+    for rule in recurrence:
+        lines.append(rule)
+
+    lines.append(f"SUMMARY:{escape_text(event['title'])}")
+    if event.get('description'):
+        lines.append(f"DESCRIPTION:{escape_text(event['description'])}")
+    if event.get('location'):
+        lines.append(f"LOCATION:{escape_text(event['location'])}")
+    status = EVENT_STATUSES.get((event.get('event_status') or '').lower())
+    if status:
+        lines.append(f'STATUS:{status}')
+    if event.get('created_by'):
+        lines.append(f"ORGANIZER:mailto:{event['created_by']}")
+    for attendee in event.get('attendees') or []:
+        if isinstance(attendee, dict):
+            email = attendee.get('email')
+            name = attendee.get('displayName')
+        else:
+            email, name = attendee, None
+        if not email:
+            continue
+        params = f';CN="{name}"' if name and '"' not in name else ''
+        lines.append(f'ATTENDEE{params}:mailto:{email}')
+    lines.append('END:VEVENT')
+    return ''.join(fold_line(line) for line in lines)
@@ -0,0 +1,89 @@
+import hashlib
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+import logging
+
+from .models import Integration, WebhookDelivery
+from .services import get_oauth_service
+
+logger = logging.getLogger(__name__)
+
+
+def delivery_key(*parts):
+    """Hash the provider identifiers of a change into a fixed-size delivery id"""
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def record_deliveries(integration_id, deliveries):
+    """
+    Write notifications to the inbox, dropping ones already recorded.
+
+    ``deliveries`` is an iterable of ``(delivery_id, event_type, payload)``.
+    Providers retry until they get a 2xx, so the same change can arrive more
+    than once; the unique constraint turns repeats into no-ops.
+    """
+    WebhookDelivery.objects.bulk_create(
+        [
+            WebhookDelivery(
+                integration_id=integration_id,
+                delivery_id=delivery_id,
+                event_type=event_type,
+                payload=payload
+            )
+            for delivery_id, event_type, payload in deliveries
+        ],
+        ignore_conflicts=True
+    )
+
+
+def process_deliveries(integration_id):
+    """
+    Apply the pending inbox rows of one integration in batches.
+
+    Each batch goes to the provider service in one call, which coalesces
+    changes to the same event. A failing batch stays pending and is retried
+    until WEBHOOK_MAX_ATTEMPTS, then marked failed. Returns the number of
+    deliveries applied.
+    """
+    pending = WebhookDelivery.objects.filter(integration_id=integration_id, status='pending')
+    integration = Integration.objects.filter(id=integration_id, status='connected', sync_enabled=True).first()
+    if integration is None:
+        pending.update(status='ignored', processed_at=timezone.now())
+        return 0
+
+    service = get_oauth_service(integration)
+    applied = 0
+    while True:
+        batch = list(pending.order_by('id')[:settings.WEBHOOK_BATCH_SIZE])
+        if not batch:
+            break
+        batch_ids = [delivery.id for delivery in batch]
+
+        try:
+            service.apply_webhook_deliveries(batch)
+        except Exception as e:
+            logger.error(f"Applying {len(batch)} webhook deliveries failed for {integration}: {e}")
+            WebhookDelivery.objects.filter(id__in=batch_ids).update(
+                attempts=F('attempts') + 1,
+                error_message=str(e),
+                status=Case(
+                    When(attempts__gte=settings.WEBHOOK_MAX_ATTEMPTS - 1, then=Value('failed')),
+                    default=Value('pending')
+                )
+            )
+            break
+
+        WebhookDelivery.objects.filter(id__in=batch_ids).update(
+            status='processed', attempts=F('attempts') + 1, processed_at=timezone.now()
+        )
+        applied += len(batch)
+    return applied
+
+
+def purge_deliveries():
+    """Delete finished inbox rows older than the retention period"""
+    cutoff = timezone.now() - timedelta(days=settings.WEBHOOK_DELIVERY_RETENTION_DAYS)
+    deleted, _ = WebhookDelivery.objects.filter(received_at__lt=cutoff).exclude(status='pending').delete()
+    return deleted
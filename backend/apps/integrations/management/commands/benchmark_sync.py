@@ -0,0 +1,253 @@
+import json
+import platform
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+from pathlib import Path
+import django
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.integrations.models import Integration, SyncLog
+from apps.integrations.services import (
+    CalendlyOAuthService, GitHubOAuthService, GoogleOAuthService, MicrosoftOAuthService
+)
+from apps.integrations.simulator import ProviderSimulator, simulated_providers
+from apps.integrations.sync_metrics import session, start_recording, stop_recording
+
+User = get_user_model()
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'sync_baseline.json'
+
+
+def _sync_google_calendar(integration, items):
+    GoogleOAuthService(integration).sync_calendar_events()
+
+
+def _sync_google_gmail(integration, items):
+    GoogleOAuthService(integration).sync_gmail_messages(max_results=items)
+
+
+def _sync_microsoft_calendar(integration, items):
+    MicrosoftOAuthService(integration).sync_calendar_events()
+
+
+def _sync_calendly(integration, items):
+    CalendlyOAuthService(integration).sync_scheduled_events()
+
+
+def _list_github_repositories(integration, items):
+    # GitHub has no stored sync; page through the repository list instead
+    service = GitHubOAuthService(integration)
+    recorder = start_recording()
+    page = 1
+    try:
+        while len(service.get_repositories(per_page=100, page=page)) == 100:
+            page += 1
+    finally:
+        metrics = stop_recording(recorder)
+    return metrics
+
+
+# scenario -> (integration provider, function running the sync)
+SCENARIOS = {
+    'google_calendar': ('google_calendar', _sync_google_calendar),
+    'google_gmail': ('google_gmail', _sync_google_gmail),
+    'microsoft_calendar': ('microsoft_calendar', _sync_microsoft_calendar),
+    'calendly': ('calendly', _sync_calendly),
+    'github': ('github', _list_github_repositories),
+}
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Measure sync throughput against simulated Google, Microsoft, Calendly and GitHub APIs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000,100000',
+            help='Comma-separated numbers of upstream items to sync'
+        )
+        parser.add_argument(
+            '--scenarios', default=','.join(SCENARIOS),
+            help=f"Comma-separated scenarios to run ({', '.join(SCENARIOS)})"
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument(
+            '--baseline', default=str(DEFAULT_BASELINE),
+            help='Baseline JSON to compare against; skipped when the file does not exist'
+        )
+        parser.add_argument(
+            '--require-baseline', action='store_true',
+            help='Fail instead of skipping the comparison when the baseline file does not exist'
+        )
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='Store the results as the new baseline instead of comparing'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=20.0,
+            help='Percent a figure may worsen against the baseline before it counts as a regression'
+        )
+        parser.add_argument(
+            '--no-memory', action='store_true',
+            help='Skip tracemalloc; faster, but no peak memory figures'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        baseline_path = Path(options['baseline'])
+        if options['require_baseline'] and not options['update_baseline'] and not baseline_path.exists():
+            raise CommandError(f'No baseline at {baseline_path}; record one with --update-baseline')
+
+        trace_memory = not options['no_memory']
+        results = []
+        # Tokens are stored encrypted, so a run without a configured key uses a throwaway one.
+        # Calls are answered in-process, never by an external simulator
+        with override_settings(
+            SYNC_TRACEMALLOC=trace_memory,
+            PROVIDER_SIMULATOR_URL='',
+            ENCRYPTION_KEY=getattr(settings, 'ENCRYPTION_KEY', None) or Fernet.generate_key(),
+        ):
+            for scenario in scenarios:
+                for size in sizes:
+                    result = self._run(scenario, size)
+                    results.append(result)
+                    self.stdout.write(
+                        f"{scenario:<20} {size:>7} items  {result['items_per_second']:>9.1f} items/s  "
+                        f"{result['http_calls']:>6} calls  {result['db_queries']:>7} queries  "
+                        f"{self._format_memory(result.get('peak_memory_bytes'))}"
+                    )
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'trace_memory': trace_memory,
+            },
+            'results': results,
+        }
+        if options['output']:
+            self._write(options['output'], report)
+            self.stdout.write(f"Wrote results to {options['output']}")
+
+        if options['update_baseline']:
+            self._write(baseline_path, report)
+            self.stdout.write(self.style.SUCCESS(f'Stored the results as the baseline in {baseline_path}'))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f'No baseline at {baseline_path}; pass --update-baseline to store one')
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get('environment', {}).get('trace_memory') != trace_memory:
+            self.stdout.write(self.style.WARNING(
+                'The baseline was recorded with a different --no-memory setting; throughput is not comparable'
+            ))
+        regressions = self._compare(results, baseline.get('results', []), options['tolerance'])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f'{len(regressions)} regressions against {baseline_path}')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
+
+    def _run(self, scenario, size):
+        provider, sync = SCENARIOS[scenario]
+        counter = QueryCounter()
+        simulator = ProviderSimulator(items=size)
+
+        # Every scenario starts from an empty account and leaves nothing behind
+        with transaction.atomic():
+            integration = self._create_integration(provider)
+            with ExitStack() as stack:
+                stack.enter_context(simulated_providers(session, simulator))
+                for db_connection in connections.all():
+                    stack.enter_context(db_connection.execute_wrapper(counter))
+                started = time.perf_counter()
+                metrics = sync(integration, size)
+                seconds = time.perf_counter() - started
+            if metrics is None:
+                metrics = SyncLog.objects.filter(integration=integration).latest('started_at').metrics
+            transaction.set_rollback(True)
+
+        result = {
+            'scenario': scenario,
+            'items': size,
+            'seconds': round(seconds, 3),
+            'items_per_second': round(size / seconds, 1) if seconds else None,
+            'http_calls': metrics.get('http_calls', simulator.calls),
+            'db_queries': counter.count,
+            'phases_ms': metrics.get('phases', {}),
+        }
+        if 'peak_memory_bytes' in metrics:
+            result['peak_memory_bytes'] = metrics['peak_memory_bytes']
+        return result
+
+    def _create_integration(self, provider):
+        user, _ = User.objects.get_or_create(
+            email='sync-benchmark@example.com', defaults={'username': 'sync-benchmark'}
+        )
+        integration = Integration(
+            user=user,
+            provider=provider,
+            status='connected',
+            token_expires_at=timezone.now() + timedelta(hours=1),
+            provider_email='owner@example.com'
+        )
+        integration.set_access_token('simulated-access-token')
+        integration.set_refresh_token('simulated-refresh-token')
+        integration.save()
+        return integration
+
+    @staticmethod
+    def _compare(results, baseline_results, tolerance):
+        """List the figures that worsened by more than ``tolerance`` percent"""
+        baseline = {(result['scenario'], result['items']): result for result in baseline_results}
+        factor = tolerance / 100
+        regressions = []
+        for result in results:
+            previous = baseline.get((result['scenario'], result['items']))
+            if previous is None:
+                continue
+            label = f"{result['scenario']} at {result['items']} items"
+            if previous.get('items_per_second') and result['items_per_second'] < previous['items_per_second'] * (1 - factor):
+                regressions.append(
+                    f"{label}: {result['items_per_second']} items/s, baseline {previous['items_per_second']}"
+                )
+            for key in ('http_calls', 'db_queries', 'peak_memory_bytes'):
+                if key in previous and key in result and result[key] > previous[key] * (1 + factor):
+                    regressions.append(f"{label}: {result[key]} {key}, baseline {previous[key]}")
+        return regressions
+
+    @staticmethod
+    def _write(path, report):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + '\n')
+
+    @staticmethod
+    def _format_memory(value):
+        return f'{value / 2 ** 20:.1f} MiB peak' if value is not None else ''
@@ -0,0 +1,81 @@
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.integrations.models import Integration
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Create the accounts and connected integrations used by the load test harness (python -m loadtest)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=1000)
+        parser.add_argument('--user-pattern', default='loadtest-{n}@example.com')
+        parser.add_argument('--password', default='loadtest-password')
+        parser.add_argument(
+            '--providers', default='google_calendar,google_gmail',
+            help='Integrations to connect for every account'
+        )
+        parser.add_argument('--delete', action='store_true', help='Remove the load test accounts instead')
+
+    def handle(self, *args, **options):
+        emails = [options['user_pattern'].format(n=n) for n in range(options['accounts'])]
+        if options['delete']:
+            deleted, _ = User.objects.filter(email__in=emails).delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} rows'))
+            return
+
+        providers = [provider.strip() for provider in options['providers'].split(',') if provider.strip()]
+        unknown = set(providers) - {choice for choice, _ in Integration.PROVIDER_CHOICES}
+        if unknown:
+            raise CommandError(f"Unknown providers: {', '.join(sorted(unknown))}")
+        if providers and not getattr(settings, 'ENCRYPTION_KEY', None):
+            raise CommandError('ENCRYPTION_KEY must be set, or the stored tokens cannot be read back')
+        if providers and not settings.PROVIDER_SIMULATOR_URL:
+            self.stdout.write(self.style.WARNING(
+                'PROVIDER_SIMULATOR_URL is not set; syncs of these accounts would call the real providers'
+            ))
+
+        # Hash and encrypt once; every account shares the same password and tokens
+        password = make_password(options['password'])
+        template = Integration()
+        template.set_access_token('loadtest-access-token')
+        template.set_refresh_token('loadtest-refresh-token')
+
+        with transaction.atomic():
+            existing = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+            User.objects.bulk_create([
+                User(email=email, username=email.split('@')[0], password=password, is_email_verified=True)
+                for email in emails if email not in existing
+            ], batch_size=1000)
+
+            users = User.objects.filter(email__in=emails)
+            connected = set(
+                Integration.objects.filter(user__in=users, provider__in=providers).values_list('user_id', 'provider')
+            )
+            expires_at = timezone.now() + timedelta(days=365)
+            Integration.objects.bulk_create([
+                Integration(
+                    user_id=user_id,
+                    provider=provider,
+                    status='connected',
+                    access_token=template.access_token,
+                    refresh_token=template.refresh_token,
+                    token_expires_at=expires_at,
+                    provider_email='owner@example.com'
+                )
+                for user_id in users.values_list('id', flat=True)
+                for provider in providers
+                if (user_id, provider) not in connected
+            ], batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(emails) - len(existing)} accounts created, {len(existing)} already present, '
+            f"each with {', '.join(providers) or 'no integrations'}"
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.integrations.simulator import ProviderSimulator, make_server
+
+
+class Command(BaseCommand):
+    help = 'Serve simulated provider APIs over HTTP, with optional latency, throttling and failures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8099)
+        parser.add_argument('--items', type=int, default=1000, help='Entries in every simulated collection')
+        parser.add_argument(
+            '--latency', default='none',
+            help='Latency per call in ms: none, fixed:50, uniform:10,200, normal:100,30 or lognormal:80,0.5'
+        )
+        parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of calls answered with 429')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of calls answered with a 5xx')
+        parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on 429 and 503')
+        parser.add_argument(
+            '--token-ttl', type=int, default=0,
+            help='Seconds before an access token is rejected; 0 never expires them'
+        )
+        parser.add_argument(
+            '--changes', type=int, default=0,
+            help='Entries changed between two incremental syncs (calendar sync tokens, Gmail history)'
+        )
+        parser.add_argument('--slack-channels', type=int, default=5)
+        parser.add_argument('--seed', type=int, help='Seed for latency and fault sampling')
+        parser.add_argument('--verbose-requests', action='store_true', help='Log every request')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['throttle_rate'] + options['error_rate'] <= 1:
+            raise CommandError('--throttle-rate and --error-rate must add up to between 0 and 1')
+        try:
+            simulator = ProviderSimulator(
+                items=options['items'],
+                latency=options['latency'],
+                throttle_rate=options['throttle_rate'],
+                error_rate=options['error_rate'],
+                retry_after=options['retry_after'],
+                token_ttl=options['token_ttl'],
+                changes_per_sync=options['changes'],
+                slack_channels=options['slack_channels'],
+                seed=options['seed']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        server = make_server(simulator, options['host'], options['port'], quiet=not options['verbose_requests'])
+        url = f"http://{options['host']}:{server.server_port}"
+        self.stdout.write(self.style.SUCCESS(f'Provider simulator listening on {url}'))
+        self.stdout.write(f'Point the app at it with PROVIDER_SIMULATOR_URL={url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Served {simulator.calls} requests')
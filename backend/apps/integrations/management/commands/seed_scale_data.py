@@ -0,0 +1,353 @@
+import math
+import random
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.integrations.bulk_load import BulkWriter, finish_load, reserve_ids
+from apps.integrations.models import (
+    CalendarEvent, EmailAttachment, EmailBody, EmailMessage, Integration, SyncLog
+)
+
+User = get_user_model()
+
+# Share of users connecting each provider
+PROVIDER_SHARE = {
+    'google_calendar': 0.9,
+    'google_gmail': 0.85,
+    'microsoft_calendar': 0.25,
+    'microsoft_outlook': 0.2,
+    'slack': 0.3,
+    'github': 0.3,
+    'calendly': 0.15,
+}
+# Relative share of a user's events and emails held by each provider
+CALENDAR_WEIGHT = {'google_calendar': 1.0, 'microsoft_calendar': 0.6, 'calendly': 0.2}
+MAILBOX_WEIGHT = {'google_gmail': 1.0, 'microsoft_outlook': 0.6}
+
+MEETING_KINDS = ['Standup', '1:1', 'Sync', 'Review', 'Planning', 'Interview', 'Lunch', 'Demo', 'Retro', 'Workshop', 'Call']
+TOPICS = ['roadmap', 'billing', 'onboarding', 'hiring', 'design system', 'infrastructure', 'customer escalation',
+          'budget', 'release', 'security review', 'quarterly goals', 'marketing launch']
+LOCATIONS = ['Zoom', 'Google Meet', 'Microsoft Teams', 'Room 4A', 'Room 2B', 'Cafe downstairs']
+DURATIONS = [15, 30, 30, 30, 45, 60, 60, 60, 90, 120]
+WORK_HOURS = list(range(7, 20))
+WORK_HOUR_WEIGHTS = [1, 4, 8, 9, 8, 4, 6, 8, 8, 7, 5, 2, 1]
+# Mail arrives around the clock, mostly during the working day
+MAIL_HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 6, 9, 10, 10, 9, 8, 9, 10, 9, 8, 6, 5, 4, 3, 3, 2, 1]
+SUBJECTS = ['Invoice {n}', 'Your order {n} has shipped', 'Meeting notes: {topic}', 'Question about {topic}',
+            'Weekly update', 'Action required: {topic}', 'Welcome to the team', 'Re: {topic} proposal',
+            'Security alert', 'Your receipt', '{topic} - draft for review', 'Lunch on Friday?']
+ATTACHMENTS = [('report.pdf', 'application/pdf'), ('invoice.pdf', 'application/pdf'), ('photo.jpg', 'image/jpeg'),
+               ('notes.docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+               ('data.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')]
+NEWSLETTERS = [f'news@{domain}' for domain in (
+    'shop.example', 'bank.example', 'travel.example', 'saas.example', 'social.example', 'news.example',
+    'cloud.example', 'airline.example', 'store.example', 'events.example'
+)]
+LOREM = ('Thanks for the update. I had a look at the numbers and they mostly line up with what we discussed. '
+         'Can you send the final version before the end of the week? Let me know if anything is blocking you. ')
+
+
+def _volume(rng, mean):
+    """Per-user row count: log-normal around ``mean``, so a few heavy users hold much of the data"""
+    if mean <= 0:
+        return 0
+    return min(int(rng.lognormvariate(math.log(mean) - 0.5, 1.0)), mean * 20)
+
+
+def _zipf_pick(rng, items):
+    return items[min(int(rng.paretovariate(1.2)) - 1, len(items) - 1)]
+
+
+def _split(rng, total, weights):
+    """Divide ``total`` rows between integrations in proportion to their weights"""
+    if not weights:
+        return {}
+    counts = {}
+    remaining = total
+    names = list(weights)
+    weight_sum = sum(weights.values())
+    for name in names[:-1]:
+        counts[name] = min(remaining, int(total * weights[name] / weight_sum * rng.uniform(0.8, 1.2)))
+        remaining -= counts[name]
+    counts[names[-1]] = remaining
+    return counts
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate users, integrations, calendar events, emails and sync history for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--events-per-user', type=int, default=1000, help='Mean calendar events per user')
+        parser.add_argument('--emails-per-user', type=int, default=2000, help='Mean email messages per user')
+        parser.add_argument('--sync-logs', type=int, default=30, help='Sync logs per integration')
+        parser.add_argument('--seed', type=int, default=0, help='Same seed and options, same data')
+        parser.add_argument(
+            '--anchor', type=date.fromisoformat, default=None,
+            help='Date the data is generated around (YYYY-MM-DD); defaults to today'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--user-pattern', default='seed-{n}@example.com')
+        parser.add_argument('--password', default='seed-password')
+        parser.add_argument('--delete', action='store_true', help='Remove the seeded users and everything they own')
+
+    def handle(self, *args, **options):
+        emails = [options['user_pattern'].format(n=n) for n in range(options['users'])]
+        if options['delete']:
+            self._delete(emails)
+            return
+        if User.objects.filter(email__in=emails).exists():
+            raise CommandError('Seeded users already exist; run with --delete first or use another --user-pattern')
+
+        anchor = options['anchor'] or date.today()
+        self.anchor = datetime(anchor.year, anchor.month, anchor.day, 12, tzinfo=dt_timezone.utc)
+        self.seed = options['seed']
+        started = time.perf_counter()
+
+        integrations = self._create_accounts(emails, options['password'])
+        self._create_rows(integrations, options)
+        finish_load([CalendarEvent, EmailMessage, EmailAttachment, SyncLog])
+
+        seconds = time.perf_counter() - started
+        total = sum(writer.written for writer in self.writers.values()) + len(emails) + len(integrations)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {total} rows in {seconds:.0f}s ({total / seconds:.0f} rows/s): "
+            + ', '.join(f'{writer.written} {name}' for name, writer in self.writers.items())
+        ))
+
+    def _create_accounts(self, emails, password):
+        """Create the users and their integrations; returns (user index, email, integration) tuples"""
+        password_hash = make_password(password)
+        with transaction.atomic():
+            User.objects.bulk_create([
+                User(email=email, username=email.split('@')[0], password=password_hash, is_email_verified=True)
+                for email in emails
+            ], batch_size=1000)
+            user_ids = dict(User.objects.filter(email__in=emails).values_list('email', 'id'))
+
+            integrations = []
+            for index, email in enumerate(emails):
+                rng = random.Random(f'{self.seed}:{index}:providers')
+                providers = [provider for provider, share in PROVIDER_SHARE.items() if rng.random() < share]
+                integrations.extend(
+                    Integration(
+                        user_id=user_ids[email], provider=provider, status='connected',
+                        provider_email=email, last_sync=self.anchor
+                    )
+                    for provider in providers
+                )
+            Integration.objects.bulk_create(integrations, batch_size=1000)
+
+        by_user = {}
+        for integration in Integration.objects.filter(user_id__in=user_ids.values()).only('id', 'user_id', 'provider'):
+            by_user.setdefault(integration.user_id, []).append(integration)
+        return [
+            (index, email, integration)
+            for index, email in enumerate(emails)
+            for integration in sorted(by_user.get(user_ids[email], []), key=lambda integration: integration.provider)
+        ]
+
+    def _create_rows(self, integrations, options):
+        batch_size = options['batch_size']
+        messages = BulkWriter(EmailMessage, [
+            'id', 'integration', 'provider_message_id', 'thread_id', 'subject', 'sender', 'recipients', 'snippet',
+            'received_at', 'is_read', 'is_important', 'labels', 'has_attachments', 'attachment_count',
+            'synced_at', 'created_at', 'updated_at',
+        ], batch_size)
+        self.writers = {
+            'events': BulkWriter(CalendarEvent, [
+                'id', 'integration', 'provider_event_id', 'title', 'description', 'location', 'start_time',
+                'end_time', 'is_all_day', 'timezone', 'attendees', 'recurrence', 'is_recurring',
+                'recurring_event_id', 'original_start_time', 'created_by', 'event_status', 'fingerprint',
+                'last_modified', 'synced_at', 'created_at', 'updated_at',
+            ], batch_size),
+            'emails': messages,
+            'bodies': BulkWriter(EmailBody, ['message', 'text_compressed', 'html_compressed', 'updated_at'],
+                                 batch_size, parents=[messages]),
+            'attachments': BulkWriter(EmailAttachment, [
+                'id', 'message', 'filename', 'mime_type', 'size', 'provider_attachment_id', 'content_id',
+                'is_inline', 'content_sha256', 'created_at',
+            ], batch_size, parents=[messages]),
+            'sync logs': BulkWriter(SyncLog, [
+                'integration', 'id', 'sync_type', 'status', 'items_processed', 'items_created', 'items_updated',
+                'items_deleted', 'error_message', 'error_details', 'metrics', 'started_at', 'completed_at',
+            ], batch_size),
+        }
+        self.next_ids = {
+            'events': reserve_ids(CalendarEvent),
+            'emails': reserve_ids(EmailMessage),
+            'attachments': reserve_ids(EmailAttachment),
+            'sync logs': reserve_ids(SyncLog),
+        }
+        # A handful of bodies compressed once and shared, so zlib does not dominate the run
+        self.bodies = [
+            EmailBody.compress(f'Hi,\n\n{LOREM * (1 + n % 4)}\nMessage template {n}\n') for n in range(50)
+        ]
+        self.now = datetime.now(dt_timezone.utc)
+
+        user_count = options['users']
+        progress_every = max(user_count // 20, 1)
+        user_rows = {}
+        for index, email, integration in integrations:
+            user_rows.setdefault(index, (email, []))[1].append(integration)
+        for index, (email, user_integrations) in sorted(user_rows.items()):
+            rng = random.Random(f'{self.seed}:{index}:data')
+            self._user_rows(rng, email, user_integrations, options)
+            if (index + 1) % progress_every == 0:
+                written = sum(writer.written + len(writer.rows) for writer in self.writers.values())
+                self.stdout.write(f'{index + 1}/{user_count} users, {written} rows generated')
+
+        for writer in self.writers.values():
+            writer.flush()
+
+    def _next_id(self, kind):
+        value = self.next_ids[kind]
+        self.next_ids[kind] = value + 1
+        return value
+
+    def _user_rows(self, rng, email, integrations, options):
+        contacts = [f'contact{rng.randrange(10 ** 6)}@{rng.choice(["acme", "globex", "initech", "example"])}.com'
+                    for _ in range(rng.randint(30, 300))]
+        providers = {integration.provider: integration for integration in integrations}
+
+        calendars = {provider: weight for provider, weight in CALENDAR_WEIGHT.items() if provider in providers}
+        for provider, count in _split(rng, _volume(rng, options['events_per_user']), calendars).items():
+            for _ in range(count):
+                self._event(rng, providers[provider].id, email, contacts)
+
+        mailboxes = {provider: weight for provider, weight in MAILBOX_WEIGHT.items() if provider in providers}
+        for provider, count in _split(rng, _volume(rng, options['emails_per_user']), mailboxes).items():
+            thread_id = None
+            for _ in range(count):
+                thread_id = self._email(rng, providers[provider].id, email, contacts, thread_id)
+
+        for integration in integrations:
+            for _ in range(options['sync_logs']):
+                self._sync_log(rng, integration)
+
+    def _event(self, rng, integration_id, email, contacts):
+        event_id = self._next_id('events')
+        if rng.random() < 0.12:
+            day = self.anchor + timedelta(days=rng.uniform(0, 90))
+        else:
+            day = self.anchor - timedelta(days=min(rng.expovariate(1 / 120), 730))
+        if day.weekday() >= 5 and rng.random() < 0.85:
+            day -= timedelta(days=day.weekday() - 4)
+
+        is_all_day = rng.random() < 0.03
+        if is_all_day:
+            start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+            end = start + timedelta(days=1)
+        else:
+            hour = rng.choices(WORK_HOURS, WORK_HOUR_WEIGHTS)[0]
+            start = day.replace(hour=hour, minute=rng.choice([0, 0, 0, 30, 30, 15, 45]), second=0, microsecond=0)
+            end = start + timedelta(minutes=rng.choice(DURATIONS))
+
+        title = f'{rng.choice(MEETING_KINDS)}: {rng.choice(TOPICS)}'
+        attendees = [
+            {'email': _zipf_pick(rng, contacts), 'displayName': None,
+             'responseStatus': rng.choice(['accepted', 'accepted', 'accepted', 'tentative', 'needsAction', 'declined'])}
+            for _ in range(min(int(rng.expovariate(1 / 2.5)), 12))
+        ]
+        organizer = email if rng.random() < 0.6 else _zipf_pick(rng, contacts)
+        is_recurring = rng.random() < 0.05
+        recurrence = [f"RRULE:FREQ=WEEKLY;BYDAY={start.strftime('%a')[:2].upper()}"] if is_recurring else []
+
+        self.writers['events'].add((
+            event_id, integration_id, f'seed{event_id}', title,
+            f'Agenda for the {title.lower()}' if rng.random() < 0.4 else '',
+            rng.choice(LOCATIONS) if rng.random() < 0.5 else '',
+            start, end, is_all_day, 'UTC', attendees, recurrence, is_recurring, None, None, organizer,
+            'cancelled' if rng.random() < 0.03 else 'confirmed',
+            CalendarEvent.compute_fingerprint(title, start, end),
+            min(start, self.anchor) - timedelta(days=rng.uniform(0, 14)), self.now, self.now, self.now,
+        ))
+
+    def _email(self, rng, integration_id, email, contacts, thread_id):
+        """Add one message and its body and attachments; returns its thread id"""
+        message_id = self._next_id('emails')
+        age = timedelta(days=min(rng.expovariate(1 / 90), 730))
+        day = self.anchor - age
+        received_at = day.replace(
+            hour=rng.choices(range(24), MAIL_HOUR_WEIGHTS)[0], minute=rng.randrange(60), second=rng.randrange(60)
+        )
+        newsletter = rng.random() < 0.3
+        sender = _zipf_pick(rng, NEWSLETTERS) if newsletter else _zipf_pick(rng, contacts)
+        if thread_id is None or newsletter or rng.random() > 0.3:
+            thread_id = f'thread{message_id}'
+        subject = rng.choice(SUBJECTS).format(n=rng.randrange(10 ** 5), topic=rng.choice(TOPICS))
+
+        is_read = rng.random() < (0.92 if age > timedelta(days=14) else 0.45)
+        is_important = not newsletter and rng.random() < 0.1
+        labels = ['INBOX'] + ([] if is_read else ['UNREAD']) + (['IMPORTANT'] if is_important else [])
+        if newsletter:
+            labels.append('CATEGORY_PROMOTIONS')
+        attachment_count = min(int(rng.expovariate(1 / 1.5)) + 1, 5) if rng.random() < 0.12 else 0
+        recipients = [email] + ([_zipf_pick(rng, contacts)] if rng.random() < 0.2 else [])
+
+        self.writers['emails'].add((
+            message_id, integration_id, f'seed{message_id}', thread_id, subject, sender, recipients,
+            LOREM[:rng.randint(60, 200)], received_at, is_read, is_important, labels,
+            bool(attachment_count), attachment_count, self.now, self.now, self.now,
+        ))
+        self.writers['bodies'].add((message_id, rng.choice(self.bodies), None, self.now))
+        for position in range(attachment_count):
+            filename, mime_type = rng.choice(ATTACHMENTS)
+            self.writers['attachments'].add((
+                self._next_id('attachments'), message_id, filename, mime_type,
+                int(rng.lognormvariate(math.log(200_000), 1.2)), f'seed-attachment-{message_id}-{position}',
+                '', False, '', self.now,
+            ))
+        return thread_id
+
+    def _sync_log(self, rng, integration):
+        started_at = self.anchor - timedelta(minutes=rng.uniform(0, 30 * 24 * 60))
+        duration_ms = round(rng.lognormvariate(math.log(2500), 0.8), 1)
+        status = rng.choices(['completed', 'failed', 'partial'], [95, 4, 1])[0]
+        processed = int(rng.lognormvariate(math.log(40), 1.0))
+        created = int(processed * rng.uniform(0, 0.3))
+        updated = processed - created
+        fetch = rng.uniform(0.4, 0.7)
+        metrics = {
+            'duration_ms': duration_ms,
+            'phases': {
+                'token_refresh': round(duration_ms * 0.02, 1) if rng.random() < 0.1 else 0.0,
+                'fetch': round(duration_ms * fetch, 1),
+                'parse': round(duration_ms * 0.1, 1),
+                'db_write': round(duration_ms * (0.85 - fetch), 1),
+                'other': round(duration_ms * 0.05, 1),
+            },
+            'http_calls': max(processed // 50, 1),
+            'bytes_downloaded': processed * rng.randint(800, 3000),
+            'retries': int(rng.expovariate(3)),
+            'rate_limit_wait_ms': 0.0,
+        }
+        sync_type = 'email' if integration.provider in MAILBOX_WEIGHT else 'calendar'
+        self.writers['sync logs'].add((
+            integration.id, self._next_id('sync logs'), sync_type, status, processed, created, updated,
+            int(processed * 0.02), 'Simulated upstream failure' if status == 'failed' else None, {},
+            metrics, started_at, started_at + timedelta(milliseconds=duration_ms),
+        ))
+
+    def _delete(self, emails):
+        """Delete the bulk tables with set-based SQL, then let the ORM remove the users"""
+        users = User.objects.filter(email__in=emails)
+        quote = connection.ops.quote_name
+        with transaction.atomic(), connection.cursor() as cursor:
+            for name, model, lookup in [
+                ('attachments', EmailAttachment, 'message__integration__user__in'),
+                ('bodies', EmailBody, 'message__integration__user__in'),
+                ('emails', EmailMessage, 'integration__user__in'),
+                ('events', CalendarEvent, 'integration__user__in'),
+                ('sync logs', SyncLog, 'integration__user__in'),
+            ]:
+                pk = model._meta.pk
+                sql, params = model.objects.filter(**{lookup: users}).values('pk').query.sql_with_params()
+                cursor.execute(f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(pk.column)} IN ({sql})', params)
+                self.stdout.write(f'Deleted {cursor.rowcount} {name}')
+            deleted, _ = users.delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} remaining rows'))
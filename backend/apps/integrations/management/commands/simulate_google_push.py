@@ -0,0 +1,110 @@
+import base64
+import json
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.integrations.models import Integration, WatchChannel
+
+
+class Command(BaseCommand):
+    help = 'Post synthetic Google Calendar / Gmail push notifications to the webhook receivers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('integration_id', type=int)
+        parser.add_argument('--count', type=int, default=1, help='Notifications to send (a burst)')
+        parser.add_argument('--interval', type=float, default=0.0, help='Seconds between notifications')
+        parser.add_argument('--state', default='exists', help='X-Goog-Resource-State for calendar notifications')
+        parser.add_argument(
+            '--base-url',
+            help='Post over HTTP to a running server instead of calling the views in-process'
+        )
+        parser.add_argument(
+            '--create-channel', action='store_true',
+            help='Create a local watch channel for a calendar integration that has none'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            integration = Integration.objects.get(id=options['integration_id'])
+        except Integration.DoesNotExist:
+            raise CommandError(f"Integration {options['integration_id']} does not exist")
+
+        if integration.provider == 'google_calendar':
+            path, headers, body = self._calendar_request(integration, options)
+        elif integration.provider == 'google_gmail':
+            path, headers, body = self._gmail_request(integration)
+        else:
+            raise CommandError('Push notifications are only supported for Google Calendar and Gmail')
+
+        statuses = Counter()
+        for index in range(options['count']):
+            statuses[self._post(path, headers, body, options['base_url'])] += 1
+            if options['interval'] and index + 1 < options['count']:
+                time.sleep(options['interval'])
+
+        summary = ', '.join(f'{code}: {count}' for code, count in sorted(statuses.items()))
+        self.stdout.write(self.style.SUCCESS(f'Sent {options["count"]} notifications ({summary})'))
+
+    def _calendar_request(self, integration, options):
+        channel = integration.watch_channels.filter(resource_type='calendar').order_by('-expires_at').first()
+        if channel is None:
+            if not options['create_channel']:
+                raise CommandError('Integration has no calendar watch channel; pass --create-channel')
+            channel = WatchChannel.objects.create(
+                integration=integration,
+                resource_type='calendar',
+                calendar_id='primary',
+                channel_id=uuid.uuid4().hex,
+                resource_id=f'simulated-{uuid.uuid4().hex[:12]}',
+                expires_at=timezone.now() + timedelta(days=1)
+            )
+            self.stdout.write(f'Created local watch channel {channel.channel_id}')
+
+        headers = {
+            'X-Goog-Channel-ID': channel.channel_id,
+            'X-Goog-Channel-Token': channel.token,
+            'X-Goog-Resource-ID': channel.resource_id,
+            'X-Goog-Resource-State': options['state'],
+            'X-Goog-Message-Number': '1',
+        }
+        return reverse('integrations:google-calendar-webhook'), headers, b''
+
+    def _gmail_request(self, integration):
+        if not settings.GMAIL_PUSH_VERIFICATION_TOKEN:
+            raise CommandError('GMAIL_PUSH_VERIFICATION_TOKEN is not configured')
+        if not integration.provider_email:
+            raise CommandError('Integration has no provider email')
+
+        notification = {'emailAddress': integration.provider_email, 'historyId': '0'}
+        body = json.dumps({
+            'message': {
+                'data': base64.b64encode(json.dumps(notification).encode('utf-8')).decode('ascii'),
+                'messageId': uuid.uuid4().hex,
+            },
+            'subscription': 'projects/local/subscriptions/simulated',
+        }).encode('utf-8')
+        path = f"{reverse('integrations:gmail-push-webhook')}?token={settings.GMAIL_PUSH_VERIFICATION_TOKEN}"
+        return path, {'Content-Type': 'application/json'}, body
+
+    def _post(self, path, headers, body, base_url):
+        if base_url:
+            response = requests.post(f"{base_url.rstrip('/')}{path}", headers=headers, data=body, timeout=10)
+            return response.status_code
+
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS if host and not host.startswith(('.', '*'))),
+            'localhost'
+        )
+        client = Client(HTTP_HOST=host)
+        content_type = headers.get('Content-Type', 'application/octet-stream')
+        extra = {key: value for key, value in headers.items() if key != 'Content-Type'}
+        response = client.post(path, data=body, content_type=content_type, headers=extra)
+        return response.status_code
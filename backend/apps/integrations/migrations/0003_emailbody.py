@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:34
+
+import base64
+import binascii
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _decode_body(data):
+    """Decode a stored Gmail base64url body, keeping non-encoded content as-is"""
+    if not data:
+        return ""
+    try:
+        padded = data + "=" * (-len(data) % 4)
+        return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8", errors="replace")
+    except (binascii.Error, ValueError, UnicodeEncodeError):
+        return data
+
+
+def _compress(content):
+    if not content:
+        return None
+    return zlib.compress(content.encode("utf-8"), 6)
+
+
+def move_bodies(apps, schema_editor):
+    EmailMessage = apps.get_model("integrations", "EmailMessage")
+    EmailBody = apps.get_model("integrations", "EmailBody")
+
+    batch = []
+    messages = (
+        EmailMessage.objects.exclude(body_text__isnull=True, body_html__isnull=True)
+        .values_list("id", "body_text", "body_html")
+        .iterator(chunk_size=1000)
+    )
+    for message_id, body_text, body_html in messages:
+        if not body_text and not body_html:
+            continue
+        batch.append(
+            EmailBody(
+                message_id=message_id,
+                text_compressed=_compress(_decode_body(body_text)),
+                html_compressed=_compress(_decode_body(body_html)),
+            )
+        )
+        if len(batch) >= 1000:
+            EmailBody.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        EmailBody.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0002_alter_integration_provider"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailBody",
+            fields=[
+                (
+                    "message",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="body",
+                        serialize=False,
+                        to="integrations.emailmessage",
+                    ),
+                ),
+                ("text_compressed", models.BinaryField(blank=True, null=True)),
+                ("html_compressed", models.BinaryField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(move_bodies, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="emailmessage",
+            name="body_html",
+        ),
+        migrations.RemoveField(
+            model_name="emailmessage",
+            name="body_text",
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0003_emailbody"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailmessage",
+            name="snippet",
+            field=models.CharField(blank=True, default="", max_length=500),
+        ),
+        migrations.CreateModel(
+            name="EmailAttachment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("filename", models.CharField(blank=True, max_length=500)),
+                (
+                    "mime_type",
+                    models.CharField(
+                        default="application/octet-stream", max_length=255
+                    ),
+                ),
+                ("size", models.BigIntegerField(default=0)),
+                ("provider_attachment_id", models.TextField(blank=True)),
+                ("content_id", models.CharField(blank=True, max_length=255)),
+                ("is_inline", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "message",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attachments",
+                        to="integrations.emailmessage",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+    ]
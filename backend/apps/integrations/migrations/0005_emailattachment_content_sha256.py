@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0004_emailattachment_emailmessage_snippet"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailattachment",
+            name="content_sha256",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
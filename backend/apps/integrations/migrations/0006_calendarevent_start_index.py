@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0005_emailattachment_content_sha256"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="calendarevent",
+            index=models.Index(
+                fields=["integration", "start_time"], name="calendar_event_start_idx"
+            ),
+        ),
+    ]
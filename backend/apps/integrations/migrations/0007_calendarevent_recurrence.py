@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0006_calendarevent_start_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calendarevent",
+            name="is_recurring",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="original_start_time",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurring_event_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:45
+
+import datetime
+import hashlib
+
+from django.db import migrations, models
+
+
+def compute_fingerprint(title, start_time, end_time):
+    # Frozen copy of CalendarEvent.compute_fingerprint as of this migration
+    parts = [
+        " ".join((title or "").casefold().split()),
+        start_time.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M"),
+        end_time.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M"),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def fill_fingerprints(apps, schema_editor):
+    CalendarEvent = apps.get_model("integrations", "CalendarEvent")
+
+    batch = []
+    for event in CalendarEvent.objects.only(
+        "id", "title", "start_time", "end_time"
+    ).iterator(chunk_size=1000):
+        event.fingerprint = compute_fingerprint(event.title, event.start_time, event.end_time)
+        batch.append(event)
+        if len(batch) >= 1000:
+            CalendarEvent.objects.bulk_update(batch, ["fingerprint"])
+            batch = []
+    if batch:
+        CalendarEvent.objects.bulk_update(batch, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0007_calendarevent_recurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calendarevent",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=64
+            ),
+        ),
+        migrations.RunPython(fill_fingerprints, migrations.RunPython.noop),
+    ]
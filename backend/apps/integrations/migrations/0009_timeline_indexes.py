@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0008_calendarevent_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emailmessage",
+            index=models.Index(
+                fields=["integration", "-received_at", "-id"],
+                name="email_message_received_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="synclog",
+            index=models.Index(
+                fields=["integration", "-started_at", "-id"],
+                name="sync_log_started_idx",
+            ),
+        ),
+    ]
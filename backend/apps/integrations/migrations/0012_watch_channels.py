@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:57
+
+import apps.integrations.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0011_calendarfeedtoken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="integration",
+            name="sync_state",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.CreateModel(
+            name="WatchChannel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "resource_type",
+                    models.CharField(
+                        choices=[("calendar", "Calendar"), ("gmail", "Gmail")],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "calendar_id",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("channel_id", models.CharField(max_length=64, unique=True)),
+                (
+                    "resource_id",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "token",
+                    models.CharField(
+                        default=apps.integrations.models.generate_channel_token,
+                        max_length=64,
+                    ),
+                ),
+                ("expires_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "integration",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="watch_channels",
+                        to="integrations.integration",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["expires_at"],
+                "indexes": [
+                    models.Index(fields=["expires_at"], name="watch_channel_expiry_idx")
+                ],
+            },
+        ),
+    ]
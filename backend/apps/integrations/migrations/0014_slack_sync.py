@@ -0,0 +1,98 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0013_webhook_inbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlackChannel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("channel_id", models.CharField(max_length=32)),
+                ("name", models.CharField(max_length=255)),
+                ("is_private", models.BooleanField(default=False)),
+                ("is_archived", models.BooleanField(default=False)),
+                ("is_member", models.BooleanField(default=False)),
+                ("topic", models.TextField(blank=True, default="")),
+                ("purpose", models.TextField(blank=True, default="")),
+                ("num_members", models.IntegerField(default=0)),
+                (
+                    "last_message_ts",
+                    models.CharField(blank=True, default="", max_length=32),
+                ),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "integration",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slack_channels",
+                        to="integrations.integration",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+                "unique_together": {("integration", "channel_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="SlackMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ts", models.CharField(max_length=32)),
+                ("thread_ts", models.CharField(blank=True, default="", max_length=32)),
+                (
+                    "slack_user_id",
+                    models.CharField(blank=True, default="", max_length=32),
+                ),
+                ("text", models.TextField(blank=True, default="")),
+                ("subtype", models.CharField(blank=True, default="", max_length=64)),
+                ("reply_count", models.IntegerField(default=0)),
+                ("sent_at", models.DateTimeField()),
+                ("edited_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="messages",
+                        to="integrations.slackchannel",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-sent_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["channel", "-sent_at"], name="slack_message_sent_idx"
+                    )
+                ],
+                "unique_together": {("channel", "ts")},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0015_slack_notifications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synclog",
+            name="metrics",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,157 @@
+import base64
+import binascii
+import re
+from email.message import Message
+from html.parser import HTMLParser
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_LENGTH = 200
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def iter_parts(payload):
+    """Yield the leaf parts of a payload tree, depth-first and in document order"""
+    stack = [payload] if payload else []
+    while stack:
+        part = stack.pop()
+        children = part.get('parts')
+        if children:
+            stack.extend(reversed(children))
+        else:
+            yield part
+
+
+def get_part_headers(part):
+    """Return a part's headers as a case-insensitive email Message"""
+    message = Message()
+    for header in part.get('headers', []):
+        message[header.get('name', '')] = header.get('value', '')
+    return message
+
+
+def decode_part_body(part, fetch_body=None):
+    """
+    Decode a part's base64url body using the charset from its headers.
+
+    Gmail leaves large bodies out of the payload and only gives their
+    attachmentId; ``fetch_body(attachment_id)`` downloads the raw bytes.
+    """
+    body = part.get('body', {})
+    data = body.get('data')
+    if data:
+        try:
+            raw = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+        except (binascii.Error, ValueError):
+            logger.warning("Could not decode base64url part body")
+            return ''
+    elif body.get('attachmentId') and fetch_body:
+        try:
+            raw = fetch_body(body['attachmentId'])
+        except Exception as e:
+            logger.warning(f"Could not fetch large part body: {e}")
+            return ''
+    else:
+        return ''
+
+    charset = get_part_headers(part).get_content_charset() or 'utf-8'
+    try:
+        return raw.decode(charset, errors='replace')
+    except LookupError:
+        return raw.decode('utf-8', errors='replace')
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text from an HTML document"""
+
+    SKIP_TAGS = {'script', 'style', 'head', 'title'}
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.chunks.append(data)
+
+
+def html_to_text(html):
+    """Convert an HTML body to plain text"""
+    if not html:
+        return ''
+
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+
+    lines = (_WHITESPACE_RE.sub(' ', line).strip() for line in ''.join(extractor.chunks).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def make_snippet(text, length=SNIPPET_LENGTH):
+    """Build a single-line preview of a text body"""
+    snippet = _WHITESPACE_RE.sub(' ', text or '').strip()
+    if len(snippet) > length:
+        snippet = snippet[:length - 1].rstrip() + '…'
+    return snippet
+
+
+def parse_gmail_payload(payload, fetch_body=None):
+    """
+    Extract bodies, snippet and attachment metadata from a Gmail payload.
+
+    The first text/plain and text/html leaves win, which picks the preferred
+    alternatives of a multipart/alternative nested anywhere in the tree.
+    A part is an attachment when it has a filename or an attachment
+    disposition; an attachmentId alone also marks large body parts.
+    """
+    text = ''
+    html = ''
+    attachments = []
+
+    for part in iter_parts(payload):
+        mime_type = (part.get('mimeType') or '').lower()
+        body = part.get('body', {})
+        filename = part.get('filename') or ''
+        headers = get_part_headers(part)
+        disposition = (headers.get('Content-Disposition') or '').lower()
+
+        if filename or disposition.startswith('attachment'):
+            attachments.append({
+                'filename': filename,
+                'mime_type': mime_type or 'application/octet-stream',
+                'size': body.get('size', 0),
+                'provider_attachment_id': body.get('attachmentId', ''),
+                'content_id': (headers.get('Content-ID') or '').strip('<>'),
+                'is_inline': disposition.startswith('inline'),
+            })
+        elif mime_type == 'text/plain' and not text:
+            text = decode_part_body(part, fetch_body)
+        elif mime_type == 'text/html' and not html:
+            html = decode_part_body(part, fetch_body)
+
+    if not text and html:
+        text = html_to_text(html)
+
+    return {
+        'text': text,
+        'html': html,
+        'snippet': make_snippet(text),
+        'attachments': attachments,
+    }
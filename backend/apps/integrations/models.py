@@ -3,8 +3,12 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from cryptography.fernet import Fernet
 from django.conf import settings
+from datetime import timezone as dt_timezone
 import base64
+import hashlib
 import os
+import secrets
+import zlib
 
 User = get_user_model()
 
@@ -46,6 +50,9 @@ class Integration(models.Model):
     last_sync = models.DateTimeField(blank=True, null=True)
     sync_enabled = models.BooleanField(default=True)
     
+    # Incremental sync cursors (calendar sync tokens, Gmail history id)
+    sync_state = models.JSONField(default=dict, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -131,10 +138,20 @@ class CalendarEvent(models.Model):
     # Attendees (stored as JSON)
     attendees = models.JSONField(default=list, blank=True)
     
+    # Recurrence: masters keep their RRULE/EXDATE/RDATE lines and are expanded
+    # on read; modified or cancelled occurrences point back at their master
+    recurrence = models.JSONField(default=list, blank=True)
+    is_recurring = models.BooleanField(default=False)
+    recurring_event_id = models.CharField(max_length=255, blank=True, null=True)
+    original_start_time = models.DateTimeField(blank=True, null=True)
+    
     # Event metadata
     created_by = models.CharField(max_length=255, blank=True, null=True)
     event_status = models.CharField(max_length=50, default='confirmed')
     
+    # Identifies the same meeting synced through several providers
+    fingerprint = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    
     # Sync metadata
     last_modified = models.DateTimeField()
     synced_at = models.DateTimeField(auto_now=True)
@@ -145,9 +162,35 @@ class CalendarEvent(models.Model):
     class Meta:
         unique_together = ['integration', 'provider_event_id']
         ordering = ['start_time']
+        indexes = [
+            models.Index(fields=['integration', 'start_time'], name='calendar_event_start_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.start_time}"
+    
+    @staticmethod
+    def compute_fingerprint(title, start_time, end_time):
+        """
+        Hash the normalized title and UTC start and end minute of an event.
+
+        Participants are left out: Google lists the organizer and the calendar
+        owner among the attendees while Microsoft Graph does not, so the same
+        meeting would never match across providers.
+        """
+        parts = [
+            ' '.join((title or '').casefold().split()),
+            start_time.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M'),
+            end_time.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M'),
+        ]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    
+    def save(self, *args, **kwargs):
+        self.fingerprint = self.compute_fingerprint(self.title, self.start_time, self.end_time)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'fingerprint' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['fingerprint']
+        super().save(*args, **kwargs)
 
 
 class EmailMessage(models.Model):
@@ -162,9 +205,8 @@ class EmailMessage(models.Model):
     sender = models.CharField(max_length=255)
     recipients = models.JSONField(default=list)
     
-    # Content
-    body_text = models.TextField(blank=True, null=True)
-    body_html = models.TextField(blank=True, null=True)
+    # Plain-text preview generated at sync time
+    snippet = models.CharField(max_length=500, blank=True, default='')
     
     # Metadata
     received_at = models.DateTimeField()
@@ -185,11 +227,87 @@ class EmailMessage(models.Model):
     class Meta:
         unique_together = ['integration', 'provider_message_id']
         ordering = ['-received_at']
+        indexes = [
+            models.Index(fields=['integration', '-received_at', '-id'], name='email_message_received_idx'),
+        ]
     
     def __str__(self):
         return f"{self.subject} - {self.sender}"
 
 
+class EmailBody(models.Model):
+    """Decoded, compressed email content kept out of the EmailMessage table"""
+    
+    message = models.OneToOneField(
+        EmailMessage, on_delete=models.CASCADE, related_name='body', primary_key=True
+    )
+    
+    # zlib-compressed UTF-8 content
+    text_compressed = models.BinaryField(blank=True, null=True)
+    html_compressed = models.BinaryField(blank=True, null=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Body of {self.message_id}"
+    
+    @staticmethod
+    def compress(content):
+        """Compress text content for storage"""
+        if not content:
+            return None
+        return zlib.compress(content.encode('utf-8'), 6)
+    
+    @staticmethod
+    def decompress(data):
+        """Decompress stored content back to text"""
+        if not data:
+            return ''
+        return zlib.decompress(bytes(data)).decode('utf-8')
+    
+    def set_text(self, content):
+        """Set compressed plain-text body"""
+        self.text_compressed = self.compress(content)
+    
+    def get_text(self):
+        """Get decompressed plain-text body"""
+        return self.decompress(self.text_compressed)
+    
+    def set_html(self, content):
+        """Set compressed HTML body"""
+        self.html_compressed = self.compress(content)
+    
+    def get_html(self):
+        """Get decompressed HTML body"""
+        return self.decompress(self.html_compressed)
+
+
+class EmailAttachment(models.Model):
+    """Metadata for an attachment of a synced email message"""
+    
+    message = models.ForeignKey(EmailMessage, on_delete=models.CASCADE, related_name='attachments')
+    
+    filename = models.CharField(max_length=500, blank=True)
+    mime_type = models.CharField(max_length=255, default='application/octet-stream')
+    size = models.BigIntegerField(default=0)
+    
+    # Provider reference used to download the content
+    provider_attachment_id = models.TextField(blank=True)
+    content_id = models.CharField(max_length=255, blank=True)
+    is_inline = models.BooleanField(default=False)
+    
+    # SHA-256 of the content once it has been fetched into the attachment cache
+    content_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.filename} ({self.mime_type})"
+
+
 class SyncLog(models.Model):
     """Model to track sync operations"""
     
@@ -214,11 +332,272 @@ class SyncLog(models.Model):
     error_message = models.TextField(blank=True, null=True)
     error_details = models.JSONField(default=dict, blank=True)
     
+    # Phase timings in ms, upstream calls, bytes, retries, rate-limit waits and peak memory
+    metrics = models.JSONField(default=dict, blank=True)
+    
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(blank=True, null=True)
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['integration', '-started_at', '-id'], name='sync_log_started_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.integration} - {self.sync_type} - {self.status}"
+
+class UserDataVersion(models.Model):
+    """Per-user counter bumped whenever synced data changes, used as an HTTP validator"""
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_version')
+    generation = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.user} - v{self.generation}"
+
+
+
+def generate_feed_token():
+    return secrets.token_urlsafe(32)
+
+
+class CalendarFeedToken(models.Model):
+    """Secret token that lets calendar clients subscribe to a user's unified ICS feed"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calendar_feed_tokens')
+    name = models.CharField(max_length=100, blank=True, default='')
+    token = models.CharField(max_length=64, unique=True, default=generate_feed_token)
+    is_active = models.BooleanField(default=True)
+    
+    last_used_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.user} - {self.name or 'calendar feed'}"
+
+
+class CalendarShare(models.Model):
+    """
+    Lets the account with ``email`` see the owner's busy time in meeting slot searches.
+
+    Shares are keyed by email, so granting one never reveals whether that
+    address has an account; it takes effect once a verified account uses it.
+    """
+    
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calendar_shares')
+    email = models.EmailField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['owner', 'email']
+        indexes = [models.Index(fields=['email'])]
+    
+    def __str__(self):
+        return f"{self.owner} -> {self.email}"
+    
+    def save(self, *args, **kwargs):
+        self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
+
+
+def generate_channel_token():
+    return secrets.token_hex(24)
+
+
+class WatchChannel(models.Model):
+    """Push notification subscription registered with a provider"""
+    
+    RESOURCE_CHOICES = [
+        ('calendar', 'Calendar'),
+        ('gmail', 'Gmail'),
+    ]
+    
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name='watch_channels')
+    resource_type = models.CharField(max_length=20, choices=RESOURCE_CHOICES)
+    calendar_id = models.CharField(max_length=255, blank=True, default='')
+    
+    # Identifiers echoed back by the provider on every notification
+    channel_id = models.CharField(max_length=64, unique=True)
+    resource_id = models.CharField(max_length=255, blank=True, default='')
+    token = models.CharField(max_length=64, default=generate_channel_token)
+    
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['expires_at']
+        indexes = [
+            models.Index(fields=['expires_at'], name='watch_channel_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.integration} - {self.resource_type} {self.calendar_id} until {self.expires_at}"
+
+
+class WebhookSubscription(models.Model):
+    """Change-notification subscription registered with Microsoft Graph or Calendly"""
+    
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name='webhook_subscriptions')
+    
+    # Graph subscription id or Calendly webhook subscription URI
+    subscription_id = models.CharField(max_length=255, unique=True)
+    resource = models.CharField(max_length=255, blank=True, default='')
+    
+    # Graph clientState or Calendly signing key
+    secret = models.CharField(max_length=64, default=generate_channel_token)
+    
+    # Calendly subscriptions do not expire
+    expires_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['expires_at'], name='webhook_sub_expiry_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.integration} - {self.sync_type} - {self.status}"
\ No newline at end of file
+        return f"{self.integration} - {self.resource or self.subscription_id}"
+
+
+class WebhookDelivery(models.Model):
+    """Durable inbox row for one provider notification, applied later in batches"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+        ('ignored', 'Ignored'),
+    ]
+    
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name='webhook_deliveries')
+    
+    # Hash of the provider identifiers of the change, so redeliveries collapse
+    delivery_id = models.CharField(max_length=64)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True, null=True)
+    
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['integration', 'delivery_id'], name='webhook_delivery_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'integration', 'id'], name='webhook_delivery_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.integration} - {self.event_type} ({self.status})"
+
+
+class SlackChannel(models.Model):
+    """Slack conversation visible to a connected workspace"""
+    
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name='slack_channels')
+    
+    channel_id = models.CharField(max_length=32)
+    name = models.CharField(max_length=255)
+    is_private = models.BooleanField(default=False)
+    is_archived = models.BooleanField(default=False)
+    is_member = models.BooleanField(default=False)
+    topic = models.TextField(blank=True, default='')
+    purpose = models.TextField(blank=True, default='')
+    num_members = models.IntegerField(default=0)
+    
+    # ts of the newest synced message; the next run only asks for newer ones
+    last_message_ts = models.CharField(max_length=32, blank=True, default='')
+    
+    synced_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['integration', 'channel_id']
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"#{self.name} ({self.integration})"
+
+
+class SlackMessage(models.Model):
+    """Message posted to a synced Slack channel"""
+    
+    channel = models.ForeignKey(SlackChannel, on_delete=models.CASCADE, related_name='messages')
+    
+    # Slack identifies messages by their channel and timestamp string
+    ts = models.CharField(max_length=32)
+    thread_ts = models.CharField(max_length=32, blank=True, default='')
+    slack_user_id = models.CharField(max_length=32, blank=True, default='')
+    text = models.TextField(blank=True, default='')
+    subtype = models.CharField(max_length=64, blank=True, default='')
+    reply_count = models.IntegerField(default=0)
+    
+    sent_at = models.DateTimeField()
+    edited_at = models.DateTimeField(blank=True, null=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['channel', 'ts']
+        ordering = ['-sent_at']
+        indexes = [
+            models.Index(fields=['channel', '-sent_at'], name='slack_message_sent_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.channel} - {self.ts}"
+
+
+class SlackNotification(models.Model):
+    """Outbound Slack message waiting in the delivery queue"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    # The Slack integration the message is sent through
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name='slack_notifications')
+    channel = models.CharField(max_length=32)
+    event_type = models.CharField(max_length=50, blank=True, default='')
+    text = models.TextField()
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    error_message = models.TextField(blank=True, null=True)
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['integration', 'channel', 'status', 'id'], name='slack_notification_queue_idx'),
+            models.Index(fields=['status', 'next_attempt_at'], name='slack_notification_retry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.integration} -> {self.channel} ({self.status})"
+    
+    @property
+    def latency(self):
+        """Time from enqueueing to delivery"""
+        if self.sent_at:
+            return self.sent_at - self.created_at
+        return None
@@ -0,0 +1,111 @@
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
+import logging
+
+from .models import Integration, SlackNotification
+from .services import SlackOAuthService
+from .sync_metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_EVENTS = ['sync_completed', 'sync_failed']
+DEFAULT_NOTIFICATION_SETTINGS = {
+    'enabled': True,
+    # Blank sends a direct message to the user who connected Slack
+    'channel': '',
+    'events': ['sync_failed'],
+}
+
+
+def notification_settings(integration):
+    """Return the notification preferences stored on a Slack integration"""
+    return {**DEFAULT_NOTIFICATION_SETTINGS, **integration.sync_state.get('notifications', {})}
+
+
+def notification_channel(integration):
+    """Resolve where a Slack integration's notifications go, or '' if nowhere"""
+    return notification_settings(integration)['channel'] or integration.sync_state.get('slack_user_id') or ''
+
+
+def _retry_delay(attempts):
+    """Exponential backoff with jitter, so failing channels do not retry in lockstep"""
+    delay = min(settings.SLACK_NOTIFY_BACKOFF_BASE * 2 ** attempts, settings.SLACK_NOTIFY_BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def deliver_notifications(integration_id, channel):
+    """
+    Send the due notifications of one channel.
+
+    Queued messages are joined into as few chat.postMessage calls as
+    possible, SLACK_NOTIFY_MAX_BATCH at a time. A failed call puts its
+    batch back with a backoff; after SLACK_NOTIFY_MAX_ATTEMPTS it is
+    marked failed. Returns ``(delivered, retry_in)`` where ``retry_in`` is
+    the seconds until the next retry is due, or None.
+    """
+    pending = SlackNotification.objects.filter(integration_id=integration_id, channel=channel, status='pending')
+    integration = Integration.objects.filter(id=integration_id, provider='slack', status='connected').first()
+    if integration is None:
+        pending.update(status='failed', error_message='Slack integration is not connected')
+        return 0, None
+
+    service = SlackOAuthService(integration)
+    delivered = 0
+    while True:
+        batch = list(pending.filter(next_attempt_at__lte=timezone.now()).order_by('id')[:settings.SLACK_NOTIFY_MAX_BATCH])
+        if not batch:
+            return delivered, None
+        batch_ids = [notification.id for notification in batch]
+
+        try:
+            service.api_call(
+                'chat.postMessage', http_method='POST',
+                channel=channel, text='\n'.join(notification.text for notification in batch)
+            )
+        except Exception as e:
+            retry_in = _retry_delay(max(notification.attempts for notification in batch))
+            logger.warning(f"Slack notification to {channel} failed, retrying in {retry_in:.0f}s: {e}")
+            SlackNotification.objects.filter(id__in=batch_ids).update(
+                attempts=F('attempts') + 1,
+                error_message=str(e),
+                next_attempt_at=timezone.now() + timedelta(seconds=retry_in),
+                status=Case(
+                    When(attempts__gte=settings.SLACK_NOTIFY_MAX_ATTEMPTS - 1, then=Value('failed')),
+                    default=Value('pending')
+                )
+            )
+            return delivered, retry_in
+
+        sent_at = timezone.now()
+        SlackNotification.objects.filter(id__in=batch_ids).update(
+            status='sent', sent_at=sent_at, attempts=F('attempts') + 1, error_message=None
+        )
+        delivered += len(batch)
+        oldest_wait = (sent_at - batch[0].created_at).total_seconds() * 1000
+        logger.info(f"Delivered {len(batch)} Slack notifications to {channel} in one message after {oldest_wait:.0f} ms")
+
+
+def delivery_stats(queryset, window=None):
+    """Summarize queue health and delivery latency of recent notifications"""
+    window = window or timedelta(seconds=settings.SLACK_NOTIFY_STATS_WINDOW)
+    recent = queryset.filter(created_at__gte=timezone.now() - window)
+
+    latencies = sorted(
+        round((sent_at - created_at).total_seconds() * 1000, 1)
+        for created_at, sent_at in recent.filter(status='sent').values_list('created_at', 'sent_at')
+    )
+    counts = dict.fromkeys(['pending', 'sent', 'failed'], 0)
+    counts.update(recent.order_by().values_list('status').annotate(total=Count('id')))
+    return {
+        'window_seconds': int(window.total_seconds()),
+        'counts': counts,
+        'latency_ms': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None,
+        },
+    }
@@ -0,0 +1,111 @@
+import threading
+import time
+from django.core.cache import cache
+import logging
+
+from .sync_metrics import record_wait
+
+logger = logging.getLogger(__name__)
+
+# Slack documents limits per method, per workspace and app, as tiers of
+# requests per minute. Bursts above the rate are tolerated briefly.
+# chat.postMessage is limited to about one message per second per channel.
+SLACK_TIER_RATES = {
+    1: (1, 1),
+    2: (20, 3),
+    3: (50, 5),
+    4: (100, 10),
+    'special': (60, 1),
+}
+SLACK_METHOD_TIERS = {
+    'auth.test': 4,
+    'chat.postMessage': 'special',
+    'conversations.history': 3,
+    'conversations.info': 3,
+    'conversations.list': 2,
+    'conversations.members': 4,
+    'conversations.replies': 3,
+    'team.info': 3,
+    'users.info': 4,
+    'users.list': 2,
+}
+SLACK_DEFAULT_TIER = 3
+SLACK_PER_CHANNEL_METHODS = {'chat.postMessage'}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # The debt is paid back by the refill, so waiters are spaced out evenly
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets per (scope, method) with shared back-off.
+
+    Buckets pace requests inside one process. A Retry-After answer is written
+    to the cache as well, so every worker hitting the same workspace and
+    method waits it out instead of provoking another 429.
+    """
+
+    def __init__(self, tier_rates, method_tiers, default_tier):
+        self.tier_rates = tier_rates
+        self.method_tiers = method_tiers
+        self.default_tier = default_tier
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, scope, method):
+        key = (scope, method)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    per_minute, burst = self.tier_rates[self.method_tiers.get(method, self.default_tier)]
+                    bucket = self._buckets[key] = TokenBucket(per_minute / 60, burst)
+        return bucket
+
+    @staticmethod
+    def _backoff_key(scope, method):
+        return f'rate-limit-backoff:{scope}:{method}'
+
+    def acquire(self, scope, method):
+        """Block until a request to ``method`` may be sent for ``scope``"""
+        delay = self._bucket(scope, method).reserve()
+        if delay > 0:
+            record_wait(delay)
+            time.sleep(delay)
+
+        # Checked after pacing, so callers that were already waiting honor a fresh Retry-After
+        blocked_until = cache.get(self._backoff_key(scope, method))
+        if blocked_until:
+            delay = blocked_until - time.time()
+            if delay > 0:
+                record_wait(delay)
+                time.sleep(delay)
+
+    def backoff(self, scope, method, seconds):
+        """Hold back every request to ``method`` for ``scope`` for ``seconds``"""
+        logger.warning(f"Rate limited on {method} for {scope}, backing off {seconds}s")
+        cache.set(self._backoff_key(scope, method), time.time() + seconds, seconds + 1)
+
+
+slack_rate_limiter = RateLimiter(SLACK_TIER_RATES, SLACK_METHOD_TIERS, SLACK_DEFAULT_TIER)
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .conditional import bump_data_version
+from .models import Integration, SyncLog
+from .signals import sync_completed, sync_failed
+from .freebusy import invalidate_freebusy
+from .tasks import notify_user
+
+
+@receiver(sync_completed)
+def invalidate_user_caches(sender, integration, **kwargs):
+    """Drop cached data derived from the synced integration"""
+    invalidate_freebusy(integration.user_id)
+    bump_data_version(integration.user_id)
+
+
+@receiver(post_save, sender=Integration)
+def integration_saved(sender, instance, **kwargs):
+    """Integration status, tokens and sync times are part of the user's data"""
+    bump_data_version(instance.user_id)
+
+
+@receiver(post_delete, sender=Integration)
+def integration_deleted(sender, instance, **kwargs):
+    # Never create a version row here: the user itself may be being deleted
+    bump_data_version(instance.user_id, create=False)
+
+
+@receiver(post_save, sender=SyncLog)
+def sync_log_changed(sender, instance, **kwargs):
+    """New and finished sync logs change the sync log list"""
+    bump_data_version(instance.integration.user_id)
+
+
+@receiver(sync_completed)
+def notify_sync_completed(sender, integration, **kwargs):
+    notify_user(
+        integration.user_id, 'sync_completed',
+        f":white_check_mark: {integration.get_provider_display()} sync completed"
+    )
+
+
+@receiver(sync_failed)
+def notify_sync_failed(sender, integration, sync_log, **kwargs):
+    notify_user(
+        integration.user_id, 'sync_failed',
+        f":warning: {integration.get_provider_display()} {sync_log.sync_type} sync failed: "
+        f"{(sync_log.error_message or '')[:300]}"
+    )
@@ -0,0 +1,182 @@
+import copy
+import heapq
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dateutil.rrule import rrulestr
+from django.utils import timezone
+import logging
+
+from .models import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _occurrence_starts(master_id, updated_at, rules, dtstart, tz_name, is_all_day, range_start, range_end):
+    """
+    Expand recurrence rules into occurrence start times within a range.
+
+    Memoized per master (id and modification time) and range, so repeated
+    list requests for the same window do not re-run the rule engine.
+    """
+    if is_all_day:
+        # All-day rules use floating dates; expand naive and pin back to UTC
+        dtstart = dtstart.replace(tzinfo=None)
+        range_start = range_start.astimezone(timezone.utc).replace(tzinfo=None)
+        range_end = range_end.astimezone(timezone.utc).replace(tzinfo=None)
+    elif tz_name:
+        # Expand in the event's own zone so occurrences keep their wall time across DST
+        try:
+            dtstart = dtstart.astimezone(ZoneInfo(tz_name))
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+
+    try:
+        ruleset = rrulestr('\n'.join(rules), dtstart=dtstart, forceset=True)
+        starts = ruleset.between(range_start, range_end, inc=True)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Could not expand recurrence of event {master_id}: {e}")
+        return ()
+
+    if is_all_day:
+        return tuple(start.replace(tzinfo=timezone.utc) for start in starts)
+    return tuple(start.astimezone(timezone.utc) for start in starts)
+
+
+def expand_recurring_event(master, range_start, range_end, exclude_starts=frozenset()):
+    """Return unsaved CalendarEvent occurrences of a master that overlap the range"""
+    duration = master.end_time - master.start_time
+    starts = _occurrence_starts(
+        master.id,
+        master.updated_at,
+        tuple(master.recurrence),
+        master.start_time,
+        master.timezone or '',
+        master.is_all_day,
+        range_start - duration,
+        range_end,
+    )
+
+    occurrences = []
+    for start in starts:
+        if start in exclude_starts or start + duration <= range_start or start >= range_end:
+            continue
+        occurrence = copy.copy(master)
+        occurrence.start_time = start
+        occurrence.end_time = start + duration
+        occurrence.original_start_time = start
+        # Occurrences share the master's primary key; give each its own identifier
+        occurrence.occurrence_id = f"{master.id}:{start.isoformat()}"
+        occurrences.append(occurrence)
+    return occurrences
+
+
+def expand_masters(masters, range_start, range_end):
+    """
+    Expand many recurring masters at once.
+
+    Occurrences that were modified or cancelled upstream are stored as their
+    own rows pointing at the master, so those original start times are skipped.
+    """
+    masters = list(masters)
+    if not masters:
+        return []
+
+    overridden = {}
+    overrides = CalendarEvent.objects.filter(
+        integration_id__in={master.integration_id for master in masters},
+        recurring_event_id__in={master.provider_event_id for master in masters},
+        original_start_time__isnull=False,
+    ).values_list('integration_id', 'recurring_event_id', 'original_start_time')
+    for integration_id, recurring_event_id, original_start_time in overrides:
+        overridden.setdefault((integration_id, recurring_event_id), set()).add(original_start_time)
+
+    occurrences = []
+    for master in masters:
+        exclude_starts = frozenset(overridden.get((master.integration_id, master.provider_event_id), ()))
+        occurrences.extend(expand_recurring_event(master, range_start, range_end, exclude_starts))
+    return occurrences
+
+
+class MergedEventList:
+    """
+    Stored events and expanded occurrences in start-time order, sliceable
+    like a queryset so it can be handed to a paginator.
+
+    A slice only reads stored rows up to its end, merging the occurrences
+    in as the rows stream from the database, so a page never loads the
+    whole calendar into memory.
+    """
+
+    def __init__(self, queryset, occurrences):
+        self.queryset = queryset
+        self.occurrences = sorted(occurrences, key=attrgetter('start_time'))
+
+    def count(self):
+        return self.queryset.count() + len(self.occurrences)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        rows = self.queryset if index.stop is None else self.queryset[:index.stop]
+        merged = heapq.merge(rows.iterator(), self.occurrences, key=attrgetter('start_time'))
+        return list(islice(merged, index.start, index.stop, index.step))
+
+
+GRAPH_WEEKDAYS = {
+    'monday': 'MO', 'tuesday': 'TU', 'wednesday': 'WE', 'thursday': 'TH',
+    'friday': 'FR', 'saturday': 'SA', 'sunday': 'SU',
+}
+GRAPH_WEEK_INDEX = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'last': -1}
+GRAPH_FREQUENCIES = {
+    'daily': 'DAILY',
+    'weekly': 'WEEKLY',
+    'absoluteMonthly': 'MONTHLY',
+    'relativeMonthly': 'MONTHLY',
+    'absoluteYearly': 'YEARLY',
+    'relativeYearly': 'YEARLY',
+}
+
+
+def graph_recurrence_to_rules(recurrence, is_all_day=False):
+    """
+    Convert a Microsoft Graph patternedRecurrence into RRULE lines.
+
+    The result has the same shape as Google's ``recurrence`` field, so
+    Outlook masters are expanded by the same code path. All-day series are
+    expanded with floating dates, so their UNTIL must be a date as well.
+    """
+    if not recurrence:
+        return []
+    pattern = recurrence.get('pattern') or {}
+    recurrence_range = recurrence.get('range') or {}
+    frequency = GRAPH_FREQUENCIES.get(pattern.get('type'))
+    if frequency is None:
+        return []
+    
+    parts = [f'FREQ={frequency}', f"INTERVAL={pattern.get('interval') or 1}"]
+    days = [GRAPH_WEEKDAYS[day] for day in pattern.get('daysOfWeek') or [] if day in GRAPH_WEEKDAYS]
+    if pattern['type'] in ('absoluteYearly', 'relativeYearly') and pattern.get('month'):
+        parts.append(f"BYMONTH={pattern['month']}")
+    if pattern['type'] in ('absoluteMonthly', 'absoluteYearly') and pattern.get('dayOfMonth'):
+        parts.append(f"BYMONTHDAY={pattern['dayOfMonth']}")
+    if pattern['type'] in ('weekly', 'relativeMonthly', 'relativeYearly') and days:
+        parts.append(f"BYDAY={','.join(days)}")
+    if pattern['type'] in ('relativeMonthly', 'relativeYearly'):
+        parts.append(f"BYSETPOS={GRAPH_WEEK_INDEX.get(pattern.get('index'), 1)}")
+    if pattern['type'] == 'weekly' and pattern.get('firstDayOfWeek') in GRAPH_WEEKDAYS:
+        parts.append(f"WKST={GRAPH_WEEKDAYS[pattern['firstDayOfWeek']]}")
+    
+    if recurrence_range.get('type') == 'endDate' and recurrence_range.get('endDate'):
+        until = recurrence_range['endDate'].replace('-', '')
+        # The end date is inclusive; close timed series at the end of that day in UTC
+        parts.append(f'UNTIL={until}' if is_all_day else f'UNTIL={until}T235959Z')
+    elif recurrence_range.get('type') == 'numbered' and recurrence_range.get('numberOfOccurrences'):
+        parts.append(f"COUNT={recurrence_range['numberOfOccurrences']}")
+    
+    return [f"RRULE:{';'.join(parts)}"]
@@ -0,0 +1,130 @@
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+
+from .conditional import request_data_version
+
+LOCK_TIMEOUT = 30
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+EARLY_EXPIRY_BETA = 1.0
+
+
+class LocalLRU:
+    """Small thread-safe in-process LRU with a deadline per entry"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, deadline = entry
+            if deadline <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        if timeout <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalLRU(settings.RESPONSE_CACHE_LOCAL_MAX_ENTRIES)
+
+
+def _should_refresh_early(expires_at, compute_seconds):
+    """
+    Probabilistic early expiration (XFetch).
+
+    Each reader refreshes slightly before expiry with a probability that grows
+    as expiry nears and with how long the value took to compute, so a hot key
+    is usually rebuilt by one request before every request misses at once.
+    """
+    jitter = -compute_seconds * EARLY_EXPIRY_BETA * math.log(1.0 - random.random())
+    return time.time() + jitter >= expires_at
+
+
+def _compute_and_store(key, compute, timeout):
+    started = time.monotonic()
+    value = compute()
+    compute_seconds = time.monotonic() - started
+    cache.set(key, (value, time.time() + timeout, compute_seconds), timeout)
+    local_cache.set(key, value, min(timeout, settings.RESPONSE_CACHE_LOCAL_TIMEOUT))
+    return value
+
+
+def get_or_compute(key, compute, timeout):
+    """
+    Return a cached value, computing it at most once across processes.
+
+    Lookups go to the in-process LRU first, then to the shared Django cache.
+    On a miss only the request holding ``<key>:lock`` computes the value;
+    others serve the previous value if there is one, or wait briefly for it.
+    """
+    value = local_cache.get(key)
+    if value is not None:
+        return value
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, compute_seconds = entry
+        if not _should_refresh_early(expires_at, compute_seconds):
+            local_cache.set(key, value, min(expires_at - time.time(), settings.RESPONSE_CACHE_LOCAL_TIMEOUT))
+            return value
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            return _compute_and_store(key, compute, timeout)
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        # Someone else is refreshing; the current value is still valid
+        return entry[0]
+
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return _compute_and_store(key, compute, timeout)
+
+
+def cached_response(request, scope, compute, timeout=None, per_user=True):
+    """
+    Cache the payload of a read endpoint for the request's user.
+
+    Keys embed the user's data generation, so bumping it on sync completion
+    invalidates every cached response of that user at once. ``compute`` must
+    return picklable data; exceptions are not cached.
+    """
+    if timeout is None:
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+    if per_user:
+        owner = f'{request.user.id}:{request_data_version(request)[0]}'
+    else:
+        owner = 'all'
+    digest = hashlib.sha1(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return get_or_compute(f'response:{scope}:{owner}:{digest}', compute, timeout)
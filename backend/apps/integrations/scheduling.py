@@ -0,0 +1,182 @@
+from datetime import datetime, time, timedelta
+from itertools import chain
+from zoneinfo import ZoneInfo
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from .freebusy import get_calendar_version
+from .models import CalendarEvent
+from .recurrence import expand_masters
+
+BITMAP_CACHE_TIMEOUT = 3600
+MINUTES_PER_DAY = 24 * 60
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _bitmap_key(user_id, version, day, granularity):
+    return f'busy-bitmap:{user_id}:{version}:{day.isoformat()}:{granularity}'
+
+
+def _build_busy_bitmaps(user_ids, days, granularity):
+    """
+    Build busy bitmaps from CalendarEvent rows for the given users and UTC days.
+
+    Every user gets one boolean array spanning all the days. Event boundaries
+    are written into a difference array, so a cumulative sum marks every slot
+    covered by at least one event without looping over slots.
+    """
+    slots_per_day = MINUTES_PER_DAY // granularity
+    span_start = _day_start(days[0])
+    span_end = _day_start(days[-1]) + timedelta(days=1)
+    total_slots = slots_per_day * len(days)
+    slot_seconds = granularity * 60
+
+    events = CalendarEvent.objects.filter(
+        integration__user_id__in=user_ids,
+        start_time__lt=span_end,
+        is_all_day=False,
+    ).exclude(event_status='cancelled')
+    rows = events.filter(
+        is_recurring=False,
+        end_time__gt=span_start,
+    ).values_list('integration__user_id', 'start_time', 'end_time')
+    masters = events.filter(is_recurring=True).select_related('integration')
+    occurrences = [
+        (occurrence.integration.user_id, occurrence.start_time, occurrence.end_time)
+        for occurrence in expand_masters(masters, span_start, span_end)
+    ]
+
+    per_user = {user_id: ([], []) for user_id in user_ids}
+    for user_id, start, end in chain(rows.iterator(chunk_size=2000), occurrences):
+        starts, ends = per_user[user_id]
+        starts.append((start - span_start).total_seconds())
+        ends.append((end - span_start).total_seconds())
+
+    bitmaps = {}
+    for user_id, (starts, ends) in per_user.items():
+        diff = np.zeros(total_slots + 1, dtype=np.int32)
+        if starts:
+            first = np.clip(np.floor(np.array(starts) / slot_seconds), 0, total_slots).astype(np.int64)
+            last = np.clip(np.ceil(np.array(ends) / slot_seconds), 0, total_slots).astype(np.int64)
+            np.add.at(diff, first, 1)
+            np.add.at(diff, last, -1)
+        bitmaps[user_id] = np.cumsum(diff[:-1]) > 0
+    return bitmaps
+
+
+def get_busy_bitmaps(user_ids, days, granularity):
+    """
+    Return one busy bitmap per user covering ``days`` at ``granularity`` minutes.
+
+    Bitmaps are cached per user and UTC day, keyed by the user's calendar
+    version so a completed sync invalidates them.
+    """
+    slots_per_day = MINUTES_PER_DAY // granularity
+    versions = {user_id: get_calendar_version(user_id) for user_id in user_ids}
+    keys = {
+        (user_id, day): _bitmap_key(user_id, versions[user_id], day, granularity)
+        for user_id in user_ids for day in days
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    missing_users = sorted({user_id for (user_id, day), key in keys.items() if key not in cached})
+    if missing_users:
+        built = _build_busy_bitmaps(missing_users, days, granularity)
+        to_cache = {}
+        for user_id in missing_users:
+            for index, day in enumerate(days):
+                day_bitmap = built[user_id][index * slots_per_day:(index + 1) * slots_per_day]
+                key = keys[(user_id, day)]
+                cached[key] = to_cache[key] = np.packbits(day_bitmap).tobytes()
+        cache.set_many(to_cache, BITMAP_CACHE_TIMEOUT)
+
+    bitmaps = {}
+    for user_id in user_ids:
+        packed = [
+            np.unpackbits(np.frombuffer(cached[keys[(user_id, day)]], dtype=np.uint8))[:slots_per_day]
+            for day in days
+        ]
+        bitmaps[user_id] = np.concatenate(packed).astype(bool)
+    return bitmaps
+
+
+def working_hours_mask(days, granularity, tz_name, work_start, work_end, work_days):
+    """Mark slots that fall inside working hours in the given time zone"""
+    slots_per_day = MINUTES_PER_DAY // granularity
+    span_start = _day_start(days[0])
+    mask = np.zeros(slots_per_day * len(days), dtype=bool)
+    zone = ZoneInfo(tz_name)
+    slot_seconds = granularity * 60
+
+    # Local dates can straddle the UTC span, so look one day either side
+    local_day = days[0] - timedelta(days=1)
+    while local_day <= days[-1] + timedelta(days=1):
+        if local_day.weekday() in work_days:
+            local_start = datetime.combine(local_day, work_start, tzinfo=zone)
+            local_end = datetime.combine(local_day, work_end, tzinfo=zone)
+            first = int(np.ceil((local_start - span_start).total_seconds() / slot_seconds))
+            last = int(np.floor((local_end - span_start).total_seconds() / slot_seconds))
+            first, last = max(first, 0), min(last, len(mask))
+            if first < last:
+                mask[first:last] = True
+        local_day += timedelta(days=1)
+    return mask
+
+
+def find_meeting_slots(user_ids, window_start, window_end, duration_minutes,
+                       granularity=15, default_timezone='UTC', attendee_timezones=(),
+                       work_start=time(9), work_end=time(17), work_days=(0, 1, 2, 3, 4),
+                       limit=10):
+    """
+    Find slots where every attendee is free and inside working hours.
+
+    Working hours are applied in ``default_timezone`` and in every zone of
+    ``attendee_timezones``. External attendees have no calendar data and only
+    contribute their working hours through their time zone.
+    """
+    first_day = window_start.astimezone(timezone.utc).date()
+    last_day = (window_end - timedelta(microseconds=1)).astimezone(timezone.utc).date()
+    days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+
+    slots_per_day = MINUTES_PER_DAY // granularity
+    free = np.ones(slots_per_day * len(days), dtype=bool)
+
+    for busy in get_busy_bitmaps(list(user_ids), days, granularity).values():
+        free &= ~busy
+
+    for tz_name in set(attendee_timezones) | {default_timezone}:
+        free &= working_hours_mask(days, granularity, tz_name, work_start, work_end, work_days)
+
+    # Restrict to the requested window
+    span_start = _day_start(days[0])
+    slot_seconds = granularity * 60
+    offset = int(np.ceil((window_start - span_start).total_seconds() / slot_seconds))
+    end_index = int(np.floor((window_end - span_start).total_seconds() / slot_seconds))
+    free[:max(offset, 0)] = False
+    free[max(end_index, 0):] = False
+
+    # A slot can start wherever `needed` consecutive slots are free
+    needed = max(1, -(-duration_minutes // granularity))
+    if needed > len(free):
+        return []
+    runs = np.concatenate(([0], np.cumsum(free, dtype=np.int32)))
+    starts = np.flatnonzero(runs[needed:] - runs[:-needed] == needed)
+
+    slots = []
+    next_allowed = 0
+    for index in starts:
+        if index < next_allowed:
+            continue
+        slot_start = span_start + timedelta(minutes=int(index) * granularity)
+        slots.append({
+            'start': slot_start,
+            'end': slot_start + timedelta(minutes=duration_minutes),
+        })
+        if len(slots) >= limit:
+            break
+        next_allowed = index + needed
+    return slots
@@ -1,5 +1,11 @@
+from datetime import time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Integration, CalendarEvent, EmailMessage, SyncLog
+from .models import (
+    Integration, CalendarEvent, EmailMessage, EmailBody, EmailAttachment, SyncLog, CalendarFeedToken,
+    CalendarShare, SlackChannel, SlackMessage
+)
 
 
 class IntegrationSerializer(serializers.ModelSerializer):
@@ -33,10 +39,11 @@ class CalendarEventSerializer(serializers.ModelSerializer):
             'id', 'integration', 'integration_provider', 'provider_event_id',
             'title', 'description', 'location', 'start_time', 'end_time',
             'is_all_day', 'timezone', 'attendees', 'created_by', 'event_status',
-            'last_modified', 'synced_at', 'created_at', 'updated_at'
+            'recurrence', 'is_recurring', 'recurring_event_id', 'original_start_time',
+            'fingerprint', 'last_modified', 'synced_at', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'integration', 'provider_event_id', 'last_modified',
+            'id', 'integration', 'provider_event_id', 'fingerprint', 'last_modified',
             'synced_at', 'created_at', 'updated_at'
         ]
 
@@ -44,33 +51,65 @@ class CalendarEventSerializer(serializers.ModelSerializer):
 class CalendarEventListSerializer(serializers.ModelSerializer):
     """Simplified serializer for calendar event lists"""
     
+    id = serializers.SerializerMethodField()
     integration_provider = serializers.CharField(source='integration.get_provider_display', read_only=True)
     
     class Meta:
         model = CalendarEvent
         fields = [
             'id', 'integration_provider', 'title', 'start_time', 'end_time',
-            'is_all_day', 'location', 'event_status'
+            'is_all_day', 'location', 'event_status', 'is_recurring'
         ]
+    
+    def get_id(self, obj):
+        """Expanded occurrences are identified as '<master id>:<original start>'"""
+        return getattr(obj, 'occurrence_id', obj.id)
+
+
+class EmailAttachmentSerializer(serializers.ModelSerializer):
+    """Serializer for EmailAttachment model"""
+    
+    class Meta:
+        model = EmailAttachment
+        fields = ['id', 'filename', 'mime_type', 'size', 'content_id', 'is_inline']
 
 
 class EmailMessageSerializer(serializers.ModelSerializer):
     """Serializer for EmailMessage model"""
     
     integration_provider = serializers.CharField(source='integration.get_provider_display', read_only=True)
+    body_text = serializers.SerializerMethodField()
+    body_html = serializers.SerializerMethodField()
+    attachments = EmailAttachmentSerializer(many=True, read_only=True)
     
     class Meta:
         model = EmailMessage
         fields = [
             'id', 'integration', 'integration_provider', 'provider_message_id',
-            'thread_id', 'subject', 'sender', 'recipients', 'body_text', 'body_html',
+            'thread_id', 'subject', 'sender', 'recipients', 'snippet', 'body_text', 'body_html',
             'received_at', 'is_read', 'is_important', 'labels', 'has_attachments',
-            'attachment_count', 'synced_at', 'created_at', 'updated_at'
+            'attachment_count', 'attachments', 'synced_at', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'integration', 'provider_message_id', 'thread_id',
             'synced_at', 'created_at', 'updated_at'
         ]
+    
+    def _get_body(self, obj):
+        try:
+            return obj.body
+        except EmailBody.DoesNotExist:
+            return None
+    
+    def get_body_text(self, obj):
+        """Decompressed plain-text body"""
+        body = self._get_body(obj)
+        return body.get_text() if body else ''
+    
+    def get_body_html(self, obj):
+        """Decompressed HTML body"""
+        body = self._get_body(obj)
+        return body.get_html() if body else ''
 
 
 class EmailMessageListSerializer(serializers.ModelSerializer):
@@ -81,7 +120,7 @@ class EmailMessageListSerializer(serializers.ModelSerializer):
     class Meta:
         model = EmailMessage
         fields = [
-            'id', 'integration_provider', 'subject', 'sender', 'received_at',
+            'id', 'integration_provider', 'subject', 'sender', 'snippet', 'received_at',
             'is_read', 'is_important', 'has_attachments', 'labels'
         ]
 
@@ -98,7 +137,7 @@ class SyncLogSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'integration', 'integration_provider', 'sync_type', 'status',
             'status_display', 'items_processed', 'items_created', 'items_updated',
-            'items_deleted', 'error_message', 'started_at', 'completed_at', 'duration'
+            'items_deleted', 'error_message', 'metrics', 'started_at', 'completed_at', 'duration'
         ]
         read_only_fields = ['id', 'duration']
     
@@ -110,6 +149,72 @@ class SyncLogSerializer(serializers.ModelSerializer):
         return None
 
 
+class SlackChannelSerializer(serializers.ModelSerializer):
+    """Serializer for synced Slack channels"""
+    
+    class Meta:
+        model = SlackChannel
+        fields = [
+            'id', 'integration', 'channel_id', 'name', 'is_private', 'is_archived',
+            'is_member', 'topic', 'purpose', 'num_members', 'synced_at'
+        ]
+
+
+class SlackMessageSerializer(serializers.ModelSerializer):
+    """Serializer for synced Slack messages"""
+    
+    channel_name = serializers.CharField(source='channel.name', read_only=True)
+    
+    class Meta:
+        model = SlackMessage
+        fields = [
+            'id', 'channel', 'channel_name', 'ts', 'thread_ts', 'slack_user_id', 'text',
+            'subtype', 'reply_count', 'sent_at', 'edited_at'
+        ]
+
+
+class SlackNotificationSettingsSerializer(serializers.Serializer):
+    """Serializer for Slack notification preferences"""
+    
+    enabled = serializers.BooleanField(default=True)
+    channel = serializers.CharField(max_length=32, allow_blank=True, default='')
+    events = serializers.MultipleChoiceField(
+        choices=[('sync_completed', 'Sync completed'), ('sync_failed', 'Sync failed')],
+        default=['sync_failed']
+    )
+
+
+class CalendarFeedTokenSerializer(serializers.ModelSerializer):
+    """Serializer for calendar feed subscription tokens"""
+    
+    feed_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CalendarFeedToken
+        fields = ['id', 'name', 'token', 'feed_url', 'is_active', 'last_used_at', 'created_at']
+        read_only_fields = ['id', 'token', 'feed_url', 'is_active', 'last_used_at', 'created_at']
+    
+    def get_feed_url(self, obj):
+        path = reverse('integrations:calendar-feed', kwargs={'token': obj.token})
+        request = self.context.get('request')
+        return request.build_absolute_uri(path) if request else path
+
+
+class CalendarShareSerializer(serializers.ModelSerializer):
+    """Serializer for calendars shared with other accounts"""
+    
+    class Meta:
+        model = CalendarShare
+        fields = ['id', 'email', 'created_at']
+        read_only_fields = ['id', 'created_at']
+    
+    def validate_email(self, value):
+        value = value.lower()
+        if value == self.context['request'].user.email.lower():
+            raise serializers.ValidationError('You cannot share your calendar with yourself')
+        return value
+
+
 class IntegrationStatsSerializer(serializers.Serializer):
     """Serializer for integration statistics"""
     
@@ -133,7 +238,43 @@ class ManualSyncSerializer(serializers.Serializer):
     """Serializer for manual sync requests"""
     
     sync_type = serializers.ChoiceField(
-        choices=[('calendar', 'Calendar'), ('email', 'Email'), ('full', 'Full')],
+        choices=[('calendar', 'Calendar'), ('email', 'Email'), ('messages', 'Messages'), ('full', 'Full')],
         default='full'
     )
-    force_refresh = serializers.BooleanField(default=False)
\ No newline at end of file
+    force_refresh = serializers.BooleanField(default=False)
+
+
+class MeetingSlotSearchSerializer(serializers.Serializer):
+    """Serializer for multi-attendee meeting slot searches"""
+    
+    attendees = serializers.ListField(child=serializers.CharField(), default=list)
+    include_self = serializers.BooleanField(default=True)
+    duration_minutes = serializers.IntegerField(min_value=5, max_value=24 * 60)
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    granularity_minutes = serializers.ChoiceField(choices=[5, 10, 15, 30, 60], default=15)
+    timezone = serializers.CharField(default='UTC')
+    attendee_timezones = serializers.DictField(child=serializers.CharField(), default=dict)
+    work_start = serializers.TimeField(default=time(9))
+    work_end = serializers.TimeField(default=time(17))
+    work_days = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6), default=[0, 1, 2, 3, 4]
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    
+    def validate(self, data):
+        if data['end'] <= data['start']:
+            raise serializers.ValidationError('End must be after start')
+        if data['end'] - data['start'] > timedelta(days=31):
+            raise serializers.ValidationError('Search window cannot exceed 31 days')
+        if data['work_end'] <= data['work_start']:
+            raise serializers.ValidationError('Working hours must end after they start')
+        if len(data['attendees']) > 100:
+            raise serializers.ValidationError('At most 100 attendees are supported')
+        
+        for tz_name in [data['timezone'], *data['attendee_timezones'].values()]:
+            try:
+                ZoneInfo(tz_name)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise serializers.ValidationError(f'Unknown time zone: {tz_name}')
+        return data
@@ -1,10 +1,24 @@
-import requests
 import json
+import base64
+import re
+import uuid
 from datetime import datetime, timedelta
+from urllib.parse import quote
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from django.conf import settings
+from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from .models import Integration, CalendarEvent, EmailMessage, SyncLog
+from .models import (
+    Integration, CalendarEvent, EmailMessage, EmailBody, EmailAttachment, SyncLog,
+    WatchChannel, WebhookSubscription, SlackChannel, SlackMessage, generate_channel_token
+)
+from .mime import parse_gmail_payload
+from .rate_limit import SLACK_PER_CHANNEL_METHODS, slack_rate_limiter
+from .recurrence import graph_recurrence_to_rules
+from .signals import sync_completed, sync_failed
+from .sync_metrics import phase, record_retry, start_recording, stop_recording, tracked_request
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,7 +37,8 @@ class OAuthService:
     def get_valid_token(self):
         """Get a valid access token, refreshing if necessary"""
         if self.integration.is_token_expired:
-            self.refresh_access_token()
+            with phase('token_refresh'):
+                self.refresh_access_token()
         return self.integration.get_access_token()
     
     def make_authenticated_request(self, url, method='GET', **kwargs):
@@ -36,16 +51,61 @@ class OAuthService:
         headers['Authorization'] = f'Bearer {token}'
         kwargs['headers'] = headers
         
-        response = requests.request(method, url, **kwargs)
+        response = tracked_request(method, url, **kwargs)
         
         if response.status_code == 401:
             # Token might be expired, try refreshing
-            self.refresh_access_token()
+            record_retry()
+            with phase('token_refresh'):
+                self.refresh_access_token()
             token = self.integration.get_access_token()
             headers['Authorization'] = f'Bearer {token}'
-            response = requests.request(method, url, **kwargs)
+            response = tracked_request(method, url, **kwargs)
         
         return response
+    
+    def start_sync_log(self, sync_type):
+        """Open a SyncLog and start recording the metrics of the sync it covers"""
+        sync_log = SyncLog.objects.create(
+            integration=self.integration,
+            sync_type=sync_type,
+            status='started'
+        )
+        sync_log.recorder = start_recording()
+        return sync_log
+    
+    def _stop_recording(self, sync_log):
+        recorder = getattr(sync_log, 'recorder', None)
+        if recorder is not None:
+            sync_log.metrics = stop_recording(recorder)
+            sync_log.recorder = None
+    
+    def mark_sync_completed(self, sync_log, processed=0, created=0, updated=0, deleted=0):
+        """Record a successful sync on its log and on the integration"""
+        self._stop_recording(sync_log)
+        sync_log.status = 'completed'
+        sync_log.items_processed = processed
+        sync_log.items_created = created
+        sync_log.items_updated = updated
+        sync_log.items_deleted = deleted
+        sync_log.completed_at = timezone.now()
+        sync_log.save()
+        self.mark_synced()
+    
+    def mark_synced(self):
+        """Record a finished sync on the integration and notify listeners"""
+        self.integration.last_sync = timezone.now()
+        self.integration.save()
+        sync_completed.send(sender=self.__class__, integration=self.integration)
+    
+    def mark_sync_failed(self, sync_log, error):
+        """Record a failed sync on its log and notify listeners"""
+        self._stop_recording(sync_log)
+        sync_log.status = 'failed'
+        sync_log.error_message = str(error)
+        sync_log.completed_at = timezone.now()
+        sync_log.save()
+        sync_failed.send(sender=self.__class__, integration=self.integration, sync_log=sync_log)
 
 
 class GoogleOAuthService(OAuthService):
@@ -54,6 +114,7 @@ class GoogleOAuthService(OAuthService):
     GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
     GOOGLE_CALENDAR_API = 'https://www.googleapis.com/calendar/v3'
     GOOGLE_GMAIL_API = 'https://gmail.googleapis.com/gmail/v1'
+    GMAIL_LIST_PAGE_LIMIT = 500
     
     @classmethod
     def get_oauth_url(cls, provider, state=None):
@@ -99,7 +160,7 @@ class GoogleOAuthService(OAuthService):
             'redirect_uri': redirect_uri,
         }
         
-        response = requests.post(cls.GOOGLE_TOKEN_URL, data=data)
+        response = tracked_request('POST', cls.GOOGLE_TOKEN_URL, data=data)
         
         if response.status_code == 200:
             token_data = response.json()
@@ -129,7 +190,7 @@ class GoogleOAuthService(OAuthService):
             'grant_type': 'refresh_token',
         }
         
-        response = requests.post(self.GOOGLE_TOKEN_URL, data=data)
+        response = tracked_request('POST', self.GOOGLE_TOKEN_URL, phase_name='token_refresh', data=data)
         
         if response.status_code == 200:
             token_data = response.json()
@@ -156,241 +217,452 @@ class GoogleOAuthService(OAuthService):
             logger.error(f"Failed to get user info: {response.text}")
             return None
     
-    def sync_calendar_events(self, calendar_id='primary'):
-        """Sync Google Calendar events"""
+    @staticmethod
+    def _parse_event_time(value):
+        """Parse a Google start/end object into (datetime, is_all_day)"""
+        if 'date' in value:
+            return datetime.fromisoformat(value['date']).replace(tzinfo=timezone.utc), True
+        return datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00')), False
+    
+    def _parse_calendar_event(self, event_data):
+        """Build CalendarEvent field values from a Google Calendar event"""
+        original_start = event_data.get('originalStartTime')
+        original_start_time = self._parse_event_time(original_start)[0] if original_start else None
+        
+        # Cancelled occurrences of a recurring event only carry their original start
+        start = event_data.get('start') or original_start or {}
+        end = event_data.get('end') or start
+        start_time, is_all_day = self._parse_event_time(start)
+        end_time, _ = self._parse_event_time(end)
+        
+        # Extract attendees
+        attendees = []
+        for attendee in event_data.get('attendees', []):
+            attendees.append({
+                'email': attendee.get('email'),
+                'displayName': attendee.get('displayName'),
+                'responseStatus': attendee.get('responseStatus')
+            })
+        
+        return {
+            'title': event_data.get('summary', 'No Title'),
+            'description': event_data.get('description', ''),
+            'location': event_data.get('location', ''),
+            'start_time': start_time,
+            'end_time': end_time,
+            'is_all_day': is_all_day,
+            'timezone': start.get('timeZone', ''),
+            'attendees': attendees,
+            'created_by': event_data.get('creator', {}).get('email', ''),
+            'event_status': event_data.get('status', 'confirmed'),
+            'recurrence': event_data.get('recurrence', []),
+            'is_recurring': bool(event_data.get('recurrence')),
+            'recurring_event_id': event_data.get('recurringEventId'),
+            'original_start_time': original_start_time,
+            'last_modified': datetime.fromisoformat(
+                event_data.get('updated', timezone.now().isoformat()).replace('Z', '+00:00')
+            )
+        }
+    
+    def sync_calendar_events(self, calendar_id='primary', incremental=False):
+        """Sync Google Calendar events; ``incremental`` fetches only changes since the stored sync token"""
         if self.integration.provider != 'google_calendar':
             return
         
-        sync_log = SyncLog.objects.create(
-            integration=self.integration,
-            sync_type='calendar',
-            status='started'
-        )
+        sync_log = self.start_sync_log('calendar')
         
         try:
             # Get events from the last 30 days to 30 days in the future
             time_min = (timezone.now() - timedelta(days=30)).isoformat()
             time_max = (timezone.now() + timedelta(days=30)).isoformat()
             
+            # In 'master' mode recurring events are stored once with their
+            # rules and expanded locally instead of one row per occurrence
+            store_masters = settings.GOOGLE_CALENDAR_RECURRENCE_MODE == 'master'
+            
             url = f"{self.GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events"
-            params = {
+            full_params = {
                 'timeMin': time_min,
                 'timeMax': time_max,
-                'singleEvents': True,
-                'orderBy': 'startTime',
-                'maxResults': 250
+                'maxResults': 250,
+                'singleEvents': not store_masters,
             }
+            params = dict(full_params)
             
-            response = self.make_authenticated_request(url, params=params)
+            sync_tokens = self.integration.sync_state.setdefault('calendar_sync_tokens', {})
+            if incremental and sync_tokens.get(calendar_id):
+                # Only changes since the last sync; time bounds are not allowed with a sync token
+                params = {
+                    'syncToken': sync_tokens[calendar_id],
+                    'maxResults': 250,
+                    'singleEvents': not store_masters,
+                }
+            
+            processed_count = 0
+            created_count = 0
+            updated_count = 0
+            deleted_count = 0
             
-            if response.status_code == 200:
-                events_data = response.json()
-                events = events_data.get('items', [])
+            while True:
+                response = self.make_authenticated_request(url, params=params)
+                if response.status_code == 410 and 'syncToken' in params:
+                    # The sync token expired; start over with a full sync
+                    logger.info(f"Calendar sync token expired for {self.integration}, running a full sync")
+                    record_retry()
+                    params = dict(full_params)
+                    continue
+                if response.status_code != 200:
+                    raise Exception(f"API request failed: {response.text}")
                 
-                created_count = 0
-                updated_count = 0
+                with phase('parse'):
+                    events_data = response.json()
+                events = [event for event in events_data.get('items', []) if event.get('id')]
+                processed_count += len(events)
+                
+                # Deleted events only appear in incremental results. Cancelled
+                # occurrences of a stored master are kept as override rows.
+                cancelled_ids = [
+                    event['id'] for event in events
+                    if event.get('status') == 'cancelled'
+                    and not (store_masters and event.get('recurringEventId'))
+                ]
+                if cancelled_ids:
+                    with phase('db_write'):
+                        deleted, _ = CalendarEvent.objects.filter(
+                            integration=self.integration,
+                            provider_event_id__in=cancelled_ids
+                        ).delete()
+                    deleted_count += deleted
+                    events = [event for event in events if event['id'] not in set(cancelled_ids)]
+                
+                # Skip rows whose provider modification time has not changed
+                with phase('db_write'):
+                    known = dict(
+                        CalendarEvent.objects.filter(
+                            integration=self.integration,
+                            provider_event_id__in=[event['id'] for event in events]
+                        ).values_list('provider_event_id', 'last_modified')
+                    )
                 
                 for event_data in events:
-                    event_id = event_data.get('id')
-                    if not event_id:
+                    with phase('parse'):
+                        defaults = self._parse_calendar_event(event_data)
+                    if known.get(event_data['id']) == defaults['last_modified']:
                         continue
                     
-                    # Parse event data
-                    start = event_data.get('start', {})
-                    end = event_data.get('end', {})
-                    
-                    # Handle all-day events
-                    if 'date' in start:
-                        start_time = datetime.fromisoformat(start['date']).replace(tzinfo=timezone.utc)
-                        end_time = datetime.fromisoformat(end['date']).replace(tzinfo=timezone.utc)
-                        is_all_day = True
-                    else:
-                        start_time = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
-                        end_time = datetime.fromisoformat(end['dateTime'].replace('Z', '+00:00'))
-                        is_all_day = False
-                    
-                    # Extract attendees
-                    attendees = []
-                    for attendee in event_data.get('attendees', []):
-                        attendees.append({
-                            'email': attendee.get('email'),
-                            'displayName': attendee.get('displayName'),
-                            'responseStatus': attendee.get('responseStatus')
-                        })
-                    
                     # Create or update event
-                    event_obj, created = CalendarEvent.objects.update_or_create(
-                        integration=self.integration,
-                        provider_event_id=event_id,
-                        defaults={
-                            'title': event_data.get('summary', 'No Title'),
-                            'description': event_data.get('description', ''),
-                            'location': event_data.get('location', ''),
-                            'start_time': start_time,
-                            'end_time': end_time,
-                            'is_all_day': is_all_day,
-                            'timezone': start.get('timeZone', ''),
-                            'attendees': attendees,
-                            'created_by': event_data.get('creator', {}).get('email', ''),
-                            'event_status': event_data.get('status', 'confirmed'),
-                            'last_modified': datetime.fromisoformat(
-                                event_data.get('updated', timezone.now().isoformat()).replace('Z', '+00:00')
-                            )
-                        }
-                    )
+                    with phase('db_write'):
+                        event_obj, created = CalendarEvent.objects.update_or_create(
+                            integration=self.integration,
+                            provider_event_id=event_data['id'],
+                            defaults=defaults
+                        )
+                        
+                        if created and event_obj.is_recurring:
+                            # Drop occurrence rows stored before switching to master mode
+                            CalendarEvent.objects.filter(
+                                integration=self.integration,
+                                provider_event_id__startswith=f"{event_obj.provider_event_id}_",
+                                recurring_event_id__isnull=True
+                            ).delete()
                     
                     if created:
                         created_count += 1
                     else:
                         updated_count += 1
                 
-                # Update sync log
-                sync_log.status = 'completed'
-                sync_log.items_processed = len(events)
-                sync_log.items_created = created_count
-                sync_log.items_updated = updated_count
-                sync_log.completed_at = timezone.now()
-                sync_log.save()
-                
-                # Update integration last sync
-                self.integration.last_sync = timezone.now()
-                self.integration.save()
-                
-                logger.info(f"Synced {len(events)} calendar events for {self.integration}")
-                
-            else:
-                raise Exception(f"API request failed: {response.text}")
+                page_token = events_data.get('nextPageToken')
+                if not page_token:
+                    break
+                params['pageToken'] = page_token
+            
+            # The last page carries the token for the next incremental sync
+            if events_data.get('nextSyncToken'):
+                sync_tokens[calendar_id] = events_data['nextSyncToken']
+            
+            self.mark_sync_completed(sync_log, processed_count, created_count, updated_count, deleted_count)
+            
+            logger.info(f"Synced {processed_count} calendar events for {self.integration}")
                 
         except Exception as e:
-            sync_log.status = 'failed'
-            sync_log.error_message = str(e)
-            sync_log.completed_at = timezone.now()
-            sync_log.save()
+            self.mark_sync_failed(sync_log, e)
             logger.error(f"Calendar sync failed for {self.integration}: {e}")
             raise
     
-    def sync_gmail_messages(self, max_results=50):
-        """Sync Gmail messages"""
-        if self.integration.provider != 'google_gmail':
-            return
+    def _store_gmail_message(self, message_id):
+        """Fetch one Gmail message and store it; returns whether it was created, or None if unavailable"""
+        message_url = f"{self.GOOGLE_GMAIL_API}/users/me/messages/{message_id}"
+        message_response = self.make_authenticated_request(message_url)
+        if message_response.status_code != 200:
+            return None
         
-        sync_log = SyncLog.objects.create(
-            integration=self.integration,
-            sync_type='email',
-            status='started'
+        with phase('parse'):
+            message_data = message_response.json()
+            
+            # Parse message headers
+            headers = {h['name']: h['value'] for h in message_data.get('payload', {}).get('headers', [])}
+            
+            # Walk the MIME tree for bodies, snippet and attachments
+            payload = message_data.get('payload', {})
+            parsed = parse_gmail_payload(
+                payload, fetch_body=lambda attachment_id: self.get_attachment_content(message_id, attachment_id)
+            )
+            attachments = parsed['attachments']
+        
+        # Parse labels
+        labels = message_data.get('labelIds', [])
+        
+        # Check if read
+        is_read = 'UNREAD' not in labels
+        is_important = 'IMPORTANT' in labels
+        
+        # Parse date
+        received_at = datetime.fromtimestamp(
+            int(message_data.get('internalDate', 0)) / 1000,
+            tz=timezone.utc
         )
         
-        try:
-            # Get recent messages
-            url = f"{self.GOOGLE_GMAIL_API}/users/me/messages"
-            params = {
-                'maxResults': max_results,
-                'q': 'in:inbox'
-            }
+        with phase('db_write'):
+            # Create or update message
+            message_obj, created = EmailMessage.objects.update_or_create(
+                integration=self.integration,
+                provider_message_id=message_id,
+                defaults={
+                    'thread_id': message_data.get('threadId', ''),
+                    'subject': headers.get('Subject', 'No Subject'),
+                    'sender': headers.get('From', ''),
+                    'recipients': [headers.get('To', '')],
+                    'snippet': parsed['snippet'],
+                    'received_at': received_at,
+                    'is_read': is_read,
+                    'is_important': is_important,
+                    'labels': labels,
+                    'has_attachments': bool(attachments),
+                    'attachment_count': len(attachments)
+                }
+            )
+            
+            # Store the decoded, compressed body in its own table
+            body = EmailBody(message=message_obj)
+            body.set_text(parsed['text'])
+            body.set_html(parsed['html'])
+            body.save()
             
+            if not created:
+                message_obj.attachments.all().delete()
+            EmailAttachment.objects.bulk_create([
+                EmailAttachment(message=message_obj, **attachment)
+                for attachment in attachments
+            ])
+        return created
+    
+    def _get_gmail_history_changes(self, start_history_id):
+        """
+        Collect message changes since a history id.
+        
+        Returns ``(changed_ids, deleted_ids, history_id)``, or None when the
+        history id is too old and a full sync is needed.
+        """
+        url = f"{self.GOOGLE_GMAIL_API}/users/me/history"
+        params = {
+            'startHistoryId': start_history_id,
+            'historyTypes': ['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+            'maxResults': 500,
+        }
+        
+        added = set()
+        relabeled = set()
+        deleted = set()
+        history_id = start_history_id
+        while True:
             response = self.make_authenticated_request(url, params=params)
+            if response.status_code == 404:
+                return None
+            if response.status_code != 200:
+                raise Exception(f"API request failed: {response.text}")
             
-            if response.status_code == 200:
-                messages_data = response.json()
-                messages = messages_data.get('messages', [])
+            with phase('parse'):
+                data = response.json()
+            for record in data.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    message = item.get('message', {})
+                    if 'INBOX' in message.get('labelIds', []):
+                        added.add(message['id'])
+                for item in record.get('labelsAdded', []) + record.get('labelsRemoved', []):
+                    relabeled.add(item['message']['id'])
+                for item in record.get('messagesDeleted', []):
+                    deleted.add(item['message']['id'])
+            history_id = data.get('historyId', history_id)
+            
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
+            params['pageToken'] = page_token
+        
+        # Label changes only matter for messages already stored
+        if relabeled:
+            added |= set(
+                EmailMessage.objects.filter(
+                    integration=self.integration,
+                    provider_message_id__in=relabeled
+                ).values_list('provider_message_id', flat=True)
+            )
+        return added - deleted, deleted, history_id
+    
+    def sync_gmail_messages(self, max_results=50, incremental=False):
+        """Sync Gmail messages; ``incremental`` fetches only changes since the stored history id"""
+        if self.integration.provider != 'google_gmail':
+            return
+        
+        sync_log = self.start_sync_log('email')
+        
+        try:
+            changes = None
+            stored_history_id = self.integration.sync_state.get('gmail_history_id')
+            if incremental and stored_history_id:
+                changes = self._get_gmail_history_changes(stored_history_id)
+            
+            if changes is None:
+                # Read the mailbox position first so changes during the sync are not missed
+                profile_response = self.make_authenticated_request(f"{self.GOOGLE_GMAIL_API}/users/me/profile")
+                history_id = profile_response.json().get('historyId') if profile_response.status_code == 200 else None
                 
-                created_count = 0
-                updated_count = 0
+                # Get recent messages; a list page holds at most 500 ids
+                url = f"{self.GOOGLE_GMAIL_API}/users/me/messages"
+                params = {
+                    'maxResults': min(max_results, self.GMAIL_LIST_PAGE_LIMIT),
+                    'q': 'in:inbox'
+                }
                 
-                for message_ref in messages:
-                    message_id = message_ref.get('id')
-                    if not message_id:
-                        continue
+                message_ids = []
+                while len(message_ids) < max_results:
+                    response = self.make_authenticated_request(url, params=params)
+                    if response.status_code != 200:
+                        raise Exception(f"API request failed: {response.text}")
                     
-                    # Get full message details
-                    message_url = f"{self.GOOGLE_GMAIL_API}/users/me/messages/{message_id}"
-                    message_response = self.make_authenticated_request(message_url)
+                    with phase('parse'):
+                        data = response.json()
+                    message_ids.extend(message['id'] for message in data.get('messages', []) if message.get('id'))
                     
-                    if message_response.status_code == 200:
-                        message_data = message_response.json()
-                        
-                        # Parse message headers
-                        headers = {h['name']: h['value'] for h in message_data.get('payload', {}).get('headers', [])}
-                        
-                        # Extract body
-                        body_text = ''
-                        body_html = ''
-                        payload = message_data.get('payload', {})
-                        
-                        if 'parts' in payload:
-                            for part in payload['parts']:
-                                if part.get('mimeType') == 'text/plain':
-                                    body_text = part.get('body', {}).get('data', '')
-                                elif part.get('mimeType') == 'text/html':
-                                    body_html = part.get('body', {}).get('data', '')
-                        else:
-                            if payload.get('mimeType') == 'text/plain':
-                                body_text = payload.get('body', {}).get('data', '')
-                            elif payload.get('mimeType') == 'text/html':
-                                body_html = payload.get('body', {}).get('data', '')
-                        
-                        # Parse labels
-                        labels = message_data.get('labelIds', [])
-                        
-                        # Check if read
-                        is_read = 'UNREAD' not in labels
-                        is_important = 'IMPORTANT' in labels
-                        
-                        # Parse date
-                        received_at = datetime.fromtimestamp(
-                            int(message_data.get('internalDate', 0)) / 1000,
-                            tz=timezone.utc
-                        )
-                        
-                        # Create or update message
-                        message_obj, created = EmailMessage.objects.update_or_create(
-                            integration=self.integration,
-                            provider_message_id=message_id,
-                            defaults={
-                                'thread_id': message_data.get('threadId', ''),
-                                'subject': headers.get('Subject', 'No Subject'),
-                                'sender': headers.get('From', ''),
-                                'recipients': [headers.get('To', '')],
-                                'body_text': body_text,
-                                'body_html': body_html,
-                                'received_at': received_at,
-                                'is_read': is_read,
-                                'is_important': is_important,
-                                'labels': labels,
-                                'has_attachments': len(payload.get('parts', [])) > 1,
-                                'attachment_count': len([p for p in payload.get('parts', []) if p.get('filename')])
-                            }
-                        )
-                        
-                        if created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-                
-                # Update sync log
-                sync_log.status = 'completed'
-                sync_log.items_processed = len(messages)
-                sync_log.items_created = created_count
-                sync_log.items_updated = updated_count
-                sync_log.completed_at = timezone.now()
-                sync_log.save()
-                
-                # Update integration last sync
-                self.integration.last_sync = timezone.now()
-                self.integration.save()
-                
-                logger.info(f"Synced {len(messages)} email messages for {self.integration}")
+                    page_token = data.get('nextPageToken')
+                    if not page_token:
+                        break
+                    params['pageToken'] = page_token
+                    params['maxResults'] = min(max_results - len(message_ids), self.GMAIL_LIST_PAGE_LIMIT)
                 
-            else:
-                raise Exception(f"API request failed: {response.text}")
+                changes = (message_ids[:max_results], set(), history_id)
+            
+            message_ids, deleted_ids, history_id = changes
+            
+            created_count = 0
+            updated_count = 0
+            for message_id in message_ids:
+                created = self._store_gmail_message(message_id)
+                if created:
+                    created_count += 1
+                elif created is not None:
+                    updated_count += 1
+            
+            deleted_count = 0
+            if deleted_ids:
+                with phase('db_write'):
+                    _, deleted_by_model = EmailMessage.objects.filter(
+                        integration=self.integration,
+                        provider_message_id__in=deleted_ids
+                    ).delete()
+                deleted_count = deleted_by_model.get(EmailMessage._meta.label, 0)
+            
+            if history_id:
+                self.integration.sync_state['gmail_history_id'] = history_id
+            
+            self.mark_sync_completed(
+                sync_log, len(message_ids) + len(deleted_ids), created_count, updated_count, deleted_count
+            )
+            
+            logger.info(f"Synced {len(message_ids)} email messages for {self.integration}")
                 
         except Exception as e:
-            sync_log.status = 'failed'
-            sync_log.error_message = str(e)
-            sync_log.completed_at = timezone.now()
-            sync_log.save()
+            self.mark_sync_failed(sync_log, e)
             logger.error(f"Email sync failed for {self.integration}: {e}")
             raise
+    
+    def get_attachment_content(self, message_id, attachment_id):
+        """Download the raw bytes of a Gmail attachment"""
+        url = f"{self.GOOGLE_GMAIL_API}/users/me/messages/{message_id}/attachments/{attachment_id}"
+        response = self.make_authenticated_request(url)
+        
+        if response.status_code != 200:
+            raise Exception(f"Attachment download failed: {response.text}")
+        
+        data = response.json().get('data', '')
+        return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+    
+    @staticmethod
+    def _parse_expiration(value):
+        """Google reports channel expiry in epoch milliseconds"""
+        return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+    
+    def watch_calendar(self, calendar_id='primary'):
+        """Register a push channel for a calendar's events"""
+        channel_id = uuid.uuid4().hex
+        token = generate_channel_token()
+        url = f"{self.GOOGLE_CALENDAR_API}/calendars/{quote(calendar_id, safe='@')}/events/watch"
+        response = self.make_authenticated_request(url, method='POST', json={
+            'id': channel_id,
+            'type': 'web_hook',
+            'address': settings.GOOGLE_PUSH_WEBHOOK_URL,
+            'token': token,
+            'params': {'ttl': str(settings.GOOGLE_PUSH_CHANNEL_TTL)},
+        })
+        if response.status_code != 200:
+            raise Exception(f"Calendar watch failed: {response.text}")
+        
+        data = response.json()
+        return WatchChannel.objects.create(
+            integration=self.integration,
+            resource_type='calendar',
+            calendar_id=calendar_id,
+            channel_id=channel_id,
+            resource_id=data.get('resourceId', ''),
+            token=token,
+            expires_at=self._parse_expiration(data['expiration'])
+        )
+    
+    def watch_gmail(self):
+        """Ask Gmail to publish inbox changes to the configured Pub/Sub topic"""
+        url = f"{self.GOOGLE_GMAIL_API}/users/me/watch"
+        response = self.make_authenticated_request(url, method='POST', json={
+            'topicName': settings.GOOGLE_PUBSUB_TOPIC,
+            'labelIds': ['INBOX'],
+            'labelFilterBehavior': 'include',
+        })
+        if response.status_code != 200:
+            raise Exception(f"Gmail watch failed: {response.text}")
+        
+        # Gmail keeps a single watch per mailbox; calling watch again renews it
+        channel, _ = WatchChannel.objects.update_or_create(
+            integration=self.integration,
+            resource_type='gmail',
+            defaults={
+                'channel_id': f'gmail-{self.integration.id}',
+                'expires_at': self._parse_expiration(response.json()['expiration']),
+            }
+        )
+        return channel
+    
+    def stop_watch_channel(self, channel):
+        """Stop a push channel upstream and forget it"""
+        if channel.resource_type == 'calendar':
+            url = f"{self.GOOGLE_CALENDAR_API}/channels/stop"
+            payload = {'id': channel.channel_id, 'resourceId': channel.resource_id}
+        else:
+            url = f"{self.GOOGLE_GMAIL_API}/users/me/stop"
+            payload = None
+        
+        response = self.make_authenticated_request(url, method='POST', json=payload)
+        if response.status_code not in (200, 204, 404):
+            logger.warning(f"Stopping watch channel {channel.channel_id} failed: {response.text}")
+        channel.delete()
 
 
 class MicrosoftOAuthService(OAuthService):
@@ -400,6 +672,10 @@ class MicrosoftOAuthService(OAuthService):
     MICROSOFT_GRAPH_API = 'https://graph.microsoft.com/v1.0'
     MICROSOFT_AUTH_URL = 'https://login.microsoftonline.com/common/oauth2/v2.0/authorize'
     
+    # JSON batching accepts at most 20 requests per call
+    GRAPH_BATCH_LIMIT = 20
+    GRAPH_LIFECYCLE_EVENTS = {'reauthorizationRequired', 'subscriptionRemoved', 'missed'}
+    
     @classmethod
     def get_oauth_url(cls, provider, state=None):
         """Generate Microsoft OAuth URL"""
@@ -442,8 +718,6 @@ class MicrosoftOAuthService(OAuthService):
     @classmethod
     def exchange_code_for_tokens(cls, code, provider):
         """Exchange authorization code for access and refresh tokens"""
-        import requests
-        
         client_id = settings.MICROSOFT_CLIENT_ID
         client_secret = settings.MICROSOFT_CLIENT_SECRET
         redirect_uri = f"{settings.FRONTEND_URL}/integrations/callback"
@@ -456,7 +730,7 @@ class MicrosoftOAuthService(OAuthService):
             'grant_type': 'authorization_code',
         }
         
-        response = requests.post(cls.MICROSOFT_TOKEN_URL, data=data)
+        response = tracked_request('POST', cls.MICROSOFT_TOKEN_URL, data=data)
         response.raise_for_status()
         
         token_data = response.json()
@@ -469,8 +743,6 @@ class MicrosoftOAuthService(OAuthService):
     
     def refresh_access_token(self):
         """Refresh Microsoft access token"""
-        import requests
-        
         if not self.integration.refresh_token:
             raise ValueError("No refresh token available")
         
@@ -485,7 +757,7 @@ class MicrosoftOAuthService(OAuthService):
             'grant_type': 'refresh_token',
         }
         
-        response = requests.post(self.MICROSOFT_TOKEN_URL, data=data)
+        response = tracked_request('POST', self.MICROSOFT_TOKEN_URL, phase_name='token_refresh', data=data)
         response.raise_for_status()
         
         token_data = response.json()
@@ -502,15 +774,13 @@ class MicrosoftOAuthService(OAuthService):
     
     def get_user_info(self):
         """Get user information from Microsoft Graph"""
-        import requests
-        
         access_token = self.integration.get_access_token()
         headers = {
             'Authorization': f'Bearer {access_token}',
             'Content-Type': 'application/json'
         }
         
-        response = requests.get(f'{self.MICROSOFT_GRAPH_API}/me', headers=headers)
+        response = tracked_request('GET', f'{self.MICROSOFT_GRAPH_API}/me', headers=headers)
         response.raise_for_status()
         
         user_data = response.json()
@@ -522,97 +792,336 @@ class MicrosoftOAuthService(OAuthService):
     
     def sync_calendar_events(self):
         """Sync Microsoft Calendar events"""
-        import requests
         from datetime import datetime, timedelta
         
-        access_token = self.integration.get_access_token()
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json'
-        }
-        
-        # Get events from the last 30 days and next 30 days
-        start_time = (datetime.now() - timedelta(days=30)).isoformat() + 'Z'
-        end_time = (datetime.now() + timedelta(days=30)).isoformat() + 'Z'
-        
-        params = {
-            '$filter': f"start/dateTime ge '{start_time}' and end/dateTime le '{end_time}'",
-            '$orderby': 'start/dateTime',
-            '$top': 100
-        }
-        
-        response = requests.get(
-            f'{self.MICROSOFT_GRAPH_API}/me/events',
-            headers=headers,
-            params=params
-        )
-        response.raise_for_status()
-        
-        events_data = response.json()
-        events = []
-        
-        for event in events_data.get('value', []):
-            events.append({
-                'id': event['id'],
-                'title': event.get('subject', 'No Title'),
-                'description': event.get('bodyPreview', ''),
-                'start_time': event['start']['dateTime'],
-                'end_time': event['end']['dateTime'],
-                'location': event.get('location', {}).get('displayName', ''),
-                'attendees': [attendee.get('emailAddress', {}).get('address') for attendee in event.get('attendees', [])],
-                'organizer': event.get('organizer', {}).get('emailAddress', {}).get('address'),
-                'created_at': event.get('createdDateTime'),
-                'updated_at': event.get('lastModifiedDateTime')
-            })
+        sync_log = self.start_sync_log('calendar')
         
-        # Update last sync time
-        self.integration.last_sync = timezone.now()
-        self.integration.save()
+        try:
+            access_token = self.integration.get_access_token()
+            headers = {
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json'
+            }
+            
+            # Get events from the last 30 days and next 30 days
+            start_time = (datetime.now() - timedelta(days=30)).isoformat() + 'Z'
+            end_time = (datetime.now() + timedelta(days=30)).isoformat() + 'Z'
+            
+            params = {
+                '$filter': f"start/dateTime ge '{start_time}' and end/dateTime le '{end_time}'",
+                '$orderby': 'start/dateTime',
+                '$top': 100
+            }
+            
+            events = []
+            created_count = 0
+            updated_count = 0
+            url = f'{self.MICROSOFT_GRAPH_API}/me/events'
+            while url:
+                response = tracked_request('GET', url, headers=headers, params=params)
+                response.raise_for_status()
+                
+                with phase('parse'):
+                    events_data = response.json()
+                    
+                    for event in events_data.get('value', []):
+                        events.append({
+                            'id': event['id'],
+                            'title': event.get('subject', 'No Title'),
+                            'description': event.get('bodyPreview', ''),
+                            'start_time': event['start']['dateTime'],
+                            'end_time': event['end']['dateTime'],
+                            'location': event.get('location', {}).get('displayName', ''),
+                            'attendees': [attendee.get('emailAddress', {}).get('address') for attendee in event.get('attendees', [])],
+                            'organizer': event.get('organizer', {}).get('emailAddress', {}).get('address'),
+                            'created_at': event.get('createdDateTime'),
+                            'updated_at': event.get('lastModifiedDateTime')
+                        })
+                
+                created, updated = self._store_calendar_events(events_data.get('value', []))
+                created_count += created
+                updated_count += updated
+                
+                # The next link already carries the query, including $skip
+                url = events_data.get('@odata.nextLink')
+                params = None
+            
+            self.mark_sync_completed(sync_log, len(events), created_count, updated_count)
+        except Exception as e:
+            self.mark_sync_failed(sync_log, e)
+            logger.error(f"Outlook calendar sync failed for {self.integration}: {e}")
+            raise
         
         return events
     
-    def sync_outlook_messages(self):
-        """Sync Outlook messages"""
-        import requests
+    @staticmethod
+    def _parse_graph_datetime(value, tz_name='UTC'):
+        """Parse a Graph timestamp, which may carry seven fractional digits and no offset"""
+        value = re.sub(r'(\.\d{6})\d+', r'\1', value).replace('Z', '+00:00')
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            try:
+                parsed = parsed.replace(tzinfo=ZoneInfo(tz_name or 'UTC'))
+            except (ZoneInfoNotFoundError, ValueError):
+                parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+    
+    def _parse_calendar_event(self, event_data):
+        """Build CalendarEvent field values from a Microsoft Graph event"""
+        start = event_data.get('start') or {}
+        end = event_data.get('end') or start
+        original_start = event_data.get('originalStart')
+        
+        attendees = []
+        for attendee in event_data.get('attendees', []):
+            attendees.append({
+                'email': attendee.get('emailAddress', {}).get('address'),
+                'displayName': attendee.get('emailAddress', {}).get('name'),
+                'responseStatus': attendee.get('status', {}).get('response')
+            })
         
-        access_token = self.integration.get_access_token()
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json'
+        return {
+            'title': event_data.get('subject') or 'No Title',
+            'description': event_data.get('bodyPreview', ''),
+            'location': (event_data.get('location') or {}).get('displayName', ''),
+            'start_time': self._parse_graph_datetime(start['dateTime'], start.get('timeZone')),
+            'end_time': self._parse_graph_datetime(end['dateTime'], end.get('timeZone')),
+            'is_all_day': event_data.get('isAllDay', False),
+            'timezone': start.get('timeZone', ''),
+            'attendees': attendees,
+            'created_by': (event_data.get('organizer') or {}).get('emailAddress', {}).get('address', ''),
+            'event_status': 'cancelled' if event_data.get('isCancelled') else 'confirmed',
+            'recurrence': graph_recurrence_to_rules(
+                event_data.get('recurrence'), event_data.get('isAllDay', False)
+            ),
+            'is_recurring': event_data.get('type') == 'seriesMaster',
+            'recurring_event_id': event_data.get('seriesMasterId'),
+            'original_start_time': self._parse_graph_datetime(original_start) if original_start else None,
+            'last_modified': self._parse_graph_datetime(
+                event_data.get('lastModifiedDateTime') or timezone.now().isoformat()
+            )
         }
+    
+    def _store_calendar_events(self, events):
+        """Upsert Graph events, skipping rows whose modification time has not changed"""
+        events = [event for event in events if event.get('id') and event.get('start')]
+        with phase('db_write'):
+            known = dict(
+                CalendarEvent.objects.filter(
+                    integration=self.integration,
+                    provider_event_id__in=[event['id'] for event in events]
+                ).values_list('provider_event_id', 'last_modified')
+            )
         
-        params = {
-            '$orderby': 'receivedDateTime desc',
-            '$top': 50,
-            '$select': 'id,subject,bodyPreview,from,toRecipients,receivedDateTime,isRead,importance'
-        }
+        created_count = 0
+        updated_count = 0
+        for event_data in events:
+            with phase('parse'):
+                defaults = self._parse_calendar_event(event_data)
+            if known.get(event_data['id']) == defaults['last_modified']:
+                continue
+            with phase('db_write'):
+                _, created = CalendarEvent.objects.update_or_create(
+                    integration=self.integration,
+                    provider_event_id=event_data['id'],
+                    defaults=defaults
+                )
+            if created:
+                created_count += 1
+            else:
+                updated_count += 1
+        return created_count, updated_count
+    
+    def _fetch_events(self, event_ids):
+        """Fetch events through JSON batching; returns (events, ids that no longer exist)"""
+        events = []
+        missing = []
+        for offset in range(0, len(event_ids), self.GRAPH_BATCH_LIMIT):
+            chunk = event_ids[offset:offset + self.GRAPH_BATCH_LIMIT]
+            response = self.make_authenticated_request(
+                f'{self.MICROSOFT_GRAPH_API}/$batch',
+                method='POST',
+                json={'requests': [
+                    {'id': str(index), 'method': 'GET', 'url': f'/me/events/{event_id}'}
+                    for index, event_id in enumerate(chunk)
+                ]}
+            )
+            if response.status_code != 200:
+                raise Exception(f"Graph batch request failed: {response.text}")
+            
+            with phase('parse'):
+                items = response.json().get('responses', [])
+            for item in items:
+                event_id = chunk[int(item['id'])]
+                if item.get('status') == 200:
+                    events.append(item.get('body') or {})
+                elif item.get('status') == 404:
+                    missing.append(event_id)
+                else:
+                    # Throttled or failing requests fail the batch so the inbox retries it
+                    raise Exception(f"Fetching event {event_id} failed with status {item.get('status')}")
+        return events, missing
+    
+    def _subscription_expiry(self):
+        return timezone.now() + timedelta(seconds=settings.MICROSOFT_SUBSCRIPTION_TTL)
+    
+    def create_webhook_subscription(self):
+        """Subscribe to change notifications for the user's Outlook calendar"""
+        notification_url = f"{settings.WEBHOOK_BASE_URL.rstrip('/')}{reverse('integrations:microsoft-graph-webhook')}"
+        secret = generate_channel_token()
+        response = self.make_authenticated_request(
+            f'{self.MICROSOFT_GRAPH_API}/subscriptions',
+            method='POST',
+            json={
+                'changeType': 'created,updated,deleted',
+                'notificationUrl': notification_url,
+                'lifecycleNotificationUrl': notification_url,
+                'resource': 'me/events',
+                'expirationDateTime': self._subscription_expiry().strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'clientState': secret,
+            }
+        )
+        if response.status_code != 201:
+            raise Exception(f"Graph subscription failed: {response.text}")
         
-        response = requests.get(
-            f'{self.MICROSOFT_GRAPH_API}/me/messages',
-            headers=headers,
-            params=params
+        data = response.json()
+        return WebhookSubscription.objects.create(
+            integration=self.integration,
+            subscription_id=data['id'],
+            resource=data.get('resource', 'me/events'),
+            secret=secret,
+            expires_at=self._parse_graph_datetime(data['expirationDateTime'])
         )
-        response.raise_for_status()
+    
+    def renew_webhook_subscription(self, subscription):
+        """Extend a subscription, recreating it if Graph has already dropped it"""
+        response = self.make_authenticated_request(
+            f'{self.MICROSOFT_GRAPH_API}/subscriptions/{subscription.subscription_id}',
+            method='PATCH',
+            json={'expirationDateTime': self._subscription_expiry().strftime('%Y-%m-%dT%H:%M:%SZ')}
+        )
+        if response.status_code == 404:
+            subscription.delete()
+            return self.create_webhook_subscription()
+        if response.status_code != 200:
+            raise Exception(f"Graph subscription renewal failed: {response.text}")
+        
+        subscription.expires_at = self._parse_graph_datetime(response.json()['expirationDateTime'])
+        subscription.save(update_fields=['expires_at'])
+        return subscription
+    
+    def delete_webhook_subscription(self, subscription):
+        """Delete a subscription upstream and forget it"""
+        response = self.make_authenticated_request(
+            f'{self.MICROSOFT_GRAPH_API}/subscriptions/{subscription.subscription_id}',
+            method='DELETE'
+        )
+        if response.status_code not in (204, 404):
+            logger.warning(f"Deleting Graph subscription {subscription.subscription_id} failed: {response.text}")
+        subscription.delete()
+    
+    def _handle_lifecycle_event(self, delivery):
+        """React to a Graph lifecycle notification; returns whether a full sync is needed"""
+        subscription = self.integration.webhook_subscriptions.filter(
+            subscription_id=delivery.payload.get('subscriptionId')
+        ).first()
+        if delivery.event_type == 'reauthorizationRequired' and subscription:
+            self.renew_webhook_subscription(subscription)
+            return False
+        if delivery.event_type == 'subscriptionRemoved':
+            if subscription:
+                subscription.delete()
+            self.create_webhook_subscription()
+        # 'missed' and removed subscriptions may have lost changes
+        return True
+    
+    def apply_webhook_deliveries(self, deliveries):
+        """Apply a batch of Graph change notifications, fetching each changed event once"""
+        sync_log = self.start_sync_log('calendar')
         
-        messages_data = response.json()
-        messages = []
+        try:
+            # Only the latest change of each event matters
+            changes = {}
+            needs_full_sync = False
+            for delivery in deliveries:
+                if delivery.event_type in self.GRAPH_LIFECYCLE_EVENTS:
+                    needs_full_sync |= self._handle_lifecycle_event(delivery)
+                    continue
+                event_id = (delivery.payload.get('resourceData') or {}).get('id')
+                if event_id:
+                    changes.pop(event_id, None)
+                    changes[event_id] = delivery.event_type
+            
+            deleted_ids = [event_id for event_id, change in changes.items() if change == 'deleted']
+            events, missing = self._fetch_events(
+                [event_id for event_id, change in changes.items() if change != 'deleted']
+            )
+            deleted_ids += missing
+            
+            deleted_count = 0
+            if deleted_ids:
+                with phase('db_write'):
+                    deleted_count, _ = CalendarEvent.objects.filter(
+                        Q(provider_event_id__in=deleted_ids) | Q(recurring_event_id__in=deleted_ids),
+                        integration=self.integration
+                    ).delete()
+            created_count, updated_count = self._store_calendar_events(events)
+            
+            self.mark_sync_completed(sync_log, len(deliveries), created_count, updated_count, deleted_count)
+        except Exception as e:
+            self.mark_sync_failed(sync_log, e)
+            raise
         
-        for message in messages_data.get('value', []):
-            messages.append({
-                'id': message['id'],
-                'subject': message.get('subject', 'No Subject'),
-                'body_preview': message.get('bodyPreview', ''),
-                'from_email': message.get('from', {}).get('emailAddress', {}).get('address'),
-                'from_name': message.get('from', {}).get('emailAddress', {}).get('name'),
-                'to_recipients': [recipient.get('emailAddress', {}).get('address') for recipient in message.get('toRecipients', [])],
-                'received_at': message.get('receivedDateTime'),
-                'is_read': message.get('isRead', False),
-                'importance': message.get('importance', 'normal')
-            })
+        if needs_full_sync:
+            self.sync_calendar_events()
+    
+    def sync_outlook_messages(self):
+        """Sync Outlook messages"""
+        sync_log = self.start_sync_log('email')
         
-        # Update last sync time
-        self.integration.last_sync = timezone.now()
-        self.integration.save()
+        try:
+            access_token = self.integration.get_access_token()
+            headers = {
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json'
+            }
+            
+            params = {
+                '$orderby': 'receivedDateTime desc',
+                '$top': 50,
+                '$select': 'id,subject,bodyPreview,from,toRecipients,receivedDateTime,isRead,importance'
+            }
+            
+            response = tracked_request(
+                'GET',
+                f'{self.MICROSOFT_GRAPH_API}/me/messages',
+                headers=headers,
+                params=params
+            )
+            response.raise_for_status()
+            
+            with phase('parse'):
+                messages_data = response.json()
+                messages = []
+                
+                for message in messages_data.get('value', []):
+                    messages.append({
+                        'id': message['id'],
+                        'subject': message.get('subject', 'No Subject'),
+                        'body_preview': message.get('bodyPreview', ''),
+                        'from_email': message.get('from', {}).get('emailAddress', {}).get('address'),
+                        'from_name': message.get('from', {}).get('emailAddress', {}).get('name'),
+                        'to_recipients': [recipient.get('emailAddress', {}).get('address') for recipient in message.get('toRecipients', [])],
+                        'received_at': message.get('receivedDateTime'),
+                        'is_read': message.get('isRead', False),
+                        'importance': message.get('importance', 'normal')
+                    })
+            
+            self.mark_sync_completed(sync_log, len(messages))
+        except Exception as e:
+            self.mark_sync_failed(sync_log, e)
+            logger.error(f"Outlook mail sync failed for {self.integration}: {e}")
+            raise
         
         return messages
 
@@ -661,7 +1170,7 @@ class GitHubOAuthService(OAuthService):
             'Content-Type': 'application/x-www-form-urlencoded',
         }
         
-        response = requests.post(self.GITHUB_TOKEN_URL, data=data, headers=headers)
+        response = tracked_request('POST', self.GITHUB_TOKEN_URL, data=data, headers=headers)
         response.raise_for_status()
         
         token_data = response.json()
@@ -682,7 +1191,7 @@ class GitHubOAuthService(OAuthService):
             'Accept': 'application/vnd.github.v3+json',
         }
         
-        response = requests.get(f'{self.GITHUB_API_URL}/user', headers=headers)
+        response = tracked_request('GET', f'{self.GITHUB_API_URL}/user', headers=headers)
         response.raise_for_status()
         
         return response.json()
@@ -698,13 +1207,13 @@ class GitHubOAuthService(OAuthService):
         url = f'{self.GITHUB_API_URL}{endpoint}'
         
         if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, params=params)
+            response = tracked_request('GET', url, headers=headers, params=params)
         elif method.upper() == 'POST':
-            response = requests.post(url, headers=headers, json=data)
+            response = tracked_request('POST', url, headers=headers, json=data)
         elif method.upper() == 'PATCH':
-            response = requests.patch(url, headers=headers, json=data)
+            response = tracked_request('PATCH', url, headers=headers, json=data)
         elif method.upper() == 'DELETE':
-            response = requests.delete(url, headers=headers)
+            response = tracked_request('DELETE', url, headers=headers)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
         
@@ -892,6 +1401,9 @@ class SlackOAuthService(OAuthService):
         
         scopes = [
             'channels:read',
+            'channels:history',
+            'groups:read',
+            'groups:history',
             'channels:write',
             'chat:write',
             'users:read',
@@ -912,16 +1424,17 @@ class SlackOAuthService(OAuthService):
         
         return f"{cls.SLACK_AUTH_URL}?{urlencode(params)}"
     
-    def exchange_code_for_tokens(self, code, redirect_uri):
+    @classmethod
+    def exchange_code_for_tokens(cls, code, provider):
         """Exchange authorization code for access token"""
         data = {
             'client_id': getattr(settings, 'SLACK_CLIENT_ID', ''),
             'client_secret': getattr(settings, 'SLACK_CLIENT_SECRET', ''),
             'code': code,
-            'redirect_uri': redirect_uri,
+            'redirect_uri': f"{settings.FRONTEND_URL}/integrations/callback",
         }
         
-        response = requests.post(self.SLACK_TOKEN_URL, data=data)
+        response = tracked_request('POST', cls.SLACK_TOKEN_URL, data=data)
         response.raise_for_status()
         
         token_data = response.json()
@@ -935,6 +1448,7 @@ class SlackOAuthService(OAuthService):
             'scope': token_data.get('scope', ''),
             'team_id': token_data.get('team', {}).get('id'),
             'team_name': token_data.get('team', {}).get('name'),
+            'authed_user_id': token_data.get('authed_user', {}).get('id'),
         }
     
     def get_user_info(self):
@@ -944,10 +1458,160 @@ class SlackOAuthService(OAuthService):
             'Content-Type': 'application/json',
         }
         
-        response = requests.get(f'{self.SLACK_API_URL}/auth.test', headers=headers)
+        response = tracked_request('GET', f'{self.SLACK_API_URL}/auth.test', headers=headers)
         response.raise_for_status()
         
         return response.json()
+    
+    def _rate_limit_scope(self):
+        # Slack limits apply per workspace, whichever user connected it
+        return f"slack:{self.integration.sync_state.get('slack_team_id') or self.integration.id}"
+    
+    def api_call(self, method, http_method='GET', **params):
+        """
+        Call a Slack Web API method within its rate limit tier.
+        
+        A 429 makes every caller for this workspace and method wait for
+        Retry-After before the request is tried again.
+        """
+        scope = self._rate_limit_scope()
+        if method in SLACK_PER_CHANNEL_METHODS:
+            scope = f"{scope}:{params.get('channel')}"
+        headers = {'Authorization': f'Bearer {self.get_valid_token()}'}
+        request_kwargs = {'params': params} if http_method == 'GET' else {'data': params}
+        
+        for attempt in range(settings.SLACK_MAX_RETRIES):
+            slack_rate_limiter.acquire(scope, method)
+            response = tracked_request(
+                http_method, f'{self.SLACK_API_URL}/{method}', headers=headers, timeout=30, **request_kwargs
+            )
+            if response.status_code == 429:
+                record_retry()
+                slack_rate_limiter.backoff(scope, method, int(response.headers.get('Retry-After') or 1))
+                continue
+            response.raise_for_status()
+            
+            with phase('parse'):
+                data = response.json()
+            if not data.get('ok'):
+                raise ValidationError(f"Slack API error in {method}: {data.get('error', 'Unknown error')}")
+            return data
+        
+        raise Exception(f"Slack API {method} is still rate limited after {settings.SLACK_MAX_RETRIES} attempts")
+    
+    def _iter_pages(self, method, key, **params):
+        """Yield the items of every page of a cursor-paginated method"""
+        while True:
+            data = self.api_call(method, **params)
+            yield from data.get(key, [])
+            params['cursor'] = (data.get('response_metadata') or {}).get('next_cursor', '')
+            if not params['cursor']:
+                break
+    
+    @staticmethod
+    def _ts_to_datetime(ts):
+        return datetime.fromtimestamp(float(ts), tz=timezone.utc)
+    
+    def sync_channels(self):
+        """Upsert every public and private channel visible to the workspace token"""
+        channels = []
+        for channel in self._iter_pages(
+            'conversations.list', 'channels',
+            types='public_channel,private_channel', exclude_archived='false', limit=200
+        ):
+            with phase('parse'):
+                channels.append(SlackChannel(
+                    integration=self.integration,
+                    channel_id=channel['id'],
+                    name=channel.get('name', ''),
+                    is_private=channel.get('is_private', False),
+                    is_archived=channel.get('is_archived', False),
+                    is_member=channel.get('is_member', False),
+                    topic=(channel.get('topic') or {}).get('value', ''),
+                    purpose=(channel.get('purpose') or {}).get('value', ''),
+                    num_members=channel.get('num_members', 0)
+                ))
+        with phase('db_write'):
+            SlackChannel.objects.bulk_create(
+                channels,
+                update_conflicts=True,
+                unique_fields=['integration', 'channel_id'],
+                update_fields=['name', 'is_private', 'is_archived', 'is_member', 'topic', 'purpose', 'num_members', 'synced_at']
+            )
+        return len(channels)
+    
+    def sync_channel_messages(self, channel):
+        """Fetch messages newer than the channel watermark; returns (processed, created)"""
+        oldest = channel.last_message_ts or f'{(timezone.now() - timedelta(days=settings.SLACK_HISTORY_DAYS)).timestamp():.6f}'
+        
+        messages = []
+        newest_ts = channel.last_message_ts
+        for message in self._iter_pages(
+            'conversations.history', 'messages', channel=channel.channel_id, oldest=oldest, limit=200
+        ):
+            if not message.get('ts'):
+                continue
+            with phase('parse'):
+                edited = message.get('edited') or {}
+                messages.append(SlackMessage(
+                    channel=channel,
+                    ts=message['ts'],
+                    thread_ts=message.get('thread_ts', ''),
+                    slack_user_id=message.get('user') or message.get('bot_id') or '',
+                    text=message.get('text', ''),
+                    subtype=message.get('subtype', ''),
+                    reply_count=message.get('reply_count', 0),
+                    sent_at=self._ts_to_datetime(message['ts']),
+                    edited_at=self._ts_to_datetime(edited['ts']) if edited.get('ts') else None
+                ))
+            if not newest_ts or float(message['ts']) > float(newest_ts):
+                newest_ts = message['ts']
+        
+        if not messages:
+            return 0, 0
+        
+        with phase('db_write'):
+            known = set(
+                SlackMessage.objects.filter(channel=channel, ts__in=[message.ts for message in messages])
+                .values_list('ts', flat=True)
+            )
+            SlackMessage.objects.bulk_create(
+                messages,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['channel', 'ts'],
+                update_fields=['thread_ts', 'slack_user_id', 'text', 'subtype', 'reply_count', 'edited_at', 'updated_at']
+            )
+            
+            # Advance the watermark only once every page is stored
+            channel.last_message_ts = newest_ts
+            channel.save(update_fields=['last_message_ts', 'synced_at'])
+        return len(messages), len({message.ts for message in messages} - known)
+    
+    def sync_messages(self):
+        """Sync channels, then new messages of every channel the app is a member of"""
+        sync_log = self.start_sync_log('messages')
+        
+        try:
+            if not self.integration.sync_state.get('slack_team_id'):
+                self.integration.sync_state['slack_team_id'] = self.api_call('auth.test').get('team_id')
+            
+            self.sync_channels()
+            processed_count = 0
+            created_count = 0
+            channels = self.integration.slack_channels.filter(is_member=True, is_archived=False)
+            for channel in channels:
+                processed, created = self.sync_channel_messages(channel)
+                processed_count += processed
+                created_count += created
+            
+            self.mark_sync_completed(sync_log, processed_count, created_count, processed_count - created_count)
+            
+            logger.info(f"Synced {processed_count} Slack messages for {self.integration}")
+        except Exception as e:
+            self.mark_sync_failed(sync_log, e)
+            logger.error(f"Slack sync failed for {self.integration}: {e}")
+            raise
 
 
 class CalendlyOAuthService(OAuthService):
@@ -956,6 +1620,7 @@ class CalendlyOAuthService(OAuthService):
     CALENDLY_TOKEN_URL = 'https://auth.calendly.com/oauth/token'
     CALENDLY_API_URL = 'https://api.calendly.com'
     CALENDLY_AUTH_URL = 'https://auth.calendly.com/oauth/authorize'
+    WEBHOOK_EVENTS = ['invitee.created', 'invitee.canceled']
     
     @classmethod
     def get_oauth_url(cls, provider, state=None):
@@ -1000,7 +1665,7 @@ class CalendlyOAuthService(OAuthService):
             'redirect_uri': redirect_uri,
         }
         
-        response = requests.post(cls.CALENDLY_TOKEN_URL, data=data, headers=headers)
+        response = tracked_request('POST', cls.CALENDLY_TOKEN_URL, data=data, headers=headers)
         response.raise_for_status()
         
         token_data = response.json()
@@ -1018,7 +1683,7 @@ class CalendlyOAuthService(OAuthService):
             'Content-Type': 'application/json'
         }
         
-        response = requests.get(f'{self.CALENDLY_API_URL}/users/me', headers=headers)
+        response = tracked_request('GET', f'{self.CALENDLY_API_URL}/users/me', headers=headers)
         response.raise_for_status()
         
         user_data = response.json()
@@ -1037,14 +1702,15 @@ class CalendlyOAuthService(OAuthService):
         }
         
         # Get user URI first
-        user_response = requests.get(f'{self.CALENDLY_API_URL}/users/me', headers=headers)
+        user_response = tracked_request('GET', f'{self.CALENDLY_API_URL}/users/me', headers=headers)
         user_response.raise_for_status()
         user_uri = user_response.json()['resource']['uri']
         
         # Get scheduled events
         params = {
             'user': user_uri,
-            'status': 'active'
+            'status': 'active',
+            'count': 100
         }
         
         if start_time:
@@ -1052,20 +1718,26 @@ class CalendlyOAuthService(OAuthService):
         if end_time:
             params['max_start_time'] = end_time.isoformat()
         
-        response = requests.get(f'{self.CALENDLY_API_URL}/scheduled_events', headers=headers, params=params)
-        response.raise_for_status()
+        # Follow next_page until the last page, which already carries the query
+        collection = []
+        url = f'{self.CALENDLY_API_URL}/scheduled_events'
+        while url:
+            response = tracked_request('GET', url, headers=headers, params=params)
+            response.raise_for_status()
+            
+            with phase('parse'):
+                data = response.json()
+            collection.extend(data.get('collection', []))
+            url = (data.get('pagination') or {}).get('next_page')
+            params = None
         
-        return response.json()
+        return {'collection': collection}
     
     def sync_scheduled_events(self):
         """Sync Calendly scheduled events"""
         from datetime import datetime, timedelta
         
-        sync_log = SyncLog.objects.create(
-            integration=self.integration,
-            sync_type='calendar',
-            status='started'
-        )
+        sync_log = self.start_sync_log('calendar')
         
         try:
             # Get events from the last 30 days and next 90 days
@@ -1075,51 +1747,166 @@ class CalendlyOAuthService(OAuthService):
             events_data = self.get_scheduled_events(start_time, end_time)
             
             synced_count = 0
+            created_count = 0
             for event_data in events_data.get('collection', []):
-                event_uri = event_data['uri']
-                event_id = event_uri.split('/')[-1]
-                
-                # Parse event details
-                start_datetime = datetime.fromisoformat(event_data['start_time'].replace('Z', '+00:00'))
-                end_datetime = datetime.fromisoformat(event_data['end_time'].replace('Z', '+00:00'))
+                with phase('parse'):
+                    event_uri = event_data['uri']
+                    event_id = event_uri.split('/')[-1]
+                    
+                    # Parse event details
+                    start_datetime = self._parse_timestamp(event_data['start_time'])
+                    end_datetime = self._parse_timestamp(event_data['end_time'])
+                    last_modified = self._parse_timestamp(event_data.get('updated_at') or timezone.now().isoformat())
                 
                 # Create or update calendar event
-                calendar_event, created = CalendarEvent.objects.update_or_create(
-                    integration=self.integration,
-                    provider_event_id=event_id,
-                    defaults={
-                        'title': event_data.get('name', 'Calendly Event'),
-                        'description': f"Calendly meeting: {event_data.get('name', '')}",
-                        'start_time': start_datetime,
-                        'end_time': end_datetime,
-                        'event_status': 'confirmed' if event_data['status'] == 'active' else 'cancelled',
-                        'synced_at': timezone.now(),
-                        'provider_data': event_data
-                    }
-                )
+                with phase('db_write'):
+                    calendar_event, created = CalendarEvent.objects.update_or_create(
+                        integration=self.integration,
+                        provider_event_id=event_id,
+                        defaults={
+                            'title': event_data.get('name', 'Calendly Event'),
+                            'description': f"Calendly meeting: {event_data.get('name', '')}",
+                            'start_time': start_datetime,
+                            'end_time': end_datetime,
+                            'event_status': 'confirmed' if event_data['status'] == 'active' else 'cancelled',
+                            'last_modified': last_modified
+                        }
+                    )
                 
                 synced_count += 1
+                created_count += created
             
-            sync_log.status = 'completed'
-            sync_log.items_synced = synced_count
-            sync_log.completed_at = timezone.now()
-            sync_log.save()
-            
-            # Update integration last sync time
-            self.integration.last_sync = timezone.now()
-            self.integration.save()
+            self.mark_sync_completed(sync_log, synced_count, created_count, synced_count - created_count)
             
             logger.info(f"Calendly sync completed: {synced_count} events synced")
             
         except Exception as e:
-            sync_log.status = 'failed'
-            sync_log.error_message = str(e)
-            sync_log.completed_at = timezone.now()
-            sync_log.save()
+            self.mark_sync_failed(sync_log, e)
             
             logger.error(f"Calendly sync failed: {str(e)}")
             raise
 
+    
+    def create_webhook_subscription(self):
+        """Subscribe to invitee.created and invitee.canceled for the connected user"""
+        access_token = self.integration.get_access_token()
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json'
+        }
+        
+        user_response = tracked_request('GET', f'{self.CALENDLY_API_URL}/users/me', headers=headers)
+        user_response.raise_for_status()
+        user = user_response.json()['resource']
+        
+        secret = generate_channel_token()
+        response = tracked_request('POST', f'{self.CALENDLY_API_URL}/webhook_subscriptions', headers=headers, json={
+            'url': f"{settings.WEBHOOK_BASE_URL.rstrip('/')}{reverse('integrations:calendly-webhook')}",
+            'events': self.WEBHOOK_EVENTS,
+            'organization': user['current_organization'],
+            'user': user['uri'],
+            'scope': 'user',
+            'signing_key': secret,
+        })
+        if response.status_code != 201:
+            raise Exception(f"Calendly webhook subscription failed: {response.text}")
+        
+        return WebhookSubscription.objects.create(
+            integration=self.integration,
+            subscription_id=response.json()['resource']['uri'],
+            resource='invitee',
+            secret=secret
+        )
+    
+    def renew_webhook_subscription(self, subscription):
+        """Calendly webhook subscriptions do not expire"""
+        return subscription
+    
+    def delete_webhook_subscription(self, subscription):
+        """Delete a webhook subscription upstream and forget it"""
+        access_token = self.integration.get_access_token()
+        response = tracked_request('DELETE', subscription.subscription_id, headers={'Authorization': f'Bearer {access_token}'})
+        if response.status_code not in (204, 404):
+            logger.warning(f"Deleting Calendly webhook {subscription.subscription_id} failed: {response.text}")
+        subscription.delete()
+    
+    @staticmethod
+    def _parse_timestamp(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    
+    def apply_webhook_deliveries(self, deliveries):
+        """
+        Apply a batch of invitee webhooks.
+        
+        Webhooks carry the full scheduled event, so nothing is fetched. Changes
+        are grouped per scheduled event and each event row is written once,
+        with every invitee change of the batch folded into its attendees.
+        """
+        sync_log = self.start_sync_log('calendar')
+        
+        try:
+            changes = {}
+            for delivery in deliveries:
+                payload = delivery.payload.get('payload') or {}
+                scheduled_event = payload.get('scheduled_event') or {}
+                if scheduled_event.get('uri') and scheduled_event.get('start_time'):
+                    event_id = scheduled_event['uri'].split('/')[-1]
+                    changes.setdefault(event_id, []).append((delivery.event_type, payload))
+            
+            known = {
+                event.provider_event_id: event.attendees
+                for event in CalendarEvent.objects.filter(
+                    integration=self.integration, provider_event_id__in=list(changes)
+                ).only('provider_event_id', 'attendees')
+            }
+            
+            created_count = 0
+            updated_count = 0
+            for event_id, invitee_changes in changes.items():
+                attendees = {
+                    attendee.get('email'): attendee for attendee in known.get(event_id) or []
+                }
+                for event_type, payload in invitee_changes:
+                    attendees[payload.get('email')] = {
+                        'email': payload.get('email'),
+                        'displayName': payload.get('name'),
+                        'responseStatus': 'declined' if event_type == 'invitee.canceled' else 'accepted'
+                    }
+                
+                # The most recent payload has the current state of the event
+                scheduled_event = invitee_changes[-1][1]['scheduled_event']
+                memberships = scheduled_event.get('event_memberships') or [{}]
+                location = scheduled_event.get('location') or {}
+                with phase('parse'):
+                    defaults = {
+                        'title': scheduled_event.get('name') or 'Calendly Event',
+                        'description': f"Calendly meeting: {scheduled_event.get('name', '')}",
+                        'location': location.get('location') or location.get('join_url') or '',
+                        'start_time': self._parse_timestamp(scheduled_event['start_time']),
+                        'end_time': self._parse_timestamp(scheduled_event['end_time']),
+                        'attendees': list(attendees.values()),
+                        'created_by': memberships[0].get('user_email', ''),
+                        'event_status': 'confirmed' if scheduled_event.get('status') == 'active' else 'cancelled',
+                        'last_modified': self._parse_timestamp(
+                            scheduled_event.get('updated_at') or timezone.now().isoformat()
+                        )
+                    }
+                with phase('db_write'):
+                    _, created = CalendarEvent.objects.update_or_create(
+                        integration=self.integration,
+                        provider_event_id=event_id,
+                        defaults=defaults
+                    )
+                if created:
+                    created_count += 1
+                else:
+                    updated_count += 1
+            
+            self.mark_sync_completed(sync_log, len(deliveries), created_count, updated_count)
+        except Exception as e:
+            self.mark_sync_failed(sync_log, e)
+            raise
+
 
 def get_oauth_service(integration):
     """Factory function to get the appropriate OAuth service"""
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent after a sync has written its results for an integration.
+# Arguments: integration
+sync_completed = Signal()
+
+# Sent after a sync of an integration has failed and its log was saved.
+# Arguments: integration, sync_log
+sync_failed = Signal()
+
+# Sent after every outbound provider API call, whether it succeeded or not.
+# Arguments: method, url, status_code (None if no response), duration, phase, error
+provider_request_finished = Signal()
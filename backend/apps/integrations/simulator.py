@@ -0,0 +1,509 @@
+import base64
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Provider APIs answered by the simulator; requests to other hosts get a 404
+GOOGLE_HOSTS = {'oauth2.googleapis.com', 'www.googleapis.com', 'gmail.googleapis.com'}
+MICROSOFT_HOSTS = {'login.microsoftonline.com', 'graph.microsoft.com'}
+GITHUB_HOSTS = {'github.com', 'api.github.com'}
+SLACK_HOST = 'slack.com'
+CALENDLY_HOSTS = {'auth.calendly.com', 'api.calendly.com'}
+PROVIDER_HOSTS = GOOGLE_HOSTS | MICROSOFT_HOSTS | GITHUB_HOSTS | CALENDLY_HOSTS | {SLACK_HOST}
+
+# Page size caps of the real APIs
+GOOGLE_CALENDAR_PAGE_LIMIT = 2500
+GMAIL_LIST_PAGE_LIMIT = 500
+GRAPH_PAGE_LIMIT = 1000
+CALENDLY_PAGE_LIMIT = 100
+GITHUB_PAGE_LIMIT = 100
+SLACK_PAGE_LIMIT = 1000
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_latency(spec):
+    """
+    Turn a latency spec into a function returning seconds to wait.
+
+    Specs are in milliseconds: ``none``, ``fixed:50``, ``uniform:10,200``,
+    ``normal:100,30`` (mean, stddev) or ``lognormal:80,0.5`` (median, sigma).
+    """
+    name, _, args = (spec or 'none').partition(':')
+    try:
+        values = [float(value) for value in args.split(',') if value.strip()]
+    except ValueError:
+        raise ValueError(f'Invalid latency spec {spec!r}')
+    distributions = {
+        'none': (0, lambda rng: 0.0),
+        'fixed': (1, lambda rng: values[0]),
+        'uniform': (2, lambda rng: rng.uniform(values[0], values[1])),
+        'normal': (2, lambda rng: rng.gauss(values[0], values[1])),
+        'lognormal': (2, lambda rng: values[0] * rng.lognormvariate(0, values[1])),
+    }
+    if name not in distributions or len(values) != distributions[name][0]:
+        raise ValueError(f'Invalid latency spec {spec!r}')
+    sample = distributions[name][1]
+    return lambda rng: max(sample(rng), 0.0) / 1000
+
+
+def simulator_url(url, base_url):
+    """Rewrite a provider URL to the simulator at ``base_url``, keeping the host in the path"""
+    parts = urlsplit(url)
+    target = f"{base_url.rstrip('/')}/{parts.netloc}{parts.path}"
+    return f'{target}?{parts.query}' if parts.query else target
+
+
+class SimulatorResponse:
+    """Status code, headers and JSON payload of one simulated API call"""
+
+    def __init__(self, status_code, payload, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+
+    @property
+    def content(self):
+        return json.dumps(self.payload).encode('utf-8')
+
+
+class ProviderSimulator:
+    """
+    Deterministic fake of the Google, Microsoft Graph, GitHub, Slack and Calendly APIs.
+
+    Every collection holds ``items`` generated entries, paginated the way
+    the real API does it, so a sync makes the same sequence of calls it
+    would make upstream. Entries are built per page and never stored, so
+    large collections cost no memory in the simulator itself.
+
+    Degradation is opt-in: ``latency`` delays every call (see
+    parse_latency), ``throttle_rate`` and ``error_rate`` are the shares of
+    calls answered with 429 or a 5xx, and tokens expire ``token_ttl``
+    seconds after they were issued. Incremental syncs see
+    ``changes_per_sync`` modified entries each time.
+    """
+
+    def __init__(self, items=1000, latency='none', throttle_rate=0.0, error_rate=0.0, retry_after=1,
+                 token_ttl=0, changes_per_sync=0, slack_channels=5, seed=None):
+        self.items = items
+        self.latency = parse_latency(latency)
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.changes_per_sync = changes_per_sync
+        self.slack_channels = slack_channels
+        self.rng = random.Random(seed)
+        self.started = time.time()
+        self.calls = 0
+        self.issued_tokens = {}
+        self._lock = threading.Lock()
+        routes = [
+            ('POST', r'https://oauth2\.googleapis\.com/token', self.token),
+            ('POST', r'https://login\.microsoftonline\.com/[^/]+/oauth2/v2\.0/token', self.token),
+            ('POST', r'https://github\.com/login/oauth/access_token', self.token),
+            ('POST', r'https://slack\.com/api/oauth\.v2\.access', self.slack_token),
+            ('POST', r'https://auth\.calendly\.com/oauth/token', self.token),
+            ('GET', r'https://www\.googleapis\.com/oauth2/v2/userinfo', self.google_user),
+            ('GET', r'https://www\.googleapis\.com/calendar/v3/calendars/[^/]+/events', self.google_events),
+            ('GET', r'https://gmail\.googleapis\.com/gmail/v1/users/me/profile', self.gmail_profile),
+            ('GET', r'https://gmail\.googleapis\.com/gmail/v1/users/me/history', self.gmail_history),
+            ('GET', r'https://gmail\.googleapis\.com/gmail/v1/users/me/messages', self.gmail_messages),
+            ('GET', r'https://gmail\.googleapis\.com/gmail/v1/users/me/messages/(?P<id>[^/]+)', self.gmail_message),
+            ('GET', r'https://graph\.microsoft\.com/v1\.0/me', self.graph_user),
+            ('GET', r'https://graph\.microsoft\.com/v1\.0/me/events', self.graph_events),
+            ('GET', r'https://api\.github\.com/user', self.github_user),
+            ('GET', r'https://api\.github\.com/user/repos', self.github_repos),
+            ('GET', r'https://slack\.com/api/auth\.test', self.slack_auth_test),
+            ('GET', r'https://slack\.com/api/conversations\.list', self.slack_channels_list),
+            ('GET', r'https://slack\.com/api/conversations\.history', self.slack_history),
+            ('POST', r'https://slack\.com/api/chat\.postMessage', self.slack_post_message),
+            ('GET', r'https://api\.calendly\.com/users/me', self.calendly_user),
+            ('GET', r'https://api\.calendly\.com/scheduled_events', self.calendly_events),
+        ]
+        self.routes = [(method, re.compile(pattern + '$'), handler) for method, pattern, handler in routes]
+
+    def handle(self, method, url, headers=None, body=b''):
+        """Answer one request; ``url`` carries the query string and ``body`` any form data"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency(self.rng)
+            fault = self.rng.random()
+        if delay:
+            time.sleep(delay)
+
+        parts = urlsplit(url)
+        path_url = f'{parts.scheme}://{parts.netloc}{parts.path}'
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if body and isinstance(body, (bytes, str)):
+            body = body.decode('utf-8', errors='replace') if isinstance(body, bytes) else body
+            query.update({key: values[-1] for key, values in parse_qs(body).items()})
+        slack = parts.netloc == SLACK_HOST
+
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path_url)
+            if not match or route_method != method.upper():
+                continue
+            if fault < self.throttle_rate:
+                return self._throttled(slack)
+            if fault < self.throttle_rate + self.error_rate:
+                return self._server_error()
+            if handler.__name__ not in ('token', 'slack_token'):
+                auth_error = self._check_token(headers or {}, slack)
+                if auth_error:
+                    return auth_error
+            return handler(query, **match.groupdict())
+        return SimulatorResponse(404, {'error': f'no simulated route for {method} {parts.path}'})
+
+    def _throttled(self, slack):
+        payload = {'ok': False, 'error': 'ratelimited'} if slack else {'error': 'rate limit exceeded'}
+        return SimulatorResponse(429, payload, {'Retry-After': str(self.retry_after)})
+
+    def _server_error(self):
+        status = self.rng.choice([500, 502, 503])
+        headers = {'Retry-After': str(self.retry_after)} if status == 503 else None
+        return SimulatorResponse(status, {'error': 'simulated upstream failure'}, headers)
+
+    def _check_token(self, headers, slack):
+        """Reject calls without a token, or with one older than token_ttl"""
+        authorization = next((value for key, value in headers.items() if key.lower() == 'authorization'), '')
+        token = authorization.partition(' ')[2]
+        if token and self.token_ttl:
+            # Tokens the simulator did not issue count from its start
+            issued_at = self.issued_tokens.get(token, self.started)
+            if time.time() - issued_at > self.token_ttl:
+                token = None
+        if token:
+            return None
+        if slack:
+            return SimulatorResponse(200, {'ok': False, 'error': 'token_expired'})
+        return SimulatorResponse(401, {'error': 'invalid_token'})
+
+    def _issue_token(self):
+        token = f'simulated-{self.rng.getrandbits(64):016x}'
+        self.issued_tokens[token] = time.time()
+        return token
+
+    @staticmethod
+    def _page(query, size_key, offset_key, default_size, limit):
+        size = min(int(query.get(size_key) or default_size), limit)
+        offset = int(query.get(offset_key) or 0)
+        return offset, size
+
+    @staticmethod
+    def _timestamp(index, fmt='%Y-%m-%dT%H:%M:%SZ'):
+        return (EPOCH + timedelta(minutes=30 * index)).strftime(fmt)
+
+    def _changed_indexes(self, version):
+        """Entries modified between incremental sync ``version`` and the next one"""
+        start = version * self.changes_per_sync
+        return [(start + offset) % self.items for offset in range(self.changes_per_sync)] if self.items else []
+
+    def token(self, query):
+        return SimulatorResponse(200, {
+            'access_token': self._issue_token(),
+            'refresh_token': query.get('refresh_token') or 'simulated-refresh-token',
+            'expires_in': self.token_ttl or 3600,
+            'token_type': 'Bearer',
+        })
+
+    def slack_token(self, query):
+        return SimulatorResponse(200, {
+            'ok': True, 'access_token': self._issue_token(), 'scope': 'channels:read,channels:history',
+            'team': {'id': 'TSIMULATED', 'name': 'Simulated'}, 'authed_user': {'id': 'USIMULATED'},
+        })
+
+    def google_user(self, query):
+        return SimulatorResponse(200, {'id': 'simulated', 'email': 'owner@example.com', 'name': 'Simulated Owner'})
+
+    def _google_event(self, index, updated=None):
+        return {
+            'id': f'event{index:07d}',
+            'summary': f'Simulated event {index}',
+            'description': 'Generated by the provider simulator',
+            'location': 'Room 1',
+            'start': {'dateTime': self._timestamp(index), 'timeZone': 'UTC'},
+            'end': {'dateTime': self._timestamp(index + 1), 'timeZone': 'UTC'},
+            'attendees': [{'email': f'guest{index % 50}@example.com', 'responseStatus': 'accepted'}],
+            'creator': {'email': 'owner@example.com'},
+            'status': 'confirmed',
+            'updated': updated or self._timestamp(0),
+        }
+
+    def google_events(self, query):
+        if 'syncToken' in query:
+            match = re.fullmatch(r'sync-(\d+)', query['syncToken'])
+            if not match:
+                return SimulatorResponse(410, {'error': {'code': 410, 'message': 'Sync token is no longer valid'}})
+            version = int(match.group(1))
+            updated = (EPOCH + timedelta(seconds=version + 1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            items = [
+                # Every tenth change is a deletion
+                {'id': f'event{index:07d}', 'status': 'cancelled'} if offset % 10 == 9
+                else self._google_event(index, updated)
+                for offset, index in enumerate(self._changed_indexes(version))
+            ]
+            next_version = version + 1 if items else version
+            return SimulatorResponse(200, {'items': items, 'nextSyncToken': f'sync-{next_version}'})
+
+        offset, size = self._page(query, 'maxResults', 'pageToken', 250, GOOGLE_CALENDAR_PAGE_LIMIT)
+        data = {'items': [self._google_event(index) for index in range(offset, min(offset + size, self.items))]}
+        if offset + size < self.items:
+            data['nextPageToken'] = str(offset + size)
+        else:
+            data['nextSyncToken'] = 'sync-0'
+        return SimulatorResponse(200, data)
+
+    def gmail_profile(self, query):
+        # History ids start at the mailbox size; each incremental sync adds messages after it
+        return SimulatorResponse(200, {'emailAddress': 'owner@example.com', 'historyId': str(self.items)})
+
+    def gmail_history(self, query):
+        start = int(query.get('startHistoryId') or 0)
+        if start < self.items:
+            return SimulatorResponse(404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}})
+        added = range(start, start + self.changes_per_sync)
+        return SimulatorResponse(200, {
+            'history': [
+                {'id': str(index), 'messagesAdded': [{'message': {'id': f'message{index:07d}', 'labelIds': ['INBOX']}}]}
+                for index in added
+            ],
+            'historyId': str(start + len(added)),
+        })
+
+    def gmail_messages(self, query):
+        offset, size = self._page(query, 'maxResults', 'pageToken', 100, GMAIL_LIST_PAGE_LIMIT)
+        data = {
+            'messages': [
+                {'id': f'message{index:07d}', 'threadId': f'thread{index // 3:07d}'}
+                for index in range(offset, min(offset + size, self.items))
+            ]
+        }
+        if offset + size < self.items:
+            data['nextPageToken'] = str(offset + size)
+        return SimulatorResponse(200, data)
+
+    def gmail_message(self, query, id):
+        index = int(id.removeprefix('message') or 0)
+        text = f'Simulated message {index}\n\n' + 'Lorem ipsum dolor sit amet. ' * 20
+        return SimulatorResponse(200, {
+            'id': id,
+            'threadId': f'thread{index // 3:07d}',
+            'labelIds': ['INBOX'] + (['UNREAD'] if index % 2 else []),
+            'internalDate': str(int((EPOCH + timedelta(minutes=index)).timestamp() * 1000)),
+            'payload': {
+                'mimeType': 'text/plain',
+                'headers': [
+                    {'name': 'Subject', 'value': f'Simulated message {index}'},
+                    {'name': 'From', 'value': f'sender{index % 50}@example.com'},
+                    {'name': 'To', 'value': 'owner@example.com'},
+                    {'name': 'Content-Type', 'value': 'text/plain; charset=utf-8'},
+                ],
+                'body': {'data': base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')},
+            },
+        })
+
+    def graph_user(self, query):
+        return SimulatorResponse(200, {
+            'id': 'simulated', 'displayName': 'Simulated Owner', 'mail': 'owner@example.com',
+            'userPrincipalName': 'owner@example.com',
+        })
+
+    def graph_events(self, query):
+        offset, size = self._page(query, '$top', '$skip', 10, GRAPH_PAGE_LIMIT)
+        graph_format = '%Y-%m-%dT%H:%M:%S.0000000'
+        data = {
+            'value': [
+                {
+                    'id': f'AAMkevent{index:07d}',
+                    'subject': f'Simulated event {index}',
+                    'bodyPreview': 'Generated by the provider simulator',
+                    'start': {'dateTime': self._timestamp(index, graph_format), 'timeZone': 'UTC'},
+                    'end': {'dateTime': self._timestamp(index + 1, graph_format), 'timeZone': 'UTC'},
+                    'location': {'displayName': 'Room 1'},
+                    'attendees': [{
+                        'emailAddress': {'address': f'guest{index % 50}@example.com', 'name': 'Guest'},
+                        'status': {'response': 'accepted'},
+                    }],
+                    'organizer': {'emailAddress': {'address': 'owner@example.com'}},
+                    'isAllDay': False,
+                    'isCancelled': False,
+                    'type': 'singleInstance',
+                    'createdDateTime': self._timestamp(0),
+                    'lastModifiedDateTime': self._timestamp(0),
+                }
+                for index in range(offset, min(offset + size, self.items))
+            ]
+        }
+        if offset + size < self.items:
+            next_query = {key: value for key, value in query.items() if key != '$skip'}
+            next_query.update({'$top': size, '$skip': offset + size})
+            data['@odata.nextLink'] = f'https://graph.microsoft.com/v1.0/me/events?{urlencode(next_query)}'
+        return SimulatorResponse(200, data)
+
+    def github_user(self, query):
+        return SimulatorResponse(200, {'id': 1, 'login': 'simulated', 'name': 'Simulated Owner', 'email': 'owner@example.com'})
+
+    def github_repos(self, query):
+        size = min(int(query.get('per_page') or 30), GITHUB_PAGE_LIMIT)
+        offset = (int(query.get('page') or 1) - 1) * size
+        return SimulatorResponse(200, [
+            {
+                'id': index,
+                'name': f'repo-{index}',
+                'full_name': f'simulated/repo-{index}',
+                'private': bool(index % 2),
+                'html_url': f'https://github.com/simulated/repo-{index}',
+                'default_branch': 'main',
+                'updated_at': self._timestamp(0),
+            }
+            for index in range(offset, min(offset + size, self.items))
+        ])
+
+    def slack_auth_test(self, query):
+        return SimulatorResponse(200, {'ok': True, 'team_id': 'TSIMULATED', 'user_id': 'USIMULATED', 'team': 'Simulated'})
+
+    def slack_channels_list(self, query):
+        offset, size = self._page(query, 'limit', 'cursor', 100, SLACK_PAGE_LIMIT)
+        end = min(offset + size, self.slack_channels)
+        return SimulatorResponse(200, {
+            'ok': True,
+            'channels': [
+                {
+                    'id': f'C{index:08d}', 'name': f'simulated-{index}', 'is_private': False,
+                    'is_archived': False, 'is_member': True, 'num_members': 10,
+                    'topic': {'value': ''}, 'purpose': {'value': ''},
+                }
+                for index in range(offset, end)
+            ],
+            'response_metadata': {'next_cursor': str(end) if end < self.slack_channels else ''},
+        })
+
+    def slack_history(self, query):
+        # Each channel holds ``items`` messages, one a minute up to the simulator start
+        offset, size = self._page(query, 'limit', 'cursor', 100, SLACK_PAGE_LIMIT)
+        first_ts = self.started - 60 * self.items
+        oldest = float(query.get('oldest') or 0)
+        first = max(int((oldest - first_ts) // 60) + 1, 0) if oldest > first_ts else 0
+        start = first + offset
+        end = min(start + size, self.items)
+        return SimulatorResponse(200, {
+            'ok': True,
+            'messages': [
+                {'type': 'message', 'user': f'U{index % 20:08d}', 'text': f'Simulated message {index}',
+                 'ts': f'{first_ts + 60 * index:.6f}'}
+                for index in range(start, end)
+            ],
+            'has_more': end < self.items,
+            'response_metadata': {'next_cursor': str(end - first) if end < self.items else ''},
+        })
+
+    def slack_post_message(self, query):
+        return SimulatorResponse(200, {'ok': True, 'channel': query.get('channel'), 'ts': f'{time.time():.6f}'})
+
+    def calendly_user(self, query):
+        return SimulatorResponse(200, {'resource': {
+            'uri': 'https://api.calendly.com/users/SIMULATED', 'name': 'Simulated Owner', 'email': 'owner@example.com',
+        }})
+
+    def calendly_events(self, query):
+        offset, size = self._page(query, 'count', 'page_token', 20, CALENDLY_PAGE_LIMIT)
+        data = {
+            'collection': [
+                {
+                    'uri': f'https://api.calendly.com/scheduled_events/EVENT{index:07d}',
+                    'name': f'Simulated meeting {index}',
+                    'status': 'active',
+                    'start_time': self._timestamp(index, '%Y-%m-%dT%H:%M:%S.000000Z'),
+                    'end_time': self._timestamp(index + 1, '%Y-%m-%dT%H:%M:%S.000000Z'),
+                    'created_at': self._timestamp(0, '%Y-%m-%dT%H:%M:%S.000000Z'),
+                    'updated_at': self._timestamp(0, '%Y-%m-%dT%H:%M:%S.000000Z'),
+                }
+                for index in range(offset, min(offset + size, self.items))
+            ],
+            'pagination': {'count': size, 'next_page': None, 'next_page_token': None},
+        }
+        if offset + size < self.items:
+            next_query = dict(query, count=size, page_token=offset + size)
+            data['pagination']['next_page'] = f'https://api.calendly.com/scheduled_events?{urlencode(next_query)}'
+            data['pagination']['next_page_token'] = str(offset + size)
+        return SimulatorResponse(200, data)
+
+
+class SimulatorAdapter(BaseAdapter):
+    """requests transport that answers from a ProviderSimulator instead of the network"""
+
+    def __init__(self, simulator):
+        super().__init__()
+        self.simulator = simulator
+
+    def send(self, request, **kwargs):
+        simulated = self.simulator.handle(request.method, request.url, request.headers, request.body)
+        response = requests.Response()
+        response.status_code = simulated.status_code
+        response.reason = 'OK' if simulated.status_code < 400 else 'Error'
+        response.headers = CaseInsensitiveDict(simulated.headers)
+        response._content = simulated.content
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def simulated_providers(session, simulator):
+    """Answer the provider hosts of ``session`` from ``simulator`` inside the block"""
+    prefixes = [f'https://{host}/' for host in sorted(PROVIDER_HOSTS)]
+    for prefix in prefixes:
+        session.mount(prefix, SimulatorAdapter(simulator))
+    try:
+        yield simulator
+    finally:
+        for prefix in prefixes:
+            session.adapters.pop(prefix, None)
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """Serve a ProviderSimulator over HTTP; the provider host is the first path segment"""
+
+    simulator = None
+    quiet = True
+    # Keep connections open between calls, as the providers do
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        simulated = self.simulator.handle(self.command, f"https://{self.path.lstrip('/')}", dict(self.headers), body)
+        content = simulated.content
+        self.send_response(simulated.status_code)
+        for key, value in simulated.headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(simulator, host='127.0.0.1', port=8099, quiet=True):
+    """Build a threaded HTTP server for ``simulator``; call serve_forever() on it"""
+    handler = type('BoundSimulatorRequestHandler', (SimulatorRequestHandler,), {'simulator': simulator, 'quiet': quiet})
+    server_class = type('SimulatorServer', (ThreadingHTTPServer,), {'daemon_threads': True, 'request_queue_size': 1024})
+    return server_class((host, port), handler)
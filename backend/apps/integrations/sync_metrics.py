@@ -0,0 +1,217 @@
+import time
+import tracemalloc
+from http.cookiejar import DefaultCookiePolicy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+import requests
+
+from .signals import provider_request_finished
+from .simulator import simulator_url
+
+PHASES = ['token_refresh', 'fetch', 'parse', 'db_write']
+SUMMARY_COUNTERS = ['http_calls', 'bytes_downloaded', 'retries', 'rate_limit_wait_ms', 'peak_memory_bytes']
+
+_active = ContextVar('sync_metrics', default=None)
+
+# One pooled session for every provider call, so connections are kept alive
+# between requests. It must not carry cookies from one integration to another.
+session = requests.Session()
+session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+
+class SyncMetrics:
+    """
+    Phase timings and resource counters of one sync.
+
+    Phases nest exclusively: entering a phase pauses the enclosing one, so
+    an HTTP call made during a token refresh is not also counted as fetch
+    time. Time spent outside any phase is reported as 'other'.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.http_calls = 0
+        self.bytes_downloaded = 0
+        self.retries = 0
+        self.rate_limit_wait = 0.0
+        self.started = time.perf_counter()
+        self._stack = []
+        self._token = None
+
+        # tracemalloc slows allocation down noticeably, so it is opt-in. Peaks
+        # are process-wide: syncs running in parallel threads share them.
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        self.trace_memory = trace_memory
+        if self._owns_tracing:
+            tracemalloc.start()
+        elif trace_memory:
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.phases[parent[0]] = self.phases.get(parent[0], 0.0) + now - parent[1]
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            current = self._stack.pop()
+            self.phases[current[0]] = self.phases.get(current[0], 0.0) + now - current[1]
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def as_dict(self):
+        """Return the collected figures in the shape stored on SyncLog.metrics"""
+        duration = time.perf_counter() - self.started
+        phases = {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+        phases['other'] = round(max(duration - sum(self.phases.values()), 0) * 1000, 1)
+        data = {
+            'duration_ms': round(duration * 1000, 1),
+            'phases': phases,
+            'http_calls': self.http_calls,
+            'bytes_downloaded': self.bytes_downloaded,
+            'retries': self.retries,
+            'rate_limit_wait_ms': round(self.rate_limit_wait * 1000, 1),
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            data['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        return data
+
+    def stop(self):
+        """Stop memory tracing if this sync started it and return the figures"""
+        data = self.as_dict()
+        if self._owns_tracing:
+            tracemalloc.stop()
+        return data
+
+
+def start_recording():
+    """Start collecting metrics for the sync running in the current context"""
+    recorder = SyncMetrics(trace_memory=settings.SYNC_TRACEMALLOC)
+    recorder._token = _active.set(recorder)
+    return recorder
+
+
+def stop_recording(recorder):
+    """Stop collecting metrics and return them as a dict"""
+    try:
+        _active.reset(recorder._token)
+    except ValueError:
+        # Finished from another context; just make sure it is no longer active
+        if _active.get() is recorder:
+            _active.set(None)
+    return recorder.stop()
+
+
+@contextmanager
+def phase(name):
+    """Attribute the time spent in the block to ``name`` on the active sync, if any"""
+    recorder = _active.get()
+    if recorder is None:
+        yield
+        return
+    with recorder.phase(name):
+        yield
+
+
+def record_retry():
+    recorder = _active.get()
+    if recorder is not None:
+        recorder.retries += 1
+
+
+def record_wait(seconds):
+    """Count time spent sleeping for a rate limit"""
+    recorder = _active.get()
+    if recorder is not None:
+        recorder.rate_limit_wait += seconds
+
+
+def tracked_request(method, url, phase_name='fetch', **kwargs):
+    """Send an HTTP request, counting it on the active sync and reporting it to listeners"""
+    # Load tests send every provider call to the local simulator instead
+    target = simulator_url(url, settings.PROVIDER_SIMULATOR_URL) if settings.PROVIDER_SIMULATOR_URL else url
+    started = time.perf_counter()
+    try:
+        with phase(phase_name):
+            response = session.request(method, target, **kwargs)
+    except requests.RequestException as e:
+        provider_request_finished.send(
+            sender=None, method=method, url=url, status_code=None,
+            duration=time.perf_counter() - started, phase=phase_name, error=e
+        )
+        raise
+    provider_request_finished.send(
+        sender=None, method=method, url=url, status_code=response.status_code,
+        duration=time.perf_counter() - started, phase=phase_name, error=None
+    )
+    recorder = _active.get()
+    if recorder is not None:
+        recorder.http_calls += 1
+        recorder.bytes_downloaded += len(response.content)
+    return response
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _distribution(values):
+    values = sorted(values)
+    return {
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else None,
+    }
+
+
+def summarize(sync_logs):
+    """
+    Aggregate the metrics of finished syncs per provider.
+
+    For every provider this reports p50/p95/p99 of the total duration, of
+    each phase and of the resource counters. Logs written before metrics
+    were recorded are counted but have no figures.
+    """
+    samples = {}
+    for provider, sync_status, metrics in sync_logs.exclude(status='started').values_list(
+        'integration__provider', 'status', 'metrics'
+    ).iterator():
+        provider_samples = samples.setdefault(provider, {'syncs': 0, 'failed': 0, 'values': {}})
+        provider_samples['syncs'] += 1
+        provider_samples['failed'] += sync_status == 'failed'
+        if not metrics:
+            continue
+        values = provider_samples['values']
+        values.setdefault('duration_ms', []).append(metrics.get('duration_ms', 0))
+        for name, value in (metrics.get('phases') or {}).items():
+            values.setdefault(f'phase:{name}', []).append(value)
+        for name in SUMMARY_COUNTERS:
+            if name in metrics:
+                values.setdefault(name, []).append(metrics[name])
+
+    summary = {}
+    for provider, provider_samples in sorted(samples.items()):
+        values = provider_samples['values']
+        summary[provider] = {
+            'syncs': provider_samples['syncs'],
+            'failed': provider_samples['failed'],
+            'duration_ms': _distribution(values.get('duration_ms', [])),
+            'phases': {
+                name: _distribution(values.get(f'phase:{name}', []))
+                for name in PHASES + ['other']
+            },
+            **{
+                name: _distribution(values[name])
+                for name in SUMMARY_COUNTERS if name in values
+            },
+        }
+    return summary
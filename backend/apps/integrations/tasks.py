@@ -0,0 +1,326 @@
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+import logging
+
+from .inbox import process_deliveries, purge_deliveries
+from .models import Integration, SlackNotification, WebhookDelivery
+from .notifications import deliver_notifications, notification_channel, notification_settings
+from .services import GoogleOAuthService, get_oauth_service
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_PUSH_PROVIDERS = ['google_calendar', 'google_gmail']
+WEBHOOK_PROVIDERS = ['microsoft_calendar', 'calendly']
+
+
+def _debounce_key(integration_id, resource, calendar_id):
+    return f'push-sync:{integration_id}:{resource}:{calendar_id}'
+
+
+def schedule_push_sync(integration_id, resource, calendar_id=''):
+    """
+    Queue an incremental sync for a push notification, coalescing bursts.
+
+    The first notification claims the debounce key and schedules one sync
+    after the debounce window. Notifications arriving before that sync starts
+    are dropped, since it will fetch their changes as well. Returns whether a
+    sync was scheduled.
+    """
+    delay = settings.PUSH_SYNC_DEBOUNCE_SECONDS
+    # The key outlives the countdown so a stalled worker cannot block syncs forever
+    if not cache.add(_debounce_key(integration_id, resource, calendar_id), 1, delay + 300):
+        return False
+    run_push_sync.apply_async(args=[integration_id, resource, calendar_id], countdown=delay)
+    return True
+
+
+@shared_task
+def run_push_sync(integration_id, resource, calendar_id=''):
+    """Run the incremental sync requested by push notifications"""
+    # Notifications from now on must schedule a new run
+    cache.delete(_debounce_key(integration_id, resource, calendar_id))
+
+    integration = Integration.objects.filter(
+        id=integration_id, status='connected', sync_enabled=True
+    ).first()
+    if integration is None:
+        return
+
+    service = GoogleOAuthService(integration)
+    try:
+        if resource == 'calendar':
+            service.sync_calendar_events(calendar_id or 'primary', incremental=True)
+        elif resource == 'gmail':
+            service.sync_gmail_messages(incremental=True)
+    except Exception as e:
+        logger.error(f"Push sync of {resource} failed for {integration}: {e}")
+
+
+def ensure_watch_channels(integration, renew_before=None):
+    """Open push channels that are missing or expire before ``renew_before``"""
+    if renew_before is None:
+        renew_before = timezone.now() + timedelta(seconds=settings.WATCH_CHANNEL_RENEW_BEFORE)
+    service = GoogleOAuthService(integration)
+    channels = list(integration.watch_channels.all())
+
+    if integration.provider == 'google_calendar' and settings.GOOGLE_PUSH_WEBHOOK_URL:
+        calendar_channels = [channel for channel in channels if channel.resource_type == 'calendar']
+        if not any(channel.expires_at > renew_before for channel in calendar_channels):
+            # Open the replacement first so no notification falls into a gap
+            service.watch_calendar('primary')
+            for channel in calendar_channels:
+                service.stop_watch_channel(channel)
+
+    if integration.provider == 'google_gmail' and settings.GOOGLE_PUBSUB_TOPIC:
+        gmail_channels = [channel for channel in channels if channel.resource_type == 'gmail']
+        if not any(channel.expires_at > renew_before for channel in gmail_channels):
+            service.watch_gmail()
+
+
+def stop_watch_channels(integration):
+    """Stop every push channel of an integration, ignoring provider errors"""
+    service = GoogleOAuthService(integration)
+    for channel in integration.watch_channels.all():
+        try:
+            service.stop_watch_channel(channel)
+        except Exception as e:
+            logger.warning(f"Could not stop watch channel {channel.channel_id}: {e}")
+            channel.delete()
+
+
+@shared_task
+def setup_watch_channels(integration_id):
+    """Open push channels for a newly connected Google integration"""
+    integration = Integration.objects.filter(
+        id=integration_id, provider__in=GOOGLE_PUSH_PROVIDERS, status='connected'
+    ).first()
+    if integration is None:
+        return
+    try:
+        ensure_watch_channels(integration)
+    except Exception as e:
+        logger.error(f"Could not open watch channels for {integration}: {e}")
+
+
+@shared_task
+def renew_watch_channels():
+    """Renew push channels before they expire and open any that are missing"""
+    if not settings.GOOGLE_PUSH_WEBHOOK_URL and not settings.GOOGLE_PUBSUB_TOPIC:
+        return
+
+    renew_before = timezone.now() + timedelta(seconds=settings.WATCH_CHANNEL_RENEW_BEFORE)
+    integrations = Integration.objects.filter(
+        provider__in=GOOGLE_PUSH_PROVIDERS, status='connected', sync_enabled=True
+    ).prefetch_related('watch_channels')
+    for integration in integrations:
+        try:
+            ensure_watch_channels(integration, renew_before)
+        except Exception as e:
+            logger.error(f"Watch channel renewal failed for {integration}: {e}")
+
+
+
+def _inbox_key(integration_id):
+    return f'webhook-inbox:{integration_id}'
+
+
+def schedule_webhook_processing(integration_id):
+    """Apply an integration's inbox shortly, so one worker run picks up a whole burst"""
+    delay = settings.WEBHOOK_BATCH_DELAY_SECONDS
+    if not cache.add(_inbox_key(integration_id), 1, delay + 300):
+        return False
+    process_webhook_inbox.apply_async(args=[integration_id], countdown=delay)
+    return True
+
+
+@shared_task
+def process_webhook_inbox(integration_id):
+    """Apply the pending webhook deliveries of one integration"""
+    cache.delete(_inbox_key(integration_id))
+    
+    # Runs for the same integration must not interleave. The running one drains
+    # the inbox until it is empty; anything it misses is left to the sweeper.
+    lock_key = f'webhook-inbox-lock:{integration_id}'
+    if not cache.add(lock_key, 1, 300):
+        return
+    try:
+        process_deliveries(integration_id)
+    finally:
+        cache.delete(lock_key)
+
+
+@shared_task
+def sweep_webhook_inbox():
+    """Pick up deliveries whose scheduled run was lost or failed, and purge old rows"""
+    stale_before = timezone.now() - timedelta(seconds=settings.WEBHOOK_BATCH_DELAY_SECONDS * 5)
+    integration_ids = WebhookDelivery.objects.filter(
+        status='pending', received_at__lt=stale_before
+    ).values_list('integration_id', flat=True).distinct()
+    for integration_id in integration_ids:
+        schedule_webhook_processing(integration_id)
+    purge_deliveries()
+
+
+def ensure_webhook_subscriptions(integration, renew_before=None):
+    """Create a missing webhook subscription and renew one that expires before ``renew_before``"""
+    if not settings.WEBHOOK_BASE_URL:
+        return
+    if renew_before is None:
+        renew_before = timezone.now() + timedelta(seconds=settings.WEBHOOK_SUBSCRIPTION_RENEW_BEFORE)
+    service = get_oauth_service(integration)
+    subscriptions = list(integration.webhook_subscriptions.all())
+    
+    if not subscriptions:
+        service.create_webhook_subscription()
+    for subscription in subscriptions:
+        if subscription.expires_at is not None and subscription.expires_at <= renew_before:
+            service.renew_webhook_subscription(subscription)
+
+
+def delete_webhook_subscriptions(integration):
+    """Delete every webhook subscription of an integration, ignoring provider errors"""
+    if integration.provider not in WEBHOOK_PROVIDERS:
+        return
+    service = get_oauth_service(integration)
+    for subscription in integration.webhook_subscriptions.all():
+        try:
+            service.delete_webhook_subscription(subscription)
+        except Exception as e:
+            logger.warning(f"Could not delete webhook subscription {subscription.subscription_id}: {e}")
+            subscription.delete()
+
+
+@shared_task
+def setup_webhook_subscriptions(integration_id):
+    """Subscribe a newly connected Microsoft Calendar or Calendly integration to webhooks"""
+    integration = Integration.objects.filter(
+        id=integration_id, provider__in=WEBHOOK_PROVIDERS, status='connected'
+    ).first()
+    if integration is None:
+        return
+    try:
+        ensure_webhook_subscriptions(integration)
+    except Exception as e:
+        logger.error(f"Could not create webhook subscription for {integration}: {e}")
+
+
+@shared_task
+def renew_webhook_subscriptions():
+    """Renew expiring webhook subscriptions and create any that are missing"""
+    if not settings.WEBHOOK_BASE_URL:
+        return
+    
+    renew_before = timezone.now() + timedelta(seconds=settings.WEBHOOK_SUBSCRIPTION_RENEW_BEFORE)
+    integrations = Integration.objects.filter(
+        provider__in=WEBHOOK_PROVIDERS, status='connected', sync_enabled=True
+    ).prefetch_related('webhook_subscriptions')
+    for integration in integrations:
+        try:
+            ensure_webhook_subscriptions(integration, renew_before)
+        except Exception as e:
+            logger.error(f"Webhook subscription renewal failed for {integration}: {e}")
+
+
+@shared_task
+def sync_slack_messages(integration_id):
+    """Sync the channels and new messages of a Slack integration"""
+    integration = Integration.objects.filter(
+        id=integration_id, provider='slack', status='connected'
+    ).first()
+    if integration is None:
+        return
+
+    # A sync of the same workspace already running picks up the new messages too
+    lock_key = f'slack-sync-lock:{integration_id}'
+    if not cache.add(lock_key, 1, 3600):
+        return
+    try:
+        get_oauth_service(integration).sync_messages()
+    except Exception as e:
+        logger.error(f"Slack sync task failed for {integration}: {e}")
+    finally:
+        cache.delete(lock_key)
+
+
+
+def _slack_delivery_key(integration_id, channel):
+    return f'slack-delivery:{integration_id}:{channel}'
+
+
+def schedule_slack_delivery(integration_id, channel, delay=None):
+    """
+    Deliver a channel's queue after the coalescing window, once per burst.
+
+    Without a broker tasks run eagerly in the caller, where there is no
+    window to wait out, so the queue is sent straight away.
+    """
+    if settings.CELERY_TASK_ALWAYS_EAGER:
+        delay = 0
+    elif delay is None:
+        delay = settings.SLACK_NOTIFY_COALESCE_SECONDS
+    if not cache.add(_slack_delivery_key(integration_id, channel), 1, delay + 300):
+        return False
+    deliver_slack_notifications.apply_async(args=[integration_id, channel], countdown=delay)
+    return True
+
+
+def enqueue_slack_notification(integration, text, channel='', event_type=''):
+    """
+    Queue a Slack message and return without talking to Slack.
+    
+    The row is written in the caller's transaction; delivery is scheduled
+    once it commits.
+    """
+    channel = channel or notification_channel(integration)
+    if not channel:
+        return None
+    notification = SlackNotification.objects.create(
+        integration=integration, channel=channel, event_type=event_type, text=text
+    )
+    transaction.on_commit(lambda: schedule_slack_delivery(integration.id, channel))
+    return notification
+
+
+def notify_user(user_id, event_type, text):
+    """Queue a notification to a user's connected Slack, if they opted into ``event_type``"""
+    integration = Integration.objects.filter(
+        user_id=user_id, provider='slack', status='connected'
+    ).only('id', 'sync_state').first()
+    if integration is None:
+        return None
+    preferences = notification_settings(integration)
+    if not preferences['enabled'] or event_type not in preferences['events']:
+        return None
+    return enqueue_slack_notification(integration, text, event_type=event_type)
+
+
+@shared_task
+def deliver_slack_notifications(integration_id, channel):
+    """Send the queued notifications of one Slack channel"""
+    cache.delete(_slack_delivery_key(integration_id, channel))
+    
+    # One sender per channel keeps messages in order and under the per-channel limit
+    lock_key = f'slack-delivery-lock:{integration_id}:{channel}'
+    if not cache.add(lock_key, 1, 300):
+        return
+    try:
+        _, retry_in = deliver_notifications(integration_id, channel)
+    finally:
+        cache.delete(lock_key)
+    if retry_in is not None:
+        schedule_slack_delivery(integration_id, channel, delay=retry_in)
+
+
+@shared_task
+def sweep_slack_notifications():
+    """Schedule channels with due notifications whose delivery run was lost"""
+    stale_before = timezone.now() - timedelta(seconds=settings.SLACK_NOTIFY_COALESCE_SECONDS * 2)
+    due = SlackNotification.objects.filter(
+        status='pending', next_attempt_at__lte=timezone.now(), created_at__lt=stale_before
+    ).values_list('integration_id', 'channel').distinct()
+    for integration_id, channel in due:
+        schedule_slack_delivery(integration_id, channel)
@@ -0,0 +1,548 @@
+import base64
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from dateutil.rrule import rrulestr
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import response_cache
+from .conditional import bump_data_version
+from .dedupe import exclude_duplicate_events
+from .feed import render_feed
+from .models import CalendarEvent, Integration, WatchChannel, WebhookDelivery, WebhookSubscription
+from .recurrence import _occurrence_starts, expand_recurring_event, graph_recurrence_to_rules
+from .response_cache import cached_response, get_or_compute, local_cache
+from .tasks import schedule_slack_delivery
+
+User = get_user_model()
+
+
+class CalendarEventFingerprintTests(TestCase):
+    """The same meeting synced from Google and Microsoft shares one fingerprint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+        self.google = Integration.objects.create(user=self.user, provider='google_calendar', status='connected')
+        self.microsoft = Integration.objects.create(user=self.user, provider='microsoft_calendar', status='connected')
+        self.start = datetime(2030, 1, 7, 10, 0, tzinfo=dt_timezone.utc)
+
+    def create_event(self, integration, provider_event_id, **fields):
+        values = {
+            'title': 'Weekly sync',
+            'start_time': self.start,
+            'end_time': self.start + timedelta(hours=1),
+            'last_modified': self.start,
+        }
+        values.update(fields)
+        return CalendarEvent.objects.create(integration=integration, provider_event_id=provider_event_id, **values)
+
+    def test_participants_and_timezone_do_not_matter(self):
+        berlin = ZoneInfo('Europe/Berlin')
+        google_event = self.create_event(
+            self.google, 'g1',
+            attendees=[{'email': 'ana@example.com'}, {'email': 'Bo@Example.com'}],
+            created_by='ana@example.com',
+        )
+        microsoft_event = self.create_event(
+            self.microsoft, 'm1',
+            title='  weekly   SYNC ',
+            start_time=self.start.astimezone(berlin),
+            end_time=(self.start + timedelta(hours=1)).astimezone(berlin),
+            attendees=[{'email': 'bo@example.com'}],
+            created_by='Ana Example',
+        )
+        self.assertEqual(google_event.fingerprint, microsoft_event.fingerprint)
+
+    def test_title_start_and_end_must_match(self):
+        event = self.create_event(self.google, 'g1')
+        for provider_event_id, fields in [
+            ('m1', {'title': 'Weekly sync (moved)'}),
+            ('m2', {'start_time': self.start + timedelta(minutes=30)}),
+            ('m3', {'end_time': self.start + timedelta(minutes=30)}),
+        ]:
+            other = self.create_event(self.microsoft, provider_event_id, **fields)
+            self.assertNotEqual(event.fingerprint, other.fingerprint, fields)
+
+    def test_dedupe_keeps_the_oldest_copy(self):
+        first = self.create_event(self.google, 'g1')
+        self.create_event(self.microsoft, 'm1', attendees=[{'email': 'bo@example.com'}])
+        events = exclude_duplicate_events(CalendarEvent.objects.filter(integration__user=self.user))
+        self.assertEqual(list(events), [first])
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'event-list-tests',
+    }
+})
+class CalendarEventListTests(TestCase):
+    """Stored events and expanded occurrences are paged as one list"""
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.addCleanup(local_cache.clear)
+        _occurrence_starts.cache_clear()
+
+        self.user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+        self.integration = Integration.objects.create(user=self.user, provider='google_calendar', status='connected')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0)
+
+    def create_event(self, provider_event_id, start, **fields):
+        return CalendarEvent.objects.create(
+            integration=self.integration, provider_event_id=provider_event_id, title=provider_event_id,
+            start_time=start, end_time=start + timedelta(hours=1), last_modified=start, **fields
+        )
+
+    def get(self, **params):
+        response = self.client.get('/api/integrations/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_occurrences_are_merged_into_pages_with_their_own_ids(self):
+        for day in range(3):
+            self.create_event(f'plain{day}', self.today + timedelta(days=day, hours=1))
+        master = self.create_event(
+            'standup', self.today - timedelta(days=1), is_recurring=True, recurrence=['RRULE:FREQ=DAILY;COUNT=4']
+        )
+
+        pages = [self.get(page_size=3, page=page) for page in (1, 2, 3)]
+        self.assertEqual([page['count'] for page in pages], [7, 7, 7])
+        results = [event for page in pages for event in page['results']]
+        self.assertEqual(
+            [event['title'] for event in results],
+            ['standup', 'standup', 'plain0', 'standup', 'plain1', 'standup', 'plain2'],
+        )
+        starts = [event['start_time'] for event in results]
+        self.assertEqual(starts, sorted(starts))
+
+        occurrence_ids = [event['id'] for event in results if event['title'] == 'standup']
+        self.assertEqual(len(set(occurrence_ids)), 4)
+        self.assertEqual(
+            occurrence_ids[0], f"{master.id}:{(self.today - timedelta(days=1)).isoformat()}"
+        )
+
+    def test_stored_events_are_only_bounded_by_the_requested_dates(self):
+        self.create_event('standup', self.today, is_recurring=True, recurrence=['RRULE:FREQ=WEEKLY;COUNT=2'])
+        self.create_event('old review', self.today - timedelta(days=200))
+        self.create_event('offsite', self.today + timedelta(days=200))
+
+        titles = [event['title'] for event in self.get(page_size=100)['results']]
+        self.assertEqual(titles, ['old review', 'standup', 'standup', 'offsite'])
+        titles = [event['title'] for event in self.get(search='review')['results']]
+        self.assertEqual(titles, ['old review'])
+
+        titles = [event['title'] for event in self.get(start_date=self.today.isoformat(), page_size=100)['results']]
+        self.assertEqual(titles, ['standup', 'standup', 'offsite'])
+
+    def test_default_window_reuses_the_memoized_expansion(self):
+        self.create_event('standup', self.today, is_recurring=True, recurrence=['RRULE:FREQ=DAILY'])
+
+        # Different pages are cached separately, so both expand the master
+        self.get(page=1)
+        misses = _occurrence_starts.cache_info().misses
+        self.get(page=2)
+        info = _occurrence_starts.cache_info()
+        self.assertEqual(info.misses, misses)
+        self.assertGreaterEqual(info.hits, 1)
+
+
+class GraphRecurrenceTests(TestCase):
+    """Outlook series end on their inclusive end date, timed or all-day"""
+
+    recurrence = {
+        'pattern': {'type': 'weekly', 'interval': 1, 'daysOfWeek': ['monday'], 'firstDayOfWeek': 'sunday'},
+        'range': {'type': 'endDate', 'startDate': '2026-01-05', 'endDate': '2026-03-30'},
+    }
+
+    def expand(self, start, is_all_day):
+        user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+        integration = Integration.objects.create(user=user, provider='microsoft_calendar', status='connected')
+        duration = timedelta(days=1) if is_all_day else timedelta(hours=1)
+        master = CalendarEvent.objects.create(
+            integration=integration, provider_event_id='series', title='Series',
+            start_time=start, end_time=start + duration, last_modified=start,
+            is_all_day=is_all_day, is_recurring=True,
+            recurrence=graph_recurrence_to_rules(self.recurrence, is_all_day),
+        )
+        return expand_recurring_event(
+            master, datetime(2026, 1, 1, tzinfo=dt_timezone.utc), datetime(2026, 6, 1, tzinfo=dt_timezone.utc)
+        )
+
+    def test_timed_series(self):
+        self.assertEqual(
+            graph_recurrence_to_rules(self.recurrence),
+            ['RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO;WKST=SU;UNTIL=20260330T235959Z'],
+        )
+        occurrences = self.expand(datetime(2026, 1, 5, 14, 0, tzinfo=dt_timezone.utc), is_all_day=False)
+        self.assertEqual(len(occurrences), 13)
+
+    def test_all_day_series_uses_a_date_until(self):
+        self.assertEqual(
+            graph_recurrence_to_rules(self.recurrence, is_all_day=True),
+            ['RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO;WKST=SU;UNTIL=20260330'],
+        )
+        occurrences = self.expand(datetime(2026, 1, 5, tzinfo=dt_timezone.utc), is_all_day=True)
+        self.assertEqual(len(occurrences), 13)
+        self.assertEqual(occurrences[-1].start_time, datetime(2026, 3, 30, tzinfo=dt_timezone.utc))
+
+
+def parse_vevents(body):
+    """Unfold an iCalendar body into one ``{name: (params, value)}`` dict per VEVENT"""
+    lines = body.replace('\r\n ', '').split('\r\n')
+    events = []
+    for line in lines:
+        if line == 'BEGIN:VEVENT':
+            events.append({})
+        elif events and line != 'END:VEVENT' and ':' in line:
+            head, value = line.split(':', 1)
+            name, _, params = head.partition(';')
+            events[-1].setdefault(name, (params, value))
+    return events
+
+
+def local_start(prop):
+    """The aware start of a DTSTART or RECURRENCE-ID written as ``TZID=<zone>`` wall time"""
+    params, value = prop
+    zone = ZoneInfo(params.removeprefix('TZID='))
+    return datetime.strptime(value, '%Y%m%dT%H%M%S').replace(tzinfo=zone)
+
+
+class ICalendarRenderingTests(TestCase):
+    """Series keep their wall time across DST and overrides never appear without their master"""
+
+    new_york = ZoneInfo('America/New_York')
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+        self.integration = Integration.objects.create(user=self.user, provider='google_calendar', status='connected')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # 9:00 in New York, before the March DST change
+        self.start = datetime(2026, 1, 5, 14, 0, tzinfo=dt_timezone.utc)
+
+    def create_event(self, provider_event_id, start, **fields):
+        return CalendarEvent.objects.create(
+            integration=self.integration, provider_event_id=provider_event_id, title=provider_event_id,
+            start_time=start, end_time=start + timedelta(hours=1), last_modified=start,
+            timezone='America/New_York', **fields
+        )
+
+    def create_series(self):
+        """A master with a moved occurrence, and an expand-mode occurrence whose master is not stored"""
+        self.create_event('weekly', self.start, is_recurring=True, recurrence=['RRULE:FREQ=WEEKLY;BYDAY=MO'])
+        self.create_event(
+            'weekly_20260112T140000Z', self.start + timedelta(days=7, hours=1),
+            recurring_event_id='weekly', original_start_time=self.start + timedelta(days=7),
+        )
+        self.create_event(
+            'planning_20260105T140000Z', self.start,
+            recurring_event_id='planning', original_start_time=self.start,
+        )
+
+    def vevents(self, body):
+        return {event['SUMMARY'][1]: event for event in parse_vevents(body)}
+
+    def assert_series(self, events):
+        master = events['weekly']
+        self.assertEqual(master['DTSTART'], ('TZID=America/New_York', '20260105T090000'))
+        self.assertEqual(master['DTEND'], ('TZID=America/New_York', '20260105T100000'))
+        rule = rrulestr(master['RRULE'][1], dtstart=local_start(master['DTSTART']))
+        after_dst = rule.after(datetime(2026, 3, 9, tzinfo=self.new_york))
+        self.assertEqual((after_dst.hour, after_dst.astimezone(dt_timezone.utc).hour), (9, 13))
+
+        moved = events['weekly_20260112T140000Z']
+        self.assertEqual(moved['UID'], master['UID'])
+        self.assertEqual(moved['RECURRENCE-ID'], ('TZID=America/New_York', '20260112T090000'))
+        self.assertEqual(moved['DTSTART'], ('TZID=America/New_York', '20260112T100000'))
+
+        orphan = events['planning_20260105T140000Z']
+        self.assertEqual(orphan['UID'][1], 'planning_20260105T140000Z@google_calendar.integrato')
+        self.assertNotIn('RECURRENCE-ID', orphan)
+        self.assertEqual(orphan['DTSTART'], ('', '20260105T140000Z'))
+
+    def test_export(self):
+        self.create_series()
+        response = self.client.get('/api/integrations/events/export/', {'export_format': 'ics'})
+        self.assertEqual(response.status_code, 200)
+        self.assert_series(self.vevents(b''.join(response.streaming_content).decode()))
+
+    def test_export_without_the_master_writes_standalone_overrides(self):
+        self.create_series()
+        response = self.client.get('/api/integrations/events/export/', {
+            'export_format': 'ics', 'start_date': '2026-01-10T00:00:00Z',
+        })
+        moved = self.vevents(b''.join(response.streaming_content).decode())['weekly_20260112T140000Z']
+        self.assertEqual(moved['UID'][1], 'weekly_20260112T140000Z@google_calendar.integrato')
+        self.assertNotIn('RECURRENCE-ID', moved)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ics-feed-tests',
+        }
+    }, CALENDAR_FEED_PAST_DAYS=36500)
+    def test_feed(self):
+        cache.clear()
+        self.create_series()
+        self.assert_series(self.vevents(render_feed(self.user.id)))
+
+        # Cached blocks of overrides are not reused once their master is gone
+        CalendarEvent.objects.filter(provider_event_id='weekly').delete()
+        moved = self.vevents(render_feed(self.user.id))['weekly_20260112T140000Z']
+        self.assertNotIn('RECURRENCE-ID', moved)
+        self.assertEqual(moved['DTSTART'], ('', '20260112T150000Z'))
+
+
+class CountingCompute:
+    """Stand-in for an expensive view body that records how often it ran"""
+
+    def __init__(self, value='fresh', delay=0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'response-cache-tests',
+    }
+})
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.addCleanup(local_cache.clear)
+
+    def test_local_miss_falls_through_to_django_cache(self):
+        compute = CountingCompute()
+        self.assertEqual(get_or_compute('k', compute, 60), 'fresh')
+        self.assertEqual(get_or_compute('k', compute, 60), 'fresh')
+        self.assertEqual(compute.calls, 1)
+
+        # Another process has an empty LRU but shares the Django cache
+        local_cache.clear()
+        self.assertEqual(get_or_compute('k', compute, 60), 'fresh')
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(local_cache.get('k'), 'fresh')
+
+    def test_bumping_the_generation_invalidates_a_users_responses(self):
+        user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+        compute = CountingCompute()
+
+        def get():
+            request = RequestFactory().get('/api/integrations/events/?page=1')
+            request.user = user
+            return cached_response(request, 'events', compute)
+
+        get()
+        get()
+        self.assertEqual(compute.calls, 1)
+
+        bump_data_version(user.id)
+        get()
+        self.assertEqual(compute.calls, 2)
+
+    def test_xfetch_refreshes_before_expiry(self):
+        compute = CountingCompute()
+        cache.set('k', ('stale', time.time() + 10, 1.0), 60)
+
+        # A roll near zero keeps serving the value until it expires
+        with mock.patch.object(response_cache.random, 'random', return_value=0.0):
+            self.assertEqual(get_or_compute('k', compute, 60), 'stale')
+        self.assertEqual(compute.calls, 0)
+
+        # A roll near one stretches the deadline past the 10 seconds left
+        local_cache.clear()
+        with mock.patch.object(response_cache.random, 'random', return_value=0.999999):
+            self.assertEqual(get_or_compute('k', compute, 60), 'fresh')
+        self.assertEqual(compute.calls, 1)
+
+    def test_stale_value_is_served_while_another_request_refreshes(self):
+        compute = CountingCompute()
+        cache.set('k', ('stale', time.time() - 1, 1.0), 60)
+        cache.add('k:lock', 1, 30)
+        self.assertEqual(get_or_compute('k', compute, 60), 'stale')
+        self.assertEqual(compute.calls, 0)
+
+    def test_concurrent_misses_compute_once(self):
+        compute = CountingCompute(delay=0.2)
+        results = []
+
+        def worker():
+            results.append(get_or_compute('k', compute, 60))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['fresh'] * 5)
+        self.assertEqual(compute.calls, 1)
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'webhook-tests',
+        }
+    },
+    GMAIL_PUSH_VERIFICATION_TOKEN='pubsub-secret',
+    PUSH_SYNC_DEBOUNCE_SECONDS=30,
+    WEBHOOK_BATCH_DELAY_SECONDS=2,
+)
+class WebhookReceiverTests(TestCase):
+    """Push receivers verify the sender, then debounce one sync per integration"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+
+        push_sync = mock.patch('apps.integrations.tasks.run_push_sync.apply_async')
+        inbox = mock.patch('apps.integrations.tasks.process_webhook_inbox.apply_async')
+        self.push_sync = push_sync.start()
+        self.inbox = inbox.start()
+        self.addCleanup(push_sync.stop)
+        self.addCleanup(inbox.stop)
+
+    def integration(self, provider, **fields):
+        return Integration.objects.create(user=self.user, provider=provider, status='connected', **fields)
+
+    def post_calendar(self, channel, token=None, state='exists'):
+        return self.client.post(
+            '/api/integrations/webhooks/google/calendar/',
+            HTTP_X_GOOG_CHANNEL_ID=channel.channel_id,
+            HTTP_X_GOOG_CHANNEL_TOKEN=channel.token if token is None else token,
+            HTTP_X_GOOG_RESOURCE_ID=channel.resource_id,
+            HTTP_X_GOOG_RESOURCE_STATE=state,
+        )
+
+    def test_google_calendar_notifications(self):
+        integration = self.integration('google_calendar')
+        channel = WatchChannel.objects.create(
+            integration=integration, resource_type='calendar', calendar_id='primary',
+            channel_id='channel-1', resource_id='resource-1',
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+
+        self.assertEqual(self.post_calendar(channel, token='forged').status_code, 403)
+        self.assertEqual(self.post_calendar(channel, state='sync').status_code, 204)
+        self.push_sync.assert_not_called()
+
+        # A burst of changes schedules a single sync after the debounce window
+        for _ in range(3):
+            self.assertEqual(self.post_calendar(channel).status_code, 204)
+        self.push_sync.assert_called_once_with(args=[integration.id, 'calendar', 'primary'], countdown=30)
+
+    def post_gmail(self, email_address, token='pubsub-secret'):
+        data = base64.b64encode(json.dumps({'emailAddress': email_address, 'historyId': '42'}).encode())
+        return self.client.post(
+            f'/api/integrations/webhooks/google/gmail/?token={token}',
+            {'message': {'data': data.decode(), 'messageId': '1'}, 'subscription': 'projects/p/subscriptions/s'},
+            format='json',
+        )
+
+    def test_gmail_pubsub_notifications(self):
+        integration = self.integration('google_gmail', provider_email='ana@example.com')
+
+        self.assertEqual(self.post_gmail('ana@example.com', token='forged').status_code, 403)
+        self.push_sync.assert_not_called()
+
+        self.assertEqual(self.post_gmail('Ana@Example.com').status_code, 204)
+        self.assertEqual(self.post_gmail('ana@example.com').status_code, 204)
+        self.push_sync.assert_called_once_with(args=[integration.id, 'gmail', ''], countdown=30)
+
+    def post_graph(self, subscription, client_state, resource_id='event-1', etag='W/"1"'):
+        return self.client.post('/api/integrations/webhooks/microsoft/', {'value': [{
+            'subscriptionId': subscription.subscription_id,
+            'clientState': client_state,
+            'changeType': 'updated',
+            'resource': f'me/events/{resource_id}',
+            'resourceData': {'id': resource_id, '@odata.etag': etag},
+        }]}, format='json')
+
+    def test_microsoft_graph_notifications(self):
+        integration = self.integration('microsoft_calendar')
+        subscription = WebhookSubscription.objects.create(
+            integration=integration, subscription_id='sub-1', resource='me/events'
+        )
+
+        response = self.client.post('/api/integrations/webhooks/microsoft/?validationToken=abc')
+        self.assertEqual(response.content, b'abc')
+
+        self.assertEqual(self.post_graph(subscription, 'forged').status_code, 403)
+        self.assertFalse(WebhookDelivery.objects.exists())
+        self.inbox.assert_not_called()
+
+        self.assertEqual(self.post_graph(subscription, subscription.secret).status_code, 202)
+        self.assertEqual(self.post_graph(subscription, subscription.secret).status_code, 202)
+        self.assertEqual(self.post_graph(subscription, subscription.secret, etag='W/"2"').status_code, 202)
+        # The redelivery is dropped, the new edit is kept, and one run applies both
+        self.assertEqual(WebhookDelivery.objects.filter(integration=integration).count(), 2)
+        self.inbox.assert_called_once_with(args=[integration.id], countdown=2)
+
+
+class SlackManualSyncTests(TestCase):
+
+    def test_sync_is_dispatched_to_a_worker(self):
+        user = User.objects.create_user(email='ana@example.com', username='ana', password='pw-12345678')
+        integration = Integration.objects.create(user=user, provider='slack', status='connected')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with mock.patch('apps.integrations.views.sync_slack_messages.delay') as delay:
+            response = client.post(f'/api/integrations/{integration.id}/sync/', {'sync_type': 'full'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        delay.assert_called_once_with(integration.id)
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'slack-delivery-tests',
+        }
+    },
+    SLACK_NOTIFY_COALESCE_SECONDS=5,
+)
+class SlackDeliveryScheduleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        deliver = mock.patch('apps.integrations.tasks.deliver_slack_notifications.apply_async')
+        self.deliver = deliver.start()
+        self.addCleanup(deliver.stop)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_worker_delivery_waits_out_the_coalescing_window(self):
+        self.assertTrue(schedule_slack_delivery(1, 'C1'))
+        self.assertFalse(schedule_slack_delivery(1, 'C1'))
+        self.deliver.assert_called_once_with(args=[1, 'C1'], countdown=5)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_eager_delivery_does_not_wait(self):
+        schedule_slack_delivery(1, 'C1', delay=60)
+        self.deliver.assert_called_once_with(args=[1, 'C1'], countdown=0)
@@ -0,0 +1,80 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+from django.db.models import Q
+
+# Each source is read newest first on its own indexed timestamp; the rank
+# breaks ties between sources so the merged order is total and stable
+TIMELINE_SOURCES = {
+    'event': ('start_time', 0),
+    'email': ('received_at', 1),
+    'sync': ('started_at', 2),
+}
+
+
+def encode_cursor(timestamp, rank, pk):
+    """Encode a position in the timeline as an opaque cursor"""
+    payload = json.dumps([timestamp.isoformat(), rank, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into ``(timestamp, rank, id)``; raises ValueError when malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, rank, pk = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(rank), int(pk)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+def _after_cursor(queryset, time_field, rank, cursor):
+    """Keep rows that sort strictly after ``cursor`` in newest-first order"""
+    timestamp, cursor_rank, pk = cursor
+    if rank < cursor_rank:
+        return queryset.filter(**{f'{time_field}__lte': timestamp})
+    if rank > cursor_rank:
+        return queryset.filter(**{f'{time_field}__lt': timestamp})
+    return queryset.filter(
+        Q(**{f'{time_field}__lt': timestamp}) | Q(**{time_field: timestamp, 'id__lt': pk})
+    )
+
+
+def _iter_source(kind, queryset, cursor, chunk_size):
+    """Yield ``(timestamp, rank, id, kind, obj)`` newest first, one keyset page at a time"""
+    time_field, rank = TIMELINE_SOURCES[kind]
+    while True:
+        page_queryset = _after_cursor(queryset, time_field, rank, cursor) if cursor else queryset
+        page = list(page_queryset.order_by(f'-{time_field}', '-id')[:chunk_size])
+        for obj in page:
+            yield getattr(obj, time_field), rank, obj.id, kind, obj
+        if len(page) < chunk_size:
+            return
+        last = page[-1]
+        cursor = (getattr(last, time_field), rank, last.id)
+
+
+def merge_timeline(sources, cursor=None, limit=50):
+    """
+    K-way merge independently paginated querysets into one newest-first page.
+
+    ``sources`` maps a kind from TIMELINE_SOURCES to its queryset. Every source
+    is read lazily in keyset pages of ``limit + 1`` rows, so at most that many
+    rows per source are held in memory regardless of table size. Returns the
+    page entries and the cursor of the next page (or None).
+    """
+    position = decode_cursor(cursor) if cursor else None
+    streams = [
+        _iter_source(kind, queryset, position, limit + 1)
+        for kind, queryset in sources.items()
+    ]
+    merged = heapq.merge(*streams, key=lambda entry: entry[:3], reverse=True)
+    entries = list(islice(merged, limit + 1))
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(*entries[-1][:3])
+    return entries, next_cursor
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, webhooks
 
 app_name = 'integrations'
 
@@ -13,6 +13,12 @@ urlpatterns = [
     path('oauth/initiate/', views.initiate_oauth, name='initiate-oauth'),
     path('oauth/callback/', views.oauth_callback, name='oauth-callback'),
     
+    # Provider push notifications
+    path('webhooks/google/calendar/', webhooks.google_calendar_webhook, name='google-calendar-webhook'),
+    path('webhooks/google/gmail/', webhooks.gmail_push_webhook, name='gmail-push-webhook'),
+    path('webhooks/microsoft/', webhooks.microsoft_graph_webhook, name='microsoft-graph-webhook'),
+    path('webhooks/calendly/', webhooks.calendly_webhook, name='calendly-webhook'),
+    
     # Integration actions
     path('<int:integration_id>/disconnect/', views.disconnect_integration, name='disconnect-integration'),
     path('<int:integration_id>/delete/', views.delete_integration, name='delete-integration'),
@@ -20,14 +26,37 @@ urlpatterns = [
     
     # Calendar events
     path('events/', views.CalendarEventListView.as_view(), name='calendar-event-list'),
+    path('events/freebusy/', views.calendar_freebusy, name='calendar-freebusy'),
+    path('events/find-slots/', views.find_meeting_slots_view, name='calendar-find-slots'),
+    path('events/export/', views.calendar_event_export, name='calendar-event-export'),
     path('events/<int:pk>/', views.CalendarEventDetailView.as_view(), name='calendar-event-detail'),
     
+    # Calendar feed subscriptions
+    path('calendar-shares/', views.calendar_shares, name='calendar-shares'),
+    path('calendar-shares/<int:share_id>/', views.revoke_calendar_share, name='revoke-calendar-share'),
+    path('calendar-feeds/', views.calendar_feed_tokens, name='calendar-feed-tokens'),
+    path('calendar-feeds/<int:token_id>/', views.revoke_calendar_feed_token, name='revoke-calendar-feed-token'),
+    path('calendar-feeds/<str:token>.ics', views.calendar_feed, name='calendar-feed'),
+    
     # Email messages
     path('emails/', views.EmailMessageListView.as_view(), name='email-message-list'),
+    path('emails/export/', views.email_message_export, name='email-message-export'),
     path('emails/<int:pk>/', views.EmailMessageDetailView.as_view(), name='email-message-detail'),
+    path('emails/<int:message_id>/attachments/<int:attachment_id>/download/', views.email_attachment_download, name='email-attachment-download'),
+    
+    # Slack channels, messages and notifications
+    path('slack/channels/', views.SlackChannelListView.as_view(), name='slack-channel-list'),
+    path('slack/channels/<int:channel_id>/messages/', views.SlackMessageListView.as_view(), name='slack-message-list'),
+    path('slack/notifications/settings/', views.slack_notification_settings, name='slack-notification-settings'),
+    path('slack/notifications/test/', views.slack_test_notification, name='slack-test-notification'),
+    path('slack/notifications/stats/', views.slack_notification_stats, name='slack-notification-stats'),
     
     # Sync logs
     path('sync-logs/', views.SyncLogListView.as_view(), name='sync-log-list'),
+    path('sync-logs/metrics/', views.sync_metrics_summary, name='sync-metrics-summary'),
+    
+    # Activity timeline
+    path('timeline/', views.activity_timeline, name='activity-timeline'),
     
     # GitHub Repository Management
     path('github/repositories/', views.github_repositories, name='github-repositories'),
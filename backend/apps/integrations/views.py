@@ -4,17 +4,46 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework import permissions, status
 from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from django.utils.decorators import method_decorator
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, quote_etag
 from django.db.models import Q, Count
 from django.utils import timezone
 from django.conf import settings
 from datetime import datetime, timedelta
+import hashlib
+import os
+from itertools import chain
 import logging
 
-from .models import Integration, CalendarEvent, EmailMessage, SyncLog
+from .models import (
+    Integration, CalendarEvent, EmailMessage, EmailAttachment, SyncLog, CalendarFeedToken, CalendarShare, SlackChannel,
+    SlackMessage, SlackNotification
+)
+from .conditional import bump_data_version, conditional_get, request_data_version
+from .response_cache import cached_response
+from .attachment_cache import get_attachment_cache, iter_file_mmap
+from .freebusy import get_freebusy
+from .scheduling import find_meeting_slots
+from .recurrence import MergedEventList, expand_masters
+from .dedupe import exclude_duplicate_events
+from .timeline import TIMELINE_SOURCES, merge_timeline
+from .feed import feed_window_start, get_feed
+from .export import EMAIL_EXPORT_FIELDS, EVENT_EXPORT_FIELDS, EXPORT_CONTENT_TYPES, stream_export
 from .serializers import (
     IntegrationSerializer, CalendarEventSerializer, CalendarEventListSerializer,
     EmailMessageSerializer, EmailMessageListSerializer, SyncLogSerializer,
-    IntegrationStatsSerializer, OAuthCallbackSerializer, ManualSyncSerializer
+    IntegrationStatsSerializer, OAuthCallbackSerializer, ManualSyncSerializer,
+    MeetingSlotSearchSerializer, CalendarFeedTokenSerializer, CalendarShareSerializer, SlackChannelSerializer, SlackMessageSerializer,
+    SlackNotificationSettingsSerializer
+)
+from .notifications import delivery_stats, notification_settings
+from .sync_metrics import summarize
+from .tasks import (
+    GOOGLE_PUSH_PROVIDERS, WEBHOOK_PROVIDERS, delete_webhook_subscriptions, enqueue_slack_notification,
+    setup_watch_channels, setup_webhook_subscriptions, stop_watch_channels, sync_slack_messages
 )
 from .services import GoogleOAuthService, MicrosoftOAuthService, GitHubOAuthService, SlackOAuthService, CalendlyOAuthService, get_oauth_service
 
@@ -27,45 +56,61 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class CachedListMixin:
+    """Serve list pages from the per-user response cache"""
+    cache_scope = None
+    
+    def list(self, request, *args, **kwargs):
+        def compute():
+            return super(CachedListMixin, self).list(request, *args, **kwargs).data
+        return Response(cached_response(request, self.cache_scope, compute))
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@conditional_get()
 def integration_list(request):
     """List user's integrations"""
-    integrations = Integration.objects.filter(user=request.user)
-    serializer = IntegrationSerializer(integrations, many=True)
-    return Response(serializer.data)
+    def compute():
+        integrations = Integration.objects.filter(user=request.user)
+        return IntegrationSerializer(integrations, many=True).data
+    
+    return Response(cached_response(request, 'integrations', compute))
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@conditional_get()
 def integration_stats(request):
     """Get integration statistics for the user"""
-    user_integrations = Integration.objects.filter(user=request.user)
-    
-    stats = {
-        'total_integrations': user_integrations.count(),
-        'connected_integrations': user_integrations.filter(status='connected').count(),
-        'total_events': CalendarEvent.objects.filter(integration__user=request.user).count(),
-        'total_emails': EmailMessage.objects.filter(integration__user=request.user).count(),
-        'last_sync': user_integrations.filter(last_sync__isnull=False).order_by('-last_sync').first(),
-        'providers': {}
-    }
-    
-    # Get provider breakdown
-    provider_stats = user_integrations.values('provider').annotate(count=Count('id'))
-    for provider_stat in provider_stats:
-        provider = provider_stat['provider']
-        stats['providers'][provider] = {
-            'count': provider_stat['count'],
-            'connected': user_integrations.filter(provider=provider, status='connected').count()
+    def compute():
+        user_integrations = Integration.objects.filter(user=request.user)
+        
+        stats = {
+            'total_integrations': user_integrations.count(),
+            'connected_integrations': user_integrations.filter(status='connected').count(),
+            'total_events': CalendarEvent.objects.filter(integration__user=request.user).count(),
+            'total_emails': EmailMessage.objects.filter(integration__user=request.user).count(),
+            'last_sync': user_integrations.filter(last_sync__isnull=False).order_by('-last_sync').first(),
+            'providers': {}
         }
+        
+        # Get provider breakdown
+        provider_stats = user_integrations.values('provider').annotate(count=Count('id'))
+        for provider_stat in provider_stats:
+            provider = provider_stat['provider']
+            stats['providers'][provider] = {
+                'count': provider_stat['count'],
+                'connected': user_integrations.filter(provider=provider, status='connected').count()
+            }
+        
+        # Get last sync time
+        last_sync_integration = user_integrations.filter(last_sync__isnull=False).order_by('-last_sync').first()
+        stats['last_sync'] = last_sync_integration.last_sync if last_sync_integration else None
+        
+        return IntegrationStatsSerializer(stats).data
     
-    # Get last sync time
-    last_sync_integration = user_integrations.filter(last_sync__isnull=False).order_by('-last_sync').first()
-    stats['last_sync'] = last_sync_integration.last_sync if last_sync_integration else None
-    
-    serializer = IntegrationStatsSerializer(stats)
-    return Response(serializer.data)
+    return Response(cached_response(request, 'integration-stats', compute))
 
 
 @api_view(['GET'])
@@ -131,7 +176,7 @@ def available_providers(request):
         }
     ]
     
-    return Response(providers)
+    return Response(cached_response(request, 'providers', lambda: providers, timeout=3600, per_user=False))
 
 
 @api_view(['POST'])
@@ -257,6 +302,13 @@ def oauth_callback(request):
         integration.status = 'connected'
         integration.sync_enabled = True
         
+        if provider == 'slack':
+            # The bot token cannot tell who installed the app; direct messages go to that user
+            integration.sync_state.update({
+                'slack_team_id': token_data.get('team_id'),
+                'slack_user_id': token_data.get('authed_user_id'),
+            })
+        
         # Get user info from provider
         oauth_service = get_oauth_service(integration)
         if hasattr(oauth_service, 'get_user_info'):
@@ -276,6 +328,16 @@ def oauth_callback(request):
         except Exception as sync_error:
             logger.warning(f"Initial sync failed for {integration}: {sync_error}")
         
+        # Slack syncs page through every channel's history, so they run on a worker
+        if provider == 'slack':
+            sync_slack_messages.delay(integration.id)
+        
+        # Switch to change-driven syncs where the provider pushes notifications
+        if provider in GOOGLE_PUSH_PROVIDERS:
+            setup_watch_channels.delay(integration.id)
+        elif provider in WEBHOOK_PROVIDERS:
+            setup_webhook_subscriptions.delay(integration.id)
+        
         # Return JSON response for API calls, redirect for browser requests
         if request.content_type == 'application/json' or 'application/json' in request.META.get('HTTP_ACCEPT', ''):
             # API request - return JSON response
@@ -311,6 +373,8 @@ def oauth_callback(request):
 def disconnect_integration(request, integration_id):
     """Disconnect an integration"""
     integration = get_object_or_404(Integration, id=integration_id, user=request.user)
+    stop_watch_channels(integration)
+    delete_webhook_subscriptions(integration)
     
     # Update status to disconnected
     integration.status = 'disconnected'
@@ -333,6 +397,8 @@ def delete_integration(request, integration_id):
         sync_logs_count = integration.sync_logs.count()
         
         provider_name = integration.get_provider_display()
+        stop_watch_channels(integration)
+        delete_webhook_subscriptions(integration)
         
         # Delete the integration (CASCADE will handle related data)
         integration.delete()
@@ -374,6 +440,11 @@ def manual_sync(request, integration_id):
     
     sync_type = serializer.validated_data['sync_type']
     
+    # Slack syncs page through every channel's history, so they run on a worker
+    if sync_type in ['messages', 'full'] and integration.provider == 'slack':
+        sync_slack_messages.delay(integration.id)
+        return Response({'message': 'Sync started'}, status=status.HTTP_202_ACCEPTED)
+    
     try:
         oauth_service = get_oauth_service(integration)
         
@@ -393,38 +464,30 @@ def manual_sync(request, integration_id):
         return Response({'error': 'Sync failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class CalendarEventListView(generics.ListAPIView):
+def _event_list_validator(request):
+    """Recurring expansion defaults to a window around today, so the date is part of the version"""
+    generation, updated_at = request_data_version(request)
+    return f'{generation}:{timezone.now().date().isoformat()}', updated_at
+
+
+@method_decorator(conditional_get(_event_list_validator), name='get')
+class CalendarEventListView(CachedListMixin, generics.ListAPIView):
     """List calendar events for the user"""
+    cache_scope = 'events'
     serializer_class = CalendarEventListSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
     
     def get_queryset(self):
-        queryset = CalendarEvent.objects.filter(integration__user=self.request.user)
+        queryset = CalendarEvent.objects.filter(
+            integration__user=self.request.user
+        ).select_related('integration')
         
         # Filter by provider
         provider = self.request.query_params.get('provider')
         if provider:
             queryset = queryset.filter(integration__provider=provider)
         
-        # Filter by date range
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
-        
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                queryset = queryset.filter(start_time__gte=start_dt)
-            except ValueError:
-                pass
-        
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                queryset = queryset.filter(end_time__lte=end_dt)
-            except ValueError:
-                pass
-        
         # Search in title and description
         search = self.request.query_params.get('search')
         if search:
@@ -432,7 +495,169 @@ class CalendarEventListView(generics.ListAPIView):
                 Q(title__icontains=search) | Q(description__icontains=search)
             )
         
-        return queryset.order_by('start_time')
+        # Collapse the same meeting synced through several providers
+        if self.request.query_params.get('dedupe', '').lower() in ('1', 'true', 'yes'):
+            queryset = exclude_duplicate_events(queryset)
+        
+        # Recurring masters are expanded below; cancelled occurrences are hidden
+        masters = queryset.filter(is_recurring=True)
+        queryset = queryset.filter(is_recurring=False).exclude(
+            recurring_event_id__isnull=False, event_status='cancelled'
+        )
+        
+        # Filter by date range
+        start_dt = self._date_param('start_date')
+        end_dt = self._date_param('end_date')
+        if start_dt:
+            queryset = queryset.filter(start_time__gte=start_dt)
+        if end_dt:
+            queryset = queryset.filter(end_time__lte=end_dt)
+        queryset = queryset.order_by('start_time', 'id')
+        
+        if not masters.exists():
+            return queryset
+        
+        # Expand recurring masters for the requested range only. The default
+        # window starts at midnight so that repeated requests share the
+        # memoized expansion.
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        range_start = start_dt or today - timedelta(days=30)
+        range_end = end_dt or range_start + timedelta(days=90)
+        occurrences = [
+            occurrence
+            for occurrence in expand_masters(masters.filter(start_time__lt=range_end), range_start, range_end)
+            if occurrence.start_time >= range_start and occurrence.end_time <= range_end
+        ]
+        return MergedEventList(queryset, occurrences)
+    
+    def _date_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return _parse_datetime_param(value)
+        except ValueError:
+            return None
+
+
+def _parse_datetime_param(value):
+    """Parse an ISO 8601 query parameter into an aware datetime"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone.utc)
+    return dt
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def calendar_freebusy(request):
+    """Get merged busy intervals and conflicts across all calendar integrations"""
+    try:
+        start_param = request.query_params.get('start')
+        end_param = request.query_params.get('end')
+        # Default to the current minute so repeated default requests share a cache key
+        range_start = (
+            _parse_datetime_param(start_param) if start_param
+            else timezone.now().replace(second=0, microsecond=0)
+        )
+        range_end = _parse_datetime_param(end_param) if end_param else range_start + timedelta(days=7)
+    except ValueError:
+        return Response({'error': 'Invalid start or end datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if range_end <= range_start:
+        return Response({'error': 'End must be after start'}, status=status.HTTP_400_BAD_REQUEST)
+    if range_end - range_start > timedelta(days=366):
+        return Response({'error': 'Range cannot exceed 366 days'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    include_all_day = request.query_params.get('include_all_day', 'false').lower() == 'true'
+    
+    return Response(get_freebusy(request.user, range_start, range_end, include_all_day))
+
+
+def _visible_calendar_owners(user):
+    """Users whose busy time ``user`` may see: themselves and anyone who shared with their verified email"""
+    owners = {user.id}
+    if user.is_email_verified:
+        owners.update(CalendarShare.objects.filter(email=user.email.lower()).values_list('owner_id', flat=True))
+    return owners
+
+
+def _resolve_attendees(requester, attendees):
+    """
+    Map attendees (user ids or emails) to calendars the requester may see.
+
+    Only the requester's own calendar and calendars shared with them are
+    looked up. Every other attendee is external, whether or not an account
+    exists for it, so the result reveals nothing about other accounts.
+    """
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+    
+    visible = _visible_calendar_owners(requester)
+    user_ids = {}
+    emails = {}
+    for attendee in attendees:
+        attendee = attendee.strip()
+        if attendee.isdigit():
+            user_ids[attendee] = int(attendee)
+        elif attendee:
+            emails[attendee.lower()] = attendee
+    
+    resolved = {attendee: user_id for attendee, user_id in user_ids.items() if user_id in visible}
+    
+    if emails:
+        for user_id, email in User.objects.filter(id__in=visible).values_list('id', 'email'):
+            if email.lower() in emails:
+                resolved[emails[email.lower()]] = user_id
+        provider_emails = Integration.objects.filter(user_id__in=visible).exclude(provider_email__isnull=True)
+        for user_id, email in provider_emails.values_list('user_id', 'provider_email'):
+            if email and email.lower() in emails:
+                resolved.setdefault(emails[email.lower()], user_id)
+    
+    external = [
+        attendee for attendee in chain(user_ids, emails.values()) if attendee not in resolved
+    ]
+    return resolved, external
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def find_meeting_slots_view(request):
+    """
+    Find meeting slots where all attendees are free within working hours.
+    
+    Busy time comes from the requester's calendars and from calendars shared
+    with them; any other attendee only constrains the search by working hours.
+    """
+    serializer = MeetingSlotSearchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    resolved, external = _resolve_attendees(request.user, data['attendees'])
+    user_ids = set(resolved.values())
+    if data['include_self']:
+        user_ids.add(request.user.id)
+    
+    slots = find_meeting_slots(
+        sorted(user_ids),
+        data['start'],
+        data['end'],
+        data['duration_minutes'],
+        granularity=data['granularity_minutes'],
+        default_timezone=data['timezone'],
+        attendee_timezones=data['attendee_timezones'].values(),
+        work_start=data['work_start'],
+        work_end=data['work_end'],
+        work_days=set(data['work_days']),
+        limit=data['limit'],
+    )
+    
+    return Response({
+        'slots': slots,
+        'attendees_resolved': len(user_ids),
+        'external_attendees': external,
+    })
 
 
 class CalendarEventDetailView(generics.RetrieveAPIView):
@@ -444,8 +669,10 @@ class CalendarEventDetailView(generics.RetrieveAPIView):
         return CalendarEvent.objects.filter(integration__user=self.request.user)
 
 
-class EmailMessageListView(generics.ListAPIView):
+@method_decorator(conditional_get(), name='get')
+class EmailMessageListView(CachedListMixin, generics.ListAPIView):
     """List email messages for the user"""
+    cache_scope = 'emails'
     serializer_class = EmailMessageListSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
@@ -468,11 +695,12 @@ class EmailMessageListView(generics.ListAPIView):
         if is_important is not None:
             queryset = queryset.filter(is_important=is_important.lower() == 'true')
         
-        # Search in subject and sender
+        # Search in subject, sender and the precomputed snippet
         search = self.request.query_params.get('search')
         if search:
             queryset = queryset.filter(
-                Q(subject__icontains=search) | Q(sender__icontains=search)
+                Q(subject__icontains=search) | Q(sender__icontains=search) |
+                Q(snippet__icontains=search)
             )
         
         return queryset.order_by('-received_at')
@@ -484,11 +712,119 @@ class EmailMessageDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return EmailMessage.objects.filter(integration__user=self.request.user)
+        # Bodies live in their own table and are only loaded here
+        return EmailMessage.objects.filter(
+            integration__user=self.request.user
+        ).select_related('integration', 'body').prefetch_related('attachments')
 
 
-class SyncLogListView(generics.ListAPIView):
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def email_attachment_download(request, message_id, attachment_id):
+    """Download an email attachment, fetching it from the provider on first access"""
+    attachment = get_object_or_404(
+        EmailAttachment.objects.select_related('message__integration'),
+        id=attachment_id,
+        message_id=message_id,
+        message__integration__user=request.user
+    )
+    
+    cache = get_attachment_cache()
+    cached_file = cache.open(attachment.content_sha256)
+    content = None
+    
+    if cached_file is None:
+        message = attachment.message
+        if not attachment.provider_attachment_id:
+            return Response({'error': 'Attachment is not downloadable'}, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            oauth_service = get_oauth_service(message.integration)
+            content = oauth_service.get_attachment_content(
+                message.provider_message_id, attachment.provider_attachment_id
+            )
+        except Exception as e:
+            logger.error(f"Attachment download failed for {attachment.id}: {e}")
+            return Response({'error': 'Failed to download attachment'}, status=status.HTTP_502_BAD_GATEWAY)
+        
+        attachment.content_sha256 = cache.put(content)
+        attachment.save(update_fields=['content_sha256'])
+        # Eviction can remove the new file before it is opened; the bytes are still in hand
+        cached_file = cache.open(attachment.content_sha256)
+    
+    if cached_file is not None:
+        size = os.fstat(cached_file.fileno()).st_size
+        response = StreamingHttpResponse(iter_file_mmap(cached_file), content_type=attachment.mime_type)
+    else:
+        size = len(content)
+        response = StreamingHttpResponse([content], content_type=attachment.mime_type)
+    response['Content-Length'] = str(size)
+    response['Content-Disposition'] = content_disposition_header(
+        as_attachment=not attachment.is_inline, filename=attachment.filename or 'attachment'
+    )
+    response['ETag'] = f'"{attachment.content_sha256}"'
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
+
+def _export_response(request, queryset, fields, kind, time_field, formats):
+    """Stream a filtered export of the user's rows in the requested format"""
+    export_format = request.query_params.get('export_format', 'ndjson').lower()
+    if export_format not in formats:
+        return Response(
+            {'error': f"Invalid export_format. Choose from {', '.join(formats)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    provider = request.query_params.get('provider')
+    if provider:
+        queryset = queryset.filter(integration__provider=provider)
+    
+    try:
+        start_param = request.query_params.get('start_date')
+        end_param = request.query_params.get('end_date')
+        if start_param:
+            queryset = queryset.filter(**{f'{time_field}__gte': _parse_datetime_param(start_param)})
+        if end_param:
+            queryset = queryset.filter(**{f'{time_field}__lt': _parse_datetime_param(end_param)})
+    except ValueError:
+        return Response({'error': 'Invalid start_date or end_date'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(
+        stream_export(queryset, fields, export_format, name=f'Integrato {kind}'),
+        content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    filename = f"{kind}-{timezone.now().strftime('%Y%m%d')}.{export_format}"
+    response['Content-Disposition'] = content_disposition_header(as_attachment=True, filename=filename)
+    response['Cache-Control'] = 'private, no-store'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def calendar_event_export(request):
+    """Stream all of the user's calendar events as NDJSON, CSV or iCalendar"""
+    queryset = CalendarEvent.objects.filter(integration__user=request.user)
+    return _export_response(
+        request, queryset, EVENT_EXPORT_FIELDS, 'events', 'start_time', ('ndjson', 'csv', 'ics')
+    )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def email_message_export(request):
+    """Stream all of the user's email messages as NDJSON or CSV"""
+    queryset = EmailMessage.objects.filter(integration__user=request.user)
+    return _export_response(
+        request, queryset, EMAIL_EXPORT_FIELDS, 'emails', 'received_at', ('ndjson', 'csv')
+    )
+
+
+@method_decorator(conditional_get(), name='get')
+class SyncLogListView(CachedListMixin, generics.ListAPIView):
     """List sync logs for the user"""
+    cache_scope = 'sync-logs'
     serializer_class = SyncLogSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
@@ -514,6 +850,264 @@ class SyncLogListView(generics.ListAPIView):
         return queryset.order_by('-started_at')
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def sync_metrics_summary(request):
+    """Percentiles of sync duration, phase timings and upstream usage per provider"""
+    try:
+        days = min(max(int(request.query_params.get('days', settings.SYNC_METRICS_WINDOW_DAYS)), 1), 90)
+    except ValueError:
+        return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    queryset = SyncLog.objects.filter(
+        integration__user=request.user,
+        started_at__gte=timezone.now() - timedelta(days=days)
+    )
+    sync_type = request.query_params.get('sync_type')
+    if sync_type:
+        queryset = queryset.filter(sync_type=sync_type)
+    
+    return Response({'window_days': days, 'providers': summarize(queryset)})
+
+
+TIMELINE_SERIALIZERS = {
+    'event': CalendarEventListSerializer,
+    'email': EmailMessageListSerializer,
+    'sync': SyncLogSerializer,
+}
+
+
+@method_decorator(conditional_get(), name='get')
+class SlackChannelListView(CachedListMixin, generics.ListAPIView):
+    """List synced Slack channels for the user"""
+    cache_scope = 'slack-channels'
+    serializer_class = SlackChannelSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+    
+    def get_queryset(self):
+        queryset = SlackChannel.objects.filter(integration__user=self.request.user)
+        
+        # Only channels whose messages are synced
+        if self.request.query_params.get('member') == 'true':
+            queryset = queryset.filter(is_member=True)
+        
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(name__icontains=search)
+        
+        return queryset.order_by('name')
+
+
+@method_decorator(conditional_get(), name='get')
+class SlackMessageListView(CachedListMixin, generics.ListAPIView):
+    """List synced messages of one Slack channel"""
+    cache_scope = 'slack-messages'
+    serializer_class = SlackMessageSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+    
+    def get_queryset(self):
+        channel = get_object_or_404(
+            SlackChannel, id=self.kwargs['channel_id'], integration__user=self.request.user
+        )
+        queryset = SlackMessage.objects.filter(channel=channel).select_related('channel')
+        
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(text__icontains=search)
+        
+        return queryset.order_by('-sent_at', '-id')
+
+
+@api_view(['GET', 'PUT'])
+@permission_classes([permissions.IsAuthenticated])
+def slack_notification_settings(request):
+    """Read or update where and when Slack notifications are sent"""
+    integration = get_object_or_404(Integration, user=request.user, provider='slack')
+    
+    if request.method == 'PUT':
+        serializer = SlackNotificationSettingsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        preferences = dict(serializer.validated_data, events=sorted(serializer.validated_data['events']))
+        integration.sync_state['notifications'] = preferences
+        integration.save(update_fields=['sync_state', 'updated_at'])
+    
+    return Response(notification_settings(integration))
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def slack_test_notification(request):
+    """Queue a test message to the configured Slack destination"""
+    integration = get_object_or_404(Integration, user=request.user, provider='slack', status='connected')
+    notification = enqueue_slack_notification(
+        integration, 'Test notification from Integrato', event_type='test'
+    )
+    if notification is None:
+        return Response({'error': 'No Slack channel configured'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'id': notification.id, 'channel': notification.channel}, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def slack_notification_stats(request):
+    """Queue depth and delivery latency of the user's recent Slack notifications"""
+    return Response(delivery_stats(SlackNotification.objects.filter(integration__user=request.user)))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get()
+def activity_timeline(request):
+    """Get calendar events, emails and sync logs merged into one newest-first feed"""
+    types_param = request.query_params.get('types')
+    kinds = [kind.strip() for kind in types_param.split(',')] if types_param else list(TIMELINE_SOURCES)
+    unknown = [kind for kind in kinds if kind not in TIMELINE_SOURCES]
+    if unknown or not kinds:
+        return Response(
+            {'error': f"Invalid types: {', '.join(unknown)}. Choose from {', '.join(TIMELINE_SOURCES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    provider = request.query_params.get('provider')
+    provider_filter = {'integration__provider': provider} if provider else {}
+    
+    querysets = {
+        'event': CalendarEvent.objects.filter(
+            integration__user=request.user, **provider_filter
+        ).exclude(
+            recurring_event_id__isnull=False, event_status='cancelled'
+        ).select_related('integration'),
+        'email': EmailMessage.objects.filter(
+            integration__user=request.user, **provider_filter
+        ).select_related('integration'),
+        'sync': SyncLog.objects.filter(
+            integration__user=request.user, **provider_filter
+        ).select_related('integration'),
+    }
+    if request.query_params.get('dedupe', '').lower() in ('1', 'true', 'yes'):
+        querysets['event'] = exclude_duplicate_events(querysets['event'])
+    
+    try:
+        entries, next_cursor = merge_timeline(
+            {kind: querysets[kind] for kind in kinds},
+            cursor=request.query_params.get('cursor'),
+            limit=limit,
+        )
+    except ValueError:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'results': [
+            {
+                'type': kind,
+                'timestamp': timestamp,
+                'item': TIMELINE_SERIALIZERS[kind](obj).data,
+            }
+            for timestamp, _, _, kind, obj in entries
+        ],
+        'next_cursor': next_cursor,
+    })
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def calendar_feed_tokens(request):
+    """List or create calendar feed subscription tokens"""
+    if request.method == 'POST':
+        serializer = CalendarFeedTokenSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    tokens = CalendarFeedToken.objects.filter(user=request.user, is_active=True)
+    serializer = CalendarFeedTokenSerializer(tokens, many=True, context={'request': request})
+    return Response(serializer.data)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def calendar_shares(request):
+    """List or grant shares of the user's busy time for meeting slot searches"""
+    if request.method == 'POST':
+        serializer = CalendarShareSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        share, created = CalendarShare.objects.get_or_create(
+            owner=request.user, email=serializer.validated_data['email']
+        )
+        return Response(
+            CalendarShareSerializer(share, context={'request': request}).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+    
+    shares = CalendarShare.objects.filter(owner=request.user)
+    serializer = CalendarShareSerializer(shares, many=True, context={'request': request})
+    return Response(serializer.data)
+
+
+@api_view(['DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def revoke_calendar_share(request, share_id):
+    """Stop sharing the user's busy time with an account"""
+    share = get_object_or_404(CalendarShare, id=share_id, owner=request.user)
+    share.delete()
+    return Response({'message': 'Calendar share revoked'})
+
+
+@api_view(['DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def revoke_calendar_feed_token(request, token_id):
+    """Revoke a calendar feed token so its URL stops working"""
+    feed_token = get_object_or_404(CalendarFeedToken, id=token_id, user=request.user, is_active=True)
+    feed_token.is_active = False
+    feed_token.save(update_fields=['is_active'])
+    return Response({'message': 'Calendar feed revoked'})
+
+
+@require_GET
+def calendar_feed(request, token):
+    """
+    Serve the unified ICS feed for a subscription token.
+    
+    A plain Django view: calendar clients send ``Accept: text/calendar`` and
+    authenticate with the URL token only, so DRF negotiation and auth are skipped.
+    """
+    row = CalendarFeedToken.objects.filter(token=token, is_active=True).values_list(
+        'id', 'user_id', 'last_used_at',
+        'user__data_version__generation', 'user__data_version__updated_at'
+    ).first()
+    if row is None:
+        raise Http404('Calendar feed not found')
+    token_id, user_id, last_used_at, generation, updated_at = row
+    generation = generation or 0
+    
+    # Record usage at most hourly so frequent polling stays read-only
+    now = timezone.now()
+    if last_used_at is None or now - last_used_at > timedelta(hours=1):
+        CalendarFeedToken.objects.filter(id=token_id).update(last_used_at=now)
+    
+    window = feed_window_start().date().isoformat()
+    etag = quote_etag(hashlib.sha1(f'{token_id}:{generation}:{window}'.encode('utf-8')).hexdigest())
+    last_modified = int(updated_at.timestamp()) if updated_at else None
+    
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(get_feed(user_id, generation), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = content_disposition_header(as_attachment=False, filename='calendar.ics')
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
+
+
 # GitHub Repository Management Views
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
@@ -532,8 +1126,12 @@ def github_repositories(request):
         per_page = min(int(request.GET.get('per_page', 30)), 100)
         page = int(request.GET.get('page', 1))
         
-        repositories = github_service.get_repositories(
-            user=user, org=org, type=repo_type, sort=sort, per_page=per_page, page=page
+        repositories = cached_response(
+            request, 'github-repositories',
+            lambda: github_service.get_repositories(
+                user=user, org=org, type=repo_type, sort=sort, per_page=per_page, page=page
+            ),
+            timeout=settings.GITHUB_CACHE_TIMEOUT
         )
         
         return Response({
@@ -562,7 +1160,11 @@ def github_repository_detail(request, owner, repo):
         integration = Integration.objects.get(user=request.user, provider='github', status='connected')
         github_service = GitHubOAuthService(integration)
         
-        repository = github_service.get_repository(owner, repo)
+        repository = cached_response(
+            request, 'github-repository',
+            lambda: github_service.get_repository(owner, repo),
+            timeout=settings.GITHUB_CACHE_TIMEOUT
+        )
         
         return Response(repository)
         
@@ -609,6 +1211,7 @@ def github_create_repository(request):
             gitignore_template=gitignore_template,
             license_template=license_template
         )
+        bump_data_version(request.user.id)
         
         return Response(repository, status=status.HTTP_201_CREATED)
         
@@ -635,6 +1238,7 @@ def github_update_repository(request, owner, repo):
         
         # Update repository with provided data
         repository = github_service.update_repository(owner, repo, **request.data)
+        bump_data_version(request.user.id)
         
         return Response(repository)
         
@@ -660,6 +1264,7 @@ def github_delete_repository(request, owner, repo):
         github_service = GitHubOAuthService(integration)
         
         github_service.delete_repository(owner, repo)
+        bump_data_version(request.user.id)
         
         return Response({'message': 'Repository deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
         
@@ -684,7 +1289,11 @@ def github_repository_collaborators(request, owner, repo):
         integration = Integration.objects.get(user=request.user, provider='github', status='connected')
         github_service = GitHubOAuthService(integration)
         
-        collaborators = github_service.get_repository_collaborators(owner, repo)
+        collaborators = cached_response(
+            request, 'github-collaborators',
+            lambda: github_service.get_repository_collaborators(owner, repo),
+            timeout=settings.GITHUB_CACHE_TIMEOUT
+        )
         
         return Response(collaborators)
         
@@ -712,6 +1321,7 @@ def github_add_collaborator(request, owner, repo, username):
         permission = request.data.get('permission', 'push')
         
         result = github_service.add_repository_collaborator(owner, repo, username, permission)
+        bump_data_version(request.user.id)
         
         return Response(result)
         
@@ -736,7 +1346,11 @@ def github_repository_branches(request, owner, repo):
         integration = Integration.objects.get(user=request.user, provider='github', status='connected')
         github_service = GitHubOAuthService(integration)
         
-        branches = github_service.get_repository_branches(owner, repo)
+        branches = cached_response(
+            request, 'github-branches',
+            lambda: github_service.get_repository_branches(owner, repo),
+            timeout=settings.GITHUB_CACHE_TIMEOUT
+        )
         
         return Response(branches)
         
@@ -770,9 +1384,13 @@ def github_repository_commits(request, owner, repo):
         per_page = min(int(request.GET.get('per_page', 30)), 100)
         page = int(request.GET.get('page', 1))
         
-        commits = github_service.get_repository_commits(
-            owner, repo, sha=sha, path=path, author=author, 
-            since=since, until=until, per_page=per_page, page=page
+        commits = cached_response(
+            request, 'github-commits',
+            lambda: github_service.get_repository_commits(
+                owner, repo, sha=sha, path=path, author=author, 
+                since=since, until=until, per_page=per_page, page=page
+            ),
+            timeout=settings.GITHUB_CACHE_TIMEOUT
         )
         
         return Response(commits)
@@ -801,7 +1419,11 @@ def github_repository_contents(request, owner, repo):
         path = request.GET.get('path', '')
         ref = request.GET.get('ref')
         
-        contents = github_service.get_repository_contents(owner, repo, path=path, ref=ref)
+        contents = cached_response(
+            request, 'github-contents',
+            lambda: github_service.get_repository_contents(owner, repo, path=path, ref=ref),
+            timeout=settings.GITHUB_CACHE_TIMEOUT
+        )
         
         return Response(contents)
         
@@ -0,0 +1,166 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.response import Response
+import logging
+
+from .inbox import delivery_key, record_deliveries
+from .models import Integration, WatchChannel, WebhookSubscription
+from .tasks import schedule_push_sync, schedule_webhook_processing
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def google_calendar_webhook(request):
+    """Receive Google Calendar watch channel notifications"""
+    channel_id = request.headers.get('X-Goog-Channel-ID', '')
+    channel = WatchChannel.objects.select_related('integration').filter(
+        channel_id=channel_id, resource_type='calendar'
+    ).first()
+    if channel is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    
+    token = request.headers.get('X-Goog-Channel-Token', '')
+    resource_id = request.headers.get('X-Goog-Resource-ID', '')
+    if not hmac.compare_digest(token, channel.token) or resource_id != channel.resource_id:
+        logger.warning(f"Rejected calendar notification for channel {channel_id}")
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    
+    # 'sync' only confirms that the channel was created
+    if request.headers.get('X-Goog-Resource-State') != 'sync':
+        schedule_push_sync(channel.integration_id, 'calendar', channel.calendar_id)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def gmail_push_webhook(request):
+    """Receive Gmail change notifications pushed by a Pub/Sub subscription"""
+    expected = settings.GMAIL_PUSH_VERIFICATION_TOKEN
+    if not expected or not hmac.compare_digest(request.query_params.get('token', ''), expected):
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        data = request.data['message']['data']
+        notification = json.loads(base64.b64decode(data))
+        email_address = notification['emailAddress']
+    except (KeyError, TypeError, ValueError, binascii.Error):
+        # Acknowledge malformed messages so Pub/Sub does not redeliver them forever
+        logger.warning("Ignored malformed Gmail push message")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    integrations = Integration.objects.filter(
+        provider='google_gmail', provider_email__iexact=email_address,
+        status='connected', sync_enabled=True
+    ).values_list('id', flat=True)
+    for integration_id in integrations:
+        schedule_push_sync(integration_id, 'gmail')
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def microsoft_graph_webhook(request):
+    """Receive Microsoft Graph change and lifecycle notifications"""
+    # Graph validates the endpoint by echoing a token back as plain text
+    validation_token = request.query_params.get('validationToken')
+    if validation_token is not None:
+        return HttpResponse(validation_token, content_type='text/plain')
+    
+    notifications = request.data.get('value') if isinstance(request.data, dict) else None
+    if not isinstance(notifications, list):
+        return Response(status=status.HTTP_400_BAD_REQUEST)
+    
+    subscriptions = WebhookSubscription.objects.filter(
+        subscription_id__in={str(item.get('subscriptionId', '')) for item in notifications if isinstance(item, dict)},
+        integration__provider='microsoft_calendar'
+    ).in_bulk(field_name='subscription_id')
+    
+    deliveries = defaultdict(list)
+    for item in notifications:
+        if not isinstance(item, dict):
+            continue
+        subscription = subscriptions.get(str(item.get('subscriptionId', '')))
+        if subscription is None or not hmac.compare_digest(str(item.get('clientState', '')), subscription.secret):
+            logger.warning(f"Rejected Graph notification for subscription {item.get('subscriptionId')}")
+            continue
+        
+        event_type = item.get('lifecycleEvent') or item.get('changeType', '')
+        resource_data = item.get('resourceData') or {}
+        # The etag changes with every edit, so only true redeliveries share a key
+        key = delivery_key(
+            subscription.subscription_id, event_type, resource_data.get('id', ''),
+            resource_data.get('@odata.etag') or item.get('subscriptionExpirationDateTime', '')
+        )
+        deliveries[subscription.integration_id].append((key, event_type, item))
+    
+    if not deliveries:
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    for integration_id, items in deliveries.items():
+        record_deliveries(integration_id, items)
+        schedule_webhook_processing(integration_id)
+    return Response(status=status.HTTP_202_ACCEPTED)
+
+
+def _verify_calendly_signature(header, body, signing_key):
+    """Check a Calendly-Webhook-Signature header of the form ``t=<timestamp>,v1=<hex>``"""
+    parts = dict(part.split('=', 1) for part in header.split(',') if '=' in part)
+    try:
+        timestamp = int(parts.get('t', ''))
+    except ValueError:
+        return False
+    if abs(time.time() - timestamp) > settings.CALENDLY_WEBHOOK_TOLERANCE:
+        return False
+    
+    expected = hmac.new(
+        signing_key.encode('utf-8'), f"{timestamp}.".encode('utf-8') + body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, parts.get('v1', ''))
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def calendly_webhook(request):
+    """Receive Calendly invitee webhooks"""
+    body = request.body
+    try:
+        notification = json.loads(body)
+        event_type = notification['event']
+        invitee_uri = notification['payload']['uri']
+        creator_id = str(notification.get('created_by', '')).rstrip('/').split('/')[-1]
+    except (KeyError, TypeError, ValueError):
+        return Response(status=status.HTTP_400_BAD_REQUEST)
+    
+    # Several users may connect the same Calendly account; each subscription signs with its own key
+    header = request.headers.get('Calendly-Webhook-Signature', '')
+    subscriptions = WebhookSubscription.objects.filter(
+        integration__provider='calendly', integration__provider_user_id=creator_id
+    )
+    subscription = next(
+        (subscription for subscription in subscriptions
+         if _verify_calendly_signature(header, body, subscription.secret)),
+        None
+    )
+    if subscription is None:
+        logger.warning(f"Rejected Calendly webhook from {creator_id}")
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    
+    record_deliveries(subscription.integration_id, [
+        (delivery_key(event_type, invitee_uri), event_type, notification)
+    ])
+    schedule_webhook_processing(subscription.integration_id)
+    return Response(status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,20 @@
+import os
+from django.apps import AppConfig
+
+
+class ObservabilityConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.observability'
+    
+    def ready(self):
+        from . import receivers  # noqa: F401
+        from .tracing import tracing_enabled
+        
+        if tracing_enabled():
+            from .instrumentation import instrument
+            instrument()
+        
+        if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_client import REGISTRY
+            from .collectors import QueueDepthCollector
+            REGISTRY.register(QueueDepthCollector())
@@ -0,0 +1,41 @@
+from django.conf import settings
+from prometheus_client.core import GaugeMetricFamily
+import logging
+
+from apps.integrations.models import SlackNotification, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+
+class QueueDepthCollector:
+    """Report the backlog of every background queue, read when /metrics is scraped"""
+
+    def _broker_depth(self):
+        broker_url = settings.CELERY_BROKER_URL
+        if settings.CELERY_TASK_ALWAYS_EAGER or not broker_url.startswith(('redis://', 'rediss://')):
+            return None
+        import redis
+
+        try:
+            client = redis.Redis.from_url(broker_url, socket_timeout=1)
+            return client.llen('celery')
+        except redis.RedisError as e:
+            logger.warning(f"Reading the Celery queue length failed: {e}")
+            return None
+
+    @staticmethod
+    def _family():
+        return GaugeMetricFamily('integrato_queue_depth', 'Items waiting in a background queue', labels=['queue'])
+
+    def describe(self):
+        # Lets the registry learn the metric name without querying at registration
+        yield self._family()
+
+    def collect(self):
+        depth = self._family()
+        depth.add_metric(['webhook_inbox'], WebhookDelivery.objects.filter(status='pending').count())
+        depth.add_metric(['slack_notifications'], SlackNotification.objects.filter(status='pending').count())
+        broker_depth = self._broker_depth()
+        if broker_depth is not None:
+            depth.add_metric(['celery'], broker_depth)
+        yield depth
@@ -0,0 +1,67 @@
+import json
+import threading
+from collections import deque
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SpanExporter:
+    """Receives the finished spans of one trace, as dicts, when its local root ends"""
+
+    def export(self, spans):
+        raise NotImplementedError
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep the most recent spans in memory, for tests and the Django shell"""
+
+    def __init__(self, max_spans=10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def traces(self):
+        """Group the kept spans by trace id"""
+        grouped = {}
+        for span in self.spans:
+            grouped.setdefault(span['trace_id'], []).append(span)
+        return grouped
+
+    def clear(self):
+        self.spans.clear()
+
+
+class JsonLinesFileExporter(SpanExporter):
+    """Append one JSON object per span to TRACING_FILE_PATH"""
+
+    def __init__(self, path=None):
+        self.path = path or settings.TRACING_FILE_PATH
+        self.lock = threading.Lock()
+
+    def export(self, spans):
+        lines = ''.join(json.dumps(span, default=str) + '\n' for span in spans)
+        with self.lock, open(self.path, 'a', encoding='utf-8') as trace_file:
+            trace_file.write(lines)
+
+
+class LoggingExporter(SpanExporter):
+    """Log each trace as an indented tree of span names and durations"""
+
+    def export(self, spans):
+        children = {}
+        for span in spans:
+            children.setdefault(span['parent_id'], []).append(span)
+        span_ids = {span['span_id'] for span in spans}
+        roots = [span for span in spans if span['parent_id'] not in span_ids]
+
+        lines = []
+        def walk(span, depth):
+            lines.append(f"{'  ' * depth}{span['name']} {span['duration_ms']:.1f} ms {span['status']}")
+            for child in sorted(children.get(span['span_id'], []), key=lambda child: child['start_ns']):
+                walk(child, depth + 1)
+        for root in roots:
+            walk(root, 0)
+        logger.info(f"Trace {spans[0]['trace_id']}\n" + '\n'.join(lines))
@@ -0,0 +1,132 @@
+import time
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+from django.db import connections
+
+from .tracing import Span, activate, current_span, deactivate, instrument_class, span, start_span, start_trace
+
+# Long statements are cut; parameters are never recorded
+MAX_STATEMENT_LENGTH = 500
+
+# task id -> (span, context token, query wrappers) of tasks running in this worker
+_task_spans = {}
+
+
+def query_span(execute, sql, params, many, context):
+    """Connection execute wrapper that traces each query or executemany batch"""
+    parent = current_span()
+    if parent is None or not parent.sampled:
+        return execute(sql, params, many, context)
+    with span('db.query', kind='client', **{
+        'db.system': context['connection'].vendor,
+        'db.statement': sql[:MAX_STATEMENT_LENGTH],
+        'db.batch_size': len(params) if many and hasattr(params, '__len__') else 1,
+    }):
+        return execute(sql, params, many, context)
+
+
+def trace_queries(stack):
+    """Install the query tracer on every database connection until ``stack`` closes"""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(query_span))
+
+
+def observe_provider_request(sender, method, url, status_code, duration, phase, error, **kwargs):
+    """Record a finished outbound call as a client span, backdated to when it started"""
+    end_ns = time.time_ns()
+    http_span = start_span(f'HTTP {method}', kind='client', start_ns=end_ns - int(duration * 1e9))
+    if http_span is None:
+        return
+    parts = urlsplit(url)
+    http_span.attributes.update({
+        'http.method': method,
+        'http.host': parts.hostname or '',
+        'http.path': parts.path,
+        'http.status_code': status_code,
+        'sync.phase': phase,
+    })
+    if error is not None:
+        http_span.record_error(error)
+    elif status_code >= 500:
+        http_span.status = 'error'
+    http_span.end(end_ns)
+
+
+def instrument_views():
+    """Wrap APIView.dispatch, which every DRF class and function view goes through"""
+    from rest_framework.views import APIView
+
+    if getattr(APIView.dispatch, '__traced__', False):
+        return
+    dispatch = APIView.dispatch
+
+    def traced_dispatch(self, request, *args, **kwargs):
+        parent = current_span()
+        if parent is None or not parent.sampled:
+            return dispatch(self, request, *args, **kwargs)
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match and match.view_name else type(self).__name__
+        with span(f'view {name}', **{'view.class': type(self).__name__}) as view_span:
+            response = dispatch(self, request, *args, **kwargs)
+            view_span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                view_span.status = 'error'
+            return response
+
+    traced_dispatch.__traced__ = True
+    APIView.dispatch = traced_dispatch
+
+
+def inject_trace_context(headers=None, **kwargs):
+    """Celery before_task_publish: carry the current trace into the task message"""
+    parent = current_span()
+    if parent is not None and headers is not None:
+        headers['traceparent'] = parent.traceparent
+
+
+def start_task_span(task_id=None, task=None, **kwargs):
+    """Celery task_prerun: continue the publisher's trace, or a local one when run eagerly"""
+    name = f'task {task.name}'
+    parent = current_span()
+    if parent is not None:
+        task_span = start_span(name, kind='consumer') or parent
+    else:
+        traceparent = getattr(task.request, 'traceparent', None) or (task.request.headers or {}).get('traceparent')
+        task_span = start_trace(name, kind='consumer', traceparent=traceparent)
+    if isinstance(task_span, Span):
+        task_span.set_attribute('celery.task_id', task_id)
+
+    # Eager tasks share the connection wrappers of the request that ran them
+    stack = ExitStack()
+    if task_span.sampled and parent is None:
+        trace_queries(stack)
+    _task_spans[task_id] = (task_span, activate(task_span), stack)
+
+
+def end_task_span(task_id=None, state=None, retval=None, **kwargs):
+    """Celery task_postrun: close the span opened for the task"""
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    task_span, token, stack = entry
+    stack.close()
+    deactivate(token)
+    if state == 'FAILURE' and isinstance(retval, BaseException):
+        task_span.record_error(retval)
+    if task_span is not current_span():
+        task_span.end()
+
+
+def instrument():
+    """Hook tracing into views, provider services, outbound calls and Celery"""
+    from celery.signals import before_task_publish, task_postrun, task_prerun
+    from apps.integrations.services import OAuthService
+    from apps.integrations.signals import provider_request_finished
+
+    instrument_views()
+    instrument_class(OAuthService)
+    provider_request_finished.connect(observe_provider_request, dispatch_uid='tracing-provider-request')
+    before_task_publish.connect(inject_trace_context, dispatch_uid='tracing-task-publish', weak=False)
+    task_prerun.connect(start_task_span, dispatch_uid='tracing-task-prerun', weak=False)
+    task_postrun.connect(end_task_span, dispatch_uid='tracing-task-postrun', weak=False)
+
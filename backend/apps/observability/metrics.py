@@ -0,0 +1,59 @@
+import re
+from urllib.parse import urlsplit
+from prometheus_client import Counter, Histogram
+
+# With PROMETHEUS_MULTIPROC_DIR set, every gunicorn and Celery worker process
+# writes these to files in that directory and /metrics aggregates them.
+
+REQUEST_LATENCY = Histogram(
+    'integrato_http_request_duration_seconds',
+    'Time spent handling an HTTP request',
+    ['view', 'method', 'status'],
+)
+REQUEST_DB_QUERIES = Histogram(
+    'integrato_http_request_db_queries',
+    'Database queries executed while handling an HTTP request',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+PROVIDER_LATENCY = Histogram(
+    'integrato_provider_request_duration_seconds',
+    'Latency of outbound provider API calls',
+    ['host', 'endpoint', 'method'],
+)
+PROVIDER_ERRORS = Counter(
+    'integrato_provider_request_errors_total',
+    'Outbound provider API calls that failed or returned an error status',
+    ['host', 'endpoint', 'reason'],
+)
+TOKEN_REFRESHES = Counter(
+    'integrato_token_refreshes_total',
+    'OAuth access token refreshes',
+    ['host', 'outcome'],
+)
+SYNC_DURATION = Histogram(
+    'integrato_sync_duration_seconds',
+    'Wall time of provider syncs',
+    ['provider', 'sync_type', 'status'],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+SYNC_THROUGHPUT = Histogram(
+    'integrato_sync_items_per_second',
+    'Items processed per second by successful syncs',
+    ['provider', 'sync_type'],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+
+# Path segments that carry ids, e-mail addresses or tokens; keeping them
+# would create one time series per event, message or user
+_ID_SEGMENT = re.compile(r'^(?=.*\d).{8,}$|^.{25,}$|@')
+
+
+def provider_endpoint(url):
+    """Split a provider URL into a host and an endpoint label with ids collapsed"""
+    parts = urlsplit(url)
+    segments = [
+        '{id}' if _ID_SEGMENT.search(segment) else segment
+        for segment in parts.path.split('/')
+    ]
+    return parts.hostname or '', '/'.join(segments) or '/'
@@ -0,0 +1,74 @@
+import time
+from contextlib import ExitStack
+from django.db import connections
+
+from .instrumentation import trace_queries
+from .metrics import REQUEST_DB_QUERIES, REQUEST_LATENCY
+from .tracing import activate, deactivate, start_trace, tracing_enabled
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class PrometheusMiddleware:
+    """Time every request and count its database queries, labelled by the resolved view"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        # Label by route name, never by path, to keep the number of series bounded
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match else 'unresolved'
+        REQUEST_LATENCY.labels(view, request.method, str(response.status_code)).observe(duration)
+        REQUEST_DB_QUERIES.labels(view).observe(counter.count)
+        return response
+
+
+class TracingMiddleware:
+    """Open the root span of each request, continuing an incoming traceparent header"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracing_enabled():
+            return self.get_response(request)
+
+        root = start_trace(request.method, traceparent=request.headers.get('traceparent'))
+        token = activate(root)
+        try:
+            if not root.sampled:
+                return self.get_response(request)
+            with ExitStack() as stack:
+                trace_queries(stack)
+                response = self.get_response(request)
+            root.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                root.status = 'error'
+            response['X-Trace-Id'] = root.trace_id
+            return response
+        except BaseException as e:
+            root.record_error(e)
+            raise
+        finally:
+            deactivate(token)
+            if root.sampled:
+                match = request.resolver_match
+                root.name = f"{request.method} {match.view_name if match else 'unresolved'}"
+                root.attributes.update({'http.method': request.method, 'http.path': request.path})
+                root.end()
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.integrations.models import SyncLog
+from apps.integrations.signals import provider_request_finished
+from .metrics import (
+    PROVIDER_ERRORS, PROVIDER_LATENCY, SYNC_DURATION, SYNC_THROUGHPUT, TOKEN_REFRESHES, provider_endpoint
+)
+
+
+@receiver(provider_request_finished)
+def observe_provider_request(sender, method, url, status_code, duration, phase, error, **kwargs):
+    host, endpoint = provider_endpoint(url)
+    PROVIDER_LATENCY.labels(host, endpoint, method).observe(duration)
+
+    if error is not None:
+        reason = type(error).__name__
+    elif status_code >= 400:
+        reason = str(status_code)
+    else:
+        reason = None
+    if reason:
+        PROVIDER_ERRORS.labels(host, endpoint, reason).inc()
+    if phase == 'token_refresh':
+        TOKEN_REFRESHES.labels(host, 'failure' if reason else 'success').inc()
+
+
+@receiver(post_save, sender=SyncLog)
+def observe_finished_sync(sender, instance, **kwargs):
+    if instance.status == 'started' or not instance.completed_at:
+        return
+    if instance.metrics.get('duration_ms') is not None:
+        duration = instance.metrics['duration_ms'] / 1000
+    else:
+        duration = (instance.completed_at - instance.started_at).total_seconds()
+
+    provider = instance.integration.provider
+    SYNC_DURATION.labels(provider, instance.sync_type, instance.status).observe(duration)
+    if instance.status == 'completed' and duration > 0:
+        SYNC_THROUGHPUT.labels(provider, instance.sync_type).observe(instance.items_processed / duration)
@@ -0,0 +1,231 @@
+import functools
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.utils.module_loading import import_string
+import logging
+
+logger = logging.getLogger(__name__)
+
+# W3C trace context: version-trace_id-parent_id-flags
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+_current = ContextVar('current_span', default=None)
+_exporters = None
+
+
+class Span:
+    """A timed operation; finished spans of a trace are exported together"""
+
+    __slots__ = (
+        'trace_id', 'span_id', 'parent_id', 'name', 'kind', 'start_ns', 'end_ns',
+        'attributes', 'status', 'sampled', '_trace', '_is_local_root',
+    )
+
+    def __init__(self, name, trace_id, parent_id=None, kind='internal', attributes=None, start_ns=None, trace=None):
+        self.trace_id = trace_id
+        self.span_id = f'{random.getrandbits(64):016x}'
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.sampled = True
+        self._is_local_root = trace is None
+        self._trace = trace if trace is not None else {'spans': [], 'dropped': 0}
+
+    @property
+    def traceparent(self):
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, error):
+        self.status = 'error'
+        self.attributes['error.type'] = type(error).__name__
+        self.attributes['error.message'] = str(error)[:500]
+
+    def end(self, end_ns=None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        trace = self._trace
+        if len(trace['spans']) < settings.TRACING_MAX_SPANS_PER_TRACE:
+            trace['spans'].append(self)
+        else:
+            trace['dropped'] += 1
+        if self._is_local_root:
+            _export(trace)
+
+    def as_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'status': self.status,
+            'attributes': self.attributes,
+        }
+
+
+class UnsampledSpan:
+    """Carries the decision not to record a trace, so its children and tasks skip it too"""
+
+    __slots__ = ('trace_id', 'span_id')
+    sampled = False
+
+    def __init__(self, trace_id, span_id):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    @property
+    def traceparent(self):
+        return f'00-{self.trace_id}-{self.span_id}-00'
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def end(self, end_ns=None):
+        pass
+
+
+def tracing_enabled():
+    return bool(settings.TRACING_EXPORTERS)
+
+
+def get_exporters():
+    """Instantiate the exporters named in TRACING_EXPORTERS once per process"""
+    global _exporters
+    if _exporters is None:
+        _exporters = [import_string(path)() for path in settings.TRACING_EXPORTERS]
+    return _exporters
+
+
+def _export(trace):
+    spans = [span.as_dict() for span in trace['spans']]
+    if trace['dropped']:
+        spans[-1]['attributes']['trace.dropped_spans'] = trace['dropped']
+    for exporter in get_exporters():
+        try:
+            exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"Exporting {len(spans)} spans with {type(exporter).__name__} failed: {e}")
+
+
+def current_span():
+    return _current.get()
+
+
+def should_sample(trace_id):
+    """Ratio sampling keyed on the trace id, so every process makes the same decision"""
+    return int(trace_id[16:], 16) < settings.TRACING_SAMPLE_RATE * 2 ** 64
+
+
+def start_trace(name, kind='server', traceparent=None, attributes=None):
+    """
+    Start the local root span of a request or task.
+
+    An incoming ``traceparent`` continues the caller's trace and keeps its
+    sampling decision; otherwise a new trace is sampled at TRACING_SAMPLE_RATE.
+    Returns an UnsampledSpan when nothing should be recorded.
+    """
+    match = TRACEPARENT_RE.match(traceparent or '')
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        sampled = bool(int(flags, 16) & 1)
+    else:
+        trace_id, parent_id = f'{random.getrandbits(128):032x}', None
+        sampled = should_sample(trace_id)
+    if not sampled:
+        return UnsampledSpan(trace_id, parent_id or f'{random.getrandbits(64):016x}')
+    return Span(name, trace_id, parent_id, kind, attributes)
+
+
+def start_span(name, kind='internal', attributes=None, start_ns=None):
+    """Start a child of the current span, or return None when the current trace is not recorded"""
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return None
+    return Span(name, parent.trace_id, parent.span_id, kind, attributes, start_ns, parent._trace)
+
+
+def activate(span):
+    """Make ``span`` the parent of spans started in this context; returns a reset token"""
+    return _current.set(span)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def use_span(span):
+    """Activate ``span`` for the block, record an escaping exception on it and end it"""
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current.reset(token)
+        span.end()
+
+
+@contextmanager
+def span(name, kind='internal', **attributes):
+    """Trace the block as a child of the current span; a no-op outside sampled traces"""
+    child = start_span(name, kind, attributes)
+    if child is None:
+        yield None
+        return
+    with use_span(child):
+        yield child
+
+
+def traced(name, kind='internal'):
+    """Decorate a function so each call is a span in the current trace"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = _current.get()
+            if parent is None or not parent.sampled:
+                return func(*args, **kwargs)
+            with use_span(Span(name, parent.trace_id, parent.span_id, kind, None, None, parent._trace)):
+                return func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls):
+    """Trace every public method of ``cls`` and of its subclasses, once"""
+    for klass in [cls, *_subclasses(cls)]:
+        for attr_name, attr in list(vars(klass).items()):
+            if attr_name.startswith('_'):
+                continue
+            span_name = f'{klass.__name__}.{attr_name}'
+            if isinstance(attr, (classmethod, staticmethod)):
+                if not getattr(attr.__func__, '__traced__', False):
+                    setattr(klass, attr_name, type(attr)(traced(span_name)(attr.__func__)))
+            elif callable(attr) and not isinstance(attr, type) and not getattr(attr, '__traced__', False):
+                setattr(klass, attr_name, traced(span_name)(attr))
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
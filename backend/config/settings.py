@@ -45,11 +45,14 @@ LOCAL_APPS = [
     'apps.integrations',
     'apps.chatbot',
     'apps.agents',
+    'apps.observability',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.observability.middleware.PrometheusMiddleware',
+    'apps.observability.middleware.TracingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -137,6 +140,62 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Content-addressed cache for downloaded email attachments
+ATTACHMENT_CACHE_DIR = config('ATTACHMENT_CACHE_DIR', default=str(BASE_DIR / 'attachment_cache'))
+ATTACHMENT_CACHE_MAX_BYTES = config('ATTACHMENT_CACHE_MAX_BYTES', default=1024 * 1024 * 1024, cast=int)
+
+# Caching: Redis when REDIS_URL is set, otherwise per-process local memory
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'integrato',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'integrato',
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    }
+
+# Two-tier response cache for expensive read endpoints
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+RESPONSE_CACHE_LOCAL_TIMEOUT = config('RESPONSE_CACHE_LOCAL_TIMEOUT', default=5, cast=int)
+RESPONSE_CACHE_LOCAL_MAX_ENTRIES = config('RESPONSE_CACHE_LOCAL_MAX_ENTRIES', default=1024, cast=int)
+GITHUB_CACHE_TIMEOUT = config('GITHUB_CACHE_TIMEOUT', default=60, cast=int)
+
+# Subscribable ICS feeds include this many days of past events
+CALENDAR_FEED_PAST_DAYS = config('CALENDAR_FEED_PAST_DAYS', default=90, cast=int)
+
+# Celery: without a broker configured, tasks run inline in the calling process
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=not CELERY_BROKER_URL, cast=bool)
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    'renew-watch-channels': {
+        'task': 'apps.integrations.tasks.renew_watch_channels',
+        'schedule': 3600,
+    },
+    'renew-webhook-subscriptions': {
+        'task': 'apps.integrations.tasks.renew_webhook_subscriptions',
+        'schedule': 3600,
+    },
+    'sweep-webhook-inbox': {
+        'task': 'apps.integrations.tasks.sweep_webhook_inbox',
+        'schedule': 60,
+    },
+    'sweep-slack-notifications': {
+        'task': 'apps.integrations.tasks.sweep_slack_notifications',
+        'schedule': 30,
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -349,6 +408,32 @@ LOGGING = {
 # Encryption key for storing tokens securely
 ENCRYPTION_KEY = config('ENCRYPTION_KEY', default=None)
 
+# Google Calendar recurring events: 'expand' stores one row per occurrence,
+# 'master' stores recurring masters once and expands them on read
+GOOGLE_CALENDAR_RECURRENCE_MODE = config('GOOGLE_CALENDAR_RECURRENCE_MODE', default='expand')
+
+# Google push notifications. GOOGLE_PUSH_WEBHOOK_URL is the public HTTPS URL of
+# the calendar receiver; Gmail pushes through a Pub/Sub topic whose push
+# subscription posts to the Gmail receiver with ?token=GMAIL_PUSH_VERIFICATION_TOKEN
+GOOGLE_PUSH_WEBHOOK_URL = config('GOOGLE_PUSH_WEBHOOK_URL', default='')
+GOOGLE_PUSH_CHANNEL_TTL = config('GOOGLE_PUSH_CHANNEL_TTL', default=7 * 24 * 3600, cast=int)
+GOOGLE_PUBSUB_TOPIC = config('GOOGLE_PUBSUB_TOPIC', default='')
+GMAIL_PUSH_VERIFICATION_TOKEN = config('GMAIL_PUSH_VERIFICATION_TOKEN', default='')
+PUSH_SYNC_DEBOUNCE_SECONDS = config('PUSH_SYNC_DEBOUNCE_SECONDS', default=30, cast=int)
+WATCH_CHANNEL_RENEW_BEFORE = config('WATCH_CHANNEL_RENEW_BEFORE', default=24 * 3600, cast=int)
+
+# Microsoft Graph and Calendly webhooks. WEBHOOK_BASE_URL is the public HTTPS
+# origin the providers post to. Notifications land in an inbox table and are
+# applied per integration in batches shortly after they arrive.
+WEBHOOK_BASE_URL = config('WEBHOOK_BASE_URL', default='')
+MICROSOFT_SUBSCRIPTION_TTL = config('MICROSOFT_SUBSCRIPTION_TTL', default=4200 * 60, cast=int)
+WEBHOOK_SUBSCRIPTION_RENEW_BEFORE = config('WEBHOOK_SUBSCRIPTION_RENEW_BEFORE', default=12 * 3600, cast=int)
+CALENDLY_WEBHOOK_TOLERANCE = config('CALENDLY_WEBHOOK_TOLERANCE', default=180, cast=int)
+WEBHOOK_BATCH_DELAY_SECONDS = config('WEBHOOK_BATCH_DELAY_SECONDS', default=2, cast=int)
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=500, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=5, cast=int)
+WEBHOOK_DELIVERY_RETENTION_DAYS = config('WEBHOOK_DELIVERY_RETENTION_DAYS', default=7, cast=int)
+
 # Microsoft OAuth Settings
 MICROSOFT_CLIENT_ID = config('MICROSOFT_CLIENT_ID', default='')
 MICROSOFT_CLIENT_SECRET = config('MICROSOFT_CLIENT_SECRET', default='')
@@ -360,9 +445,52 @@ GITHUB_CLIENT_SECRET = config('GITHUB_CLIENT_SECRET', default='')
 # Slack OAuth Settings
 SLACK_CLIENT_ID = config('SLACK_CLIENT_ID', default='')
 SLACK_CLIENT_SECRET = config('SLACK_CLIENT_SECRET', default='')
+# First Slack sync of a channel goes back this many days; later runs continue from the newest message
+SLACK_HISTORY_DAYS = config('SLACK_HISTORY_DAYS', default=30, cast=int)
+SLACK_MAX_RETRIES = config('SLACK_MAX_RETRIES', default=5, cast=int)
+
+# Outbound Slack notifications are queued, coalesced per channel for
+# SLACK_NOTIFY_COALESCE_SECONDS and sent by a worker. When tasks run eagerly
+# (no broker) they are sent uncoalesced as soon as the caller's transaction
+# commits, and a failed send is only retried with the channel's next message
+SLACK_NOTIFY_COALESCE_SECONDS = config('SLACK_NOTIFY_COALESCE_SECONDS', default=5, cast=int)
+SLACK_NOTIFY_MAX_BATCH = config('SLACK_NOTIFY_MAX_BATCH', default=20, cast=int)
+SLACK_NOTIFY_MAX_ATTEMPTS = config('SLACK_NOTIFY_MAX_ATTEMPTS', default=6, cast=int)
+SLACK_NOTIFY_BACKOFF_BASE = config('SLACK_NOTIFY_BACKOFF_BASE', default=5, cast=int)
+SLACK_NOTIFY_BACKOFF_MAX = config('SLACK_NOTIFY_BACKOFF_MAX', default=600, cast=int)
+SLACK_NOTIFY_STATS_WINDOW = config('SLACK_NOTIFY_STATS_WINDOW', default=3600, cast=int)
+
+# Prometheus metrics are served at /metrics. Under gunicorn or Celery with
+# several processes, set the PROMETHEUS_MULTIPROC_DIR environment variable to
+# an empty directory shared by them. A non-empty METRICS_TOKEN must be sent by
+# the scraper as a bearer token
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Tracing is off unless TRACING_EXPORTERS lists exporter classes, e.g.
+# apps.observability.exporters.JsonLinesFileExporter or InMemoryExporter.
+# TRACING_SAMPLE_RATE of new traces are recorded; a request carrying a
+# sampled W3C traceparent header is always traced
+TRACING_EXPORTERS = config('TRACING_EXPORTERS', default='', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+TRACING_SAMPLE_RATE = config('TRACING_SAMPLE_RATE', default=0.01, cast=float)
+TRACING_MAX_SPANS_PER_TRACE = config('TRACING_MAX_SPANS_PER_TRACE', default=2000, cast=int)
+TRACING_FILE_PATH = config('TRACING_FILE_PATH', default=str(BASE_DIR / 'traces.jsonl'))
+
+# Every SyncLog stores per-phase timings and upstream call counts. Peak memory
+# is recorded too when SYNC_TRACEMALLOC is on, at some cost in sync speed
+SYNC_TRACEMALLOC = config('SYNC_TRACEMALLOC', default=False, cast=bool)
+SYNC_METRICS_WINDOW_DAYS = config('SYNC_METRICS_WINDOW_DAYS', default=7, cast=int)
+
+# Base URL of a running provider simulator (manage.py run_provider_simulator).
+# When set, every Google, Microsoft, GitHub, Slack and Calendly API call goes
+# there instead of the real provider. For load testing only
+PROVIDER_SIMULATOR_URL = config('PROVIDER_SIMULATOR_URL', default='')
 
 # Calendly OAuth Settings
 CALENDLY_CLIENT_ID = config('CALENDLY_CLIENT_ID', default='')
 CALENDLY_CLIENT_SECRET = config('CALENDLY_CLIENT_SECRET', default='')
 CALENDLY_REDIRECT_URI = config('CALENDLY_REDIRECT_URI', default='')
-CALENDLY_SCOPES = config('CALENDLY_SCOPES', default='default')
\ No newline at end of file
+CALENDLY_SCOPES = config('CALENDLY_SCOPES', default='default')
+
+# Agents are built once per chat session and reused for its later messages.
+# Each process keeps at most AGENT_POOL_SIZE of them, least recently used go first
+AGENT_POOL_SIZE = config('AGENT_POOL_SIZE', default=256, cast=int)
@@ -10,6 +10,7 @@ urlpatterns = [
     path('api/integrations/', include('apps.integrations.urls')),
     path('api/chatbot/', include('apps.chatbot.urls')),
     path('api/agents/', include('apps.agents.urls')),
+    path('', include('apps.observability.urls')),
 ]
 
 # Serve media files in development
@@ -0,0 +1,8 @@
+import os
+
+
+def child_exit(server, worker):
+    # Drop live gauges of the exited worker from the Prometheus multiprocess files
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,127 @@
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+
+from .runner import run, start_simulator
+from .scenarios import DEFAULT_WEIGHTS
+from .stats import find_knee, format_table
+
+
+def parse_stages(value):
+    """``100:60,500:60`` -> [(100, 60.0), (500, 60.0)]: users held for seconds"""
+    try:
+        stages = [(int(users), float(seconds)) for users, seconds in (stage.split(':') for stage in value.split(','))]
+    except ValueError:
+        raise argparse.ArgumentTypeError('stages look like 100:60,500:60 (users:seconds)')
+    if not stages or any(users < 0 or seconds <= 0 for users, seconds in stages):
+        raise argparse.ArgumentTypeError('every stage needs zero or more users and a positive duration')
+    return stages
+
+
+def parse_weights(value):
+    weights = dict(DEFAULT_WEIGHTS)
+    try:
+        for item in value.split(','):
+            name, weight = item.split('=')
+            weights[name.strip()] = float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError('weights look like dashboard=20,manual_sync=0')
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown journeys: {', '.join(sorted(unknown))}")
+    weights = {name: weight for name, weight in weights.items() if weight > 0}
+    if not weights:
+        raise argparse.ArgumentTypeError('at least one journey needs a positive weight')
+    return weights
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m loadtest',
+        description='Drive a running backend with virtual users and report latency, throughput and errors per endpoint'
+    )
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--users', type=int, default=100, help='Concurrent virtual users, for a single stage')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run, for a single stage')
+    parser.add_argument(
+        '--stages', type=parse_stages,
+        help='Step the load instead, e.g. 100:60,500:60,2000:120 (users:seconds); each stage is reported'
+    )
+    parser.add_argument('--spawn-rate', type=float, default=50, help='New virtual users started per second')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean seconds between journeys')
+    parser.add_argument(
+        '--weights', type=parse_weights, default=dict(DEFAULT_WEIGHTS),
+        help=f"Journey weights, e.g. manual_sync=0 ({', '.join(DEFAULT_WEIGHTS)})"
+    )
+    parser.add_argument('--accounts', type=int, default=1000, help='Accounts created by prepare_loadtest')
+    parser.add_argument('--user-pattern', default='loadtest-{n}@example.com')
+    parser.add_argument('--password', default='loadtest-password')
+    parser.add_argument(
+        '--agent-type', default='assistant',
+        help='agent_type for agent chat; finance and study_buddy call the LLM provider'
+    )
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=1, help='Load generator processes; use one per core')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the report as JSON to this file')
+    parser.add_argument(
+        '--start-simulator', metavar='HOST:PORT',
+        help='Also serve the provider simulator here; the backend needs PROVIDER_SIMULATOR_URL pointing at it'
+    )
+    parser.add_argument('--simulator-items', type=int, default=1000)
+    parser.add_argument('--simulator-latency', default='none')
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if not options.stages:
+        options.stages = [(options.users, options.duration)]
+    if options.workers < 1 or options.accounts < 1:
+        sys.exit('--workers and --accounts must be at least 1')
+
+    simulator = None
+    if options.start_simulator:
+        simulator = start_simulator(options.start_simulator, options.simulator_items, options.simulator_latency)
+        print(f'Provider simulator listening on http://{options.start_simulator}')
+
+    print(f"Running {' -> '.join(f'{users} users for {seconds:.0f}s' for users, seconds in options.stages)} "
+          f"against {options.base_url}")
+    try:
+        stages = run(options)
+    except KeyboardInterrupt:
+        sys.exit('Interrupted')
+    finally:
+        if simulator is not None:
+            simulator.shutdown()
+
+    for stage in stages:
+        print()
+        print(format_table(stage))
+    knee = find_knee(stages)
+    print()
+    print(f'First saturation: {knee}' if knee else 'No saturation found; add a heavier stage')
+
+    if options.output:
+        report = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'options': {
+                key: value for key, value in vars(options).items() if key not in ('password',)
+            },
+            'stages': stages,
+            'saturation': knee,
+        }
+        with open(options.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, default=str)
+        print(f'Wrote the report to {options.output}')
+
+    failed = sum(stage['total']['errors'] for stage in stages)
+    total = sum(stage['total']['requests'] for stage in stages)
+    return 1 if total and failed / total > 0.05 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import asyncio
+import random
+import resource
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import httpx
+
+from .scenarios import VirtualUser
+from .stats import StageStats
+
+
+def raise_open_file_limit():
+    """Every virtual user holds a socket; allow as many as the hard limit permits"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _share(users, workers, index):
+    return users // workers + (1 if index < users % workers else 0)
+
+
+async def run_worker(options, index):
+    """Run every stage with this worker's share of the users; returns one StageStats per stage"""
+    workers = options.workers
+    rng = random.Random(options.seed * 1000 + index)
+    journeys = list(options.weights)
+    weights = [options.weights[journey] for journey in journeys]
+    peak_users = max(_share(users, workers, index) for users, _ in options.stages)
+    client = httpx.AsyncClient(
+        base_url=options.base_url,
+        timeout=options.timeout,
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=peak_users or 1),
+    )
+
+    current = []
+
+    def record(endpoint, ms, error=None):
+        current[-1].record(endpoint, ms, error)
+
+    loop = asyncio.get_running_loop()
+    spawn_interval = workers / options.spawn_rate if options.spawn_rate else 0
+    tasks = []
+    results = []
+    try:
+        for number, (users, seconds) in enumerate(options.stages, start=1):
+            share = _share(users, workers, index)
+            current.append(StageStats(f'stage {number}', users, seconds))
+            started = loop.time()
+
+            while len(tasks) > share:
+                tasks.pop().cancel()
+            while len(tasks) < share:
+                # Accounts are spread over workers so no two users share one while there are enough
+                account = (index + workers * len(tasks)) % options.accounts
+                user = VirtualUser(
+                    client, record, options.user_pattern.format(n=account), options.password,
+                    random.Random(rng.random()), options
+                )
+                tasks.append(asyncio.create_task(user.run(journeys, weights, options.think_time)))
+                if spawn_interval:
+                    await asyncio.sleep(spawn_interval)
+
+            await asyncio.sleep(max(seconds - (loop.time() - started), 0))
+            current[-1].seconds = loop.time() - started
+            results.append(current[-1])
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await client.aclose()
+    return results
+
+
+def _worker_main(options, index):
+    raise_open_file_limit()
+    return asyncio.run(run_worker(options, index))
+
+
+def run(options):
+    """Run the load test in ``options.workers`` processes and merge their figures per stage"""
+    raise_open_file_limit()
+    if options.workers == 1:
+        per_worker = [asyncio.run(run_worker(options, 0))]
+    else:
+        with ProcessPoolExecutor(max_workers=options.workers) as executor:
+            futures = [executor.submit(_worker_main, options, index) for index in range(options.workers)]
+            per_worker = [future.result() for future in futures]
+
+    stages = per_worker[0]
+    for worker_stages in per_worker[1:]:
+        for stage, other in zip(stages, worker_stages):
+            stage.merge(other)
+            stage.seconds = max(stage.seconds, other.seconds)
+    return [stage.as_dict() for stage in stages]
+
+
+def start_simulator(address, items, latency):
+    """Serve the provider simulator from a background thread of this process"""
+    from apps.integrations.simulator import ProviderSimulator, make_server
+
+    host, _, port = address.rpartition(':')
+    server = make_server(ProviderSimulator(items=items, latency=latency), host or '127.0.0.1', int(port))
+    threading.Thread(target=server.serve_forever, name='provider-simulator', daemon=True).start()
+    return server
@@ -0,0 +1,157 @@
+import asyncio
+import time
+import httpx
+
+SEARCH_TERMS = ['meeting', 'simulated', 'invoice', 'standup', 'review', 'lorem']
+
+# journey -> relative weight; override with --weights
+DEFAULT_WEIGHTS = {
+    'dashboard': 20,
+    'scroll_events': 25,
+    'scroll_emails': 25,
+    'search': 15,
+    'manual_sync': 5,
+    'agent_chat': 5,
+    'login': 5,
+}
+
+
+class LoginFailed(Exception):
+    pass
+
+
+class VirtualUser:
+    """
+    One simulated person using the app, in a loop of weighted journeys.
+
+    Like the browser client it keeps ETags and revalidates with
+    If-None-Match, so list endpoints answer 304 when nothing changed.
+    """
+
+    def __init__(self, client, record, email, password, rng, options):
+        self.client = client
+        self.record = record
+        self.email = email
+        self.password = password
+        self.rng = rng
+        self.options = options
+        self.access_token = None
+        self.integration_ids = []
+        self.etags = {}
+        self.session_id = None
+
+    async def request(self, method, path, endpoint, **kwargs):
+        """Send one request, record it under ``endpoint`` and return the response or None"""
+        headers = kwargs.pop('headers', {})
+        if self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        if method == 'GET' and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=headers, **kwargs)
+        except httpx.TimeoutException:
+            self.record(endpoint, (time.perf_counter() - started) * 1000, 'timeout')
+            return None
+        except httpx.HTTPError as e:
+            self.record(endpoint, (time.perf_counter() - started) * 1000, type(e).__name__)
+            return None
+        elapsed = (time.perf_counter() - started) * 1000
+
+        error = str(response.status_code) if response.status_code >= 400 else None
+        self.record(endpoint, elapsed, error)
+        if response.status_code == 401 and endpoint != 'POST /api/auth/login/':
+            # The access token expired mid-run; log in again before the next journey
+            self.access_token = None
+        if method == 'GET' and 'ETag' in response.headers:
+            self.etags[path] = response.headers['ETag']
+        return response
+
+    async def get_json(self, path, endpoint, params=None):
+        """GET a list or detail; a 304 counts as success and returns None"""
+        if params:
+            path = f'{path}?{httpx.QueryParams(params)}'
+        response = await self.request('GET', path, endpoint)
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()
+
+    async def run(self, journeys, weights, think_time):
+        while True:
+            if self.access_token is None:
+                await self.login()
+            journey = self.rng.choices(journeys, weights)[0]
+            try:
+                await getattr(self, journey)()
+            except (ValueError, KeyError, TypeError) as e:
+                # An unexpected response body; count it and keep the user going
+                self.record(f'journey {journey}', 0, type(e).__name__)
+            await asyncio.sleep(self.rng.expovariate(1 / think_time) if think_time else 0)
+
+    async def login(self):
+        response = await self.request(
+            'POST', '/api/auth/login/', 'POST /api/auth/login/',
+            json={'email': self.email, 'password': self.password}
+        )
+        if response is None or response.status_code != 200:
+            # Back off so a failing login does not turn into a tight loop
+            await asyncio.sleep(1)
+            return
+        self.access_token = response.json()['access']
+        self.etags.clear()
+        integrations = await self.get_json('/api/integrations/', 'GET /api/integrations/')
+        if integrations is not None:
+            self.integration_ids = [
+                integration['id'] for integration in integrations if integration.get('status') == 'connected'
+            ]
+
+    async def dashboard(self):
+        await self.get_json('/api/integrations/stats/', 'GET /api/integrations/stats/')
+        await self.get_json('/api/integrations/', 'GET /api/integrations/')
+        await self.get_json('/api/integrations/timeline/', 'GET /api/integrations/timeline/')
+
+    async def _scroll(self, path, endpoint, pages):
+        for page in range(1, pages + 1):
+            data = await self.get_json(path, endpoint, {'page': page} if page > 1 else None)
+            if data is None or not data.get('next'):
+                return data
+            await asyncio.sleep(self.rng.uniform(0.2, 1.0))
+        return data
+
+    async def scroll_events(self):
+        await self._scroll('/api/integrations/events/', 'GET /api/integrations/events/', self.rng.randint(1, 5))
+
+    async def scroll_emails(self):
+        data = await self._scroll('/api/integrations/emails/', 'GET /api/integrations/emails/', self.rng.randint(1, 5))
+        results = (data or {}).get('results') or []
+        if results:
+            message = self.rng.choice(results)
+            await self.get_json(f"/api/integrations/emails/{message['id']}/", 'GET /api/integrations/emails/{id}/')
+
+    async def search(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        await self.get_json('/api/integrations/events/', 'GET /api/integrations/events/?search', {'search': term})
+        await self.get_json('/api/integrations/emails/', 'GET /api/integrations/emails/?search', {'search': term})
+
+    async def manual_sync(self):
+        if not self.integration_ids:
+            return
+        integration_id = self.rng.choice(self.integration_ids)
+        await self.request(
+            'POST', f'/api/integrations/{integration_id}/sync/', 'POST /api/integrations/{id}/sync/',
+            json={'sync_type': 'full'}
+        )
+
+    async def agent_chat(self):
+        response = await self.request(
+            'POST', '/api/agents/chat/', 'POST /api/agents/chat/',
+            json={
+                'message': self.rng.choice(['What is on my calendar today?', 'Summarise my unread email']),
+                'agent_type': self.options.agent_type,
+                'session_id': self.session_id,
+                'user_id': self.email,
+            }
+        )
+        if response is not None and response.status_code == 200:
+            self.session_id = response.json().get('session_id')
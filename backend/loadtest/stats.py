@@ -0,0 +1,144 @@
+import math
+from collections import Counter
+
+# Latencies are bucketed on a log scale with 2% resolution, so histograms
+# have a fixed size however long the run and merge across worker processes
+BUCKET_BASE = 1.02
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _bucket(ms):
+    return int(math.log(max(ms, 0.01), BUCKET_BASE))
+
+
+def _bucket_value(bucket):
+    return BUCKET_BASE ** (bucket + 0.5)
+
+
+class EndpointStats:
+    """Request count, errors and a latency histogram for one endpoint"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = Counter()
+        self.histogram = Counter()
+        self.max_ms = 0.0
+
+    def record(self, ms, error=None):
+        self.requests += 1
+        self.histogram[_bucket(ms)] += 1
+        self.max_ms = max(self.max_ms, ms)
+        if error:
+            self.errors[error] += 1
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.errors.update(other.errors)
+        self.histogram.update(other.histogram)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percent):
+        if not self.requests:
+            return None
+        rank = math.ceil(percent / 100 * self.requests)
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(_bucket_value(bucket), self.max_ms)
+        return self.max_ms
+
+    def as_dict(self, seconds):
+        errors = sum(self.errors.values())
+        return {
+            'requests': self.requests,
+            'rps': round(self.requests / seconds, 2) if seconds else None,
+            'errors': errors,
+            'error_rate': round(errors / self.requests, 4) if self.requests else 0.0,
+            'error_kinds': dict(self.errors),
+            **{f'p{percent}_ms': _round(self.percentile(percent)) for percent in PERCENTILES},
+            'max_ms': _round(self.max_ms),
+        }
+
+
+class StageStats:
+    """Everything measured while one load stage was running"""
+
+    def __init__(self, name, users, seconds):
+        self.name = name
+        self.users = users
+        self.seconds = seconds
+        self.endpoints = {}
+
+    def record(self, endpoint, ms, error=None):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        stats.record(ms, error)
+
+    def merge(self, other):
+        for endpoint, stats in other.endpoints.items():
+            self.endpoints.setdefault(endpoint, EndpointStats()).merge(stats)
+
+    def total(self):
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.merge(stats)
+        return total
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'users': self.users,
+            'seconds': self.seconds,
+            'total': self.total().as_dict(self.seconds),
+            'endpoints': {
+                endpoint: stats.as_dict(self.seconds) for endpoint, stats in sorted(self.endpoints.items())
+            },
+        }
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+def find_knee(stages):
+    """
+    Name the first stage where adding users stopped adding throughput.
+
+    That is where a resource saturated: throughput grew by less than half
+    as much as the user count, or more than 1% of requests failed.
+    """
+    previous = None
+    for stage in stages:
+        total = stage['total']
+        if total['error_rate'] > 0.01:
+            return f"{stage['stage']}: {total['error_rate']:.1%} of requests failed at {stage['users']} users"
+        if previous and previous['total']['rps'] and stage['users'] > previous['users']:
+            user_growth = stage['users'] / previous['users'] - 1
+            rps_growth = (total['rps'] or 0) / previous['total']['rps'] - 1
+            if rps_growth < user_growth / 2:
+                return (
+                    f"{stage['stage']}: {stage['users']} users gave {total['rps']} req/s, "
+                    f"{rps_growth:+.0%} for {user_growth:+.0%} users; p95 {total['p95_ms']} ms"
+                )
+        previous = stage
+    return None
+
+
+def format_table(stage):
+    """Render one stage as a fixed-width table, slowest endpoints first"""
+    header = f"{'endpoint':<48} {'reqs':>8} {'req/s':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    lines = [f"{stage['stage']} ({stage['users']} users, {stage['seconds']:.0f}s)", header]
+    rows = sorted(stage['endpoints'].items(), key=lambda item: -(item[1]['p95_ms'] or 0))
+    for endpoint, figures in rows + [('total', stage['total'])]:
+        lines.append(
+            f"{endpoint[:48]:<48} {figures['requests']:>8} {figures['rps'] or 0:>8.1f} "
+            f"{figures['error_rate'] * 100:>6.2f} {_cell(figures['p50_ms'])} {_cell(figures['p95_ms'])} "
+            f"{_cell(figures['p99_ms'])} {_cell(figures['max_ms'])}"
+        )
+    return '\n'.join(lines)
+
+
+def _cell(value):
+    return f'{value:>8.1f}' if value is not None else f"{'-':>8}"
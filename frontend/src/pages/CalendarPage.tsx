@@ -35,6 +35,7 @@ const CalendarPage: React.FC = () => {
       const params: any = {
         page: pagination.page,
         page_size: 50,
+        dedupe: true,
       };
 
       if (filters.provider) params.provider = filters.provider;
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Integration, IntegrationStats, Provider, CalendarEvent, EmailMessage, SyncLog, OAuthCallbackData, ManualSyncData, GitHubRepository, GitHubRepositoryCreateData, GitHubBranch, GitHubCommit, GitHubCollaborator } from '../types/integrations';
+import { Integration, IntegrationStats, Provider, CalendarEvent, EmailMessage, SyncLog, SyncMetricsSummary, SlackChannel, SlackMessage, SlackNotificationSettings, SlackNotificationStats, TimelineEntry, CalendarFeedToken, OAuthCallbackData, ManualSyncData, GitHubRepository, GitHubRepositoryCreateData, GitHubBranch, GitHubCommit, GitHubCollaborator } from '../types/integrations';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api';
 
@@ -73,6 +73,7 @@ export const integrationsApi = {
     start_date?: string;
     end_date?: string;
     search?: string;
+    dedupe?: boolean;
     page?: number;
     page_size?: number;
   }) => {
@@ -90,6 +91,22 @@ export const integrationsApi = {
     return api.get<CalendarEvent>(`/events/${eventId}/`);
   },
 
+  // Calendar feed subscriptions
+  getCalendarFeeds: () => {
+    const api = createAuthenticatedRequest();
+    return api.get<CalendarFeedToken[]>('/calendar-feeds/');
+  },
+
+  createCalendarFeed: (name?: string) => {
+    const api = createAuthenticatedRequest();
+    return api.post<CalendarFeedToken>('/calendar-feeds/', { name });
+  },
+
+  revokeCalendarFeed: (tokenId: number) => {
+    const api = createAuthenticatedRequest();
+    return api.delete<{ message: string }>(`/calendar-feeds/${tokenId}/`);
+  },
+
   // Email messages
   getEmailMessages: (params?: {
     provider?: string;
@@ -130,6 +147,76 @@ export const integrationsApi = {
     }>('/sync-logs/', { params });
   },
 
+  getSyncMetrics: (params?: { days?: number; sync_type?: string }) => {
+    const api = createAuthenticatedRequest();
+    return api.get<SyncMetricsSummary>('/sync-logs/metrics/', { params });
+  },
+
+  // Slack channels and messages
+  getSlackChannels: (params?: {
+    member?: boolean;
+    search?: string;
+    page?: number;
+    page_size?: number;
+  }) => {
+    const api = createAuthenticatedRequest();
+    return api.get<{
+      count: number;
+      next: string | null;
+      previous: string | null;
+      results: SlackChannel[];
+    }>('/slack/channels/', { params });
+  },
+
+  getSlackMessages: (channelId: number, params?: {
+    search?: string;
+    page?: number;
+    page_size?: number;
+  }) => {
+    const api = createAuthenticatedRequest();
+    return api.get<{
+      count: number;
+      next: string | null;
+      previous: string | null;
+      results: SlackMessage[];
+    }>(`/slack/channels/${channelId}/messages/`, { params });
+  },
+
+  getSlackNotificationSettings: () => {
+    const api = createAuthenticatedRequest();
+    return api.get<SlackNotificationSettings>('/slack/notifications/settings/');
+  },
+
+  updateSlackNotificationSettings: (settings: SlackNotificationSettings) => {
+    const api = createAuthenticatedRequest();
+    return api.put<SlackNotificationSettings>('/slack/notifications/settings/', settings);
+  },
+
+  sendSlackTestNotification: () => {
+    const api = createAuthenticatedRequest();
+    return api.post<{ id: number; channel: string }>('/slack/notifications/test/');
+  },
+
+  getSlackNotificationStats: () => {
+    const api = createAuthenticatedRequest();
+    return api.get<SlackNotificationStats>('/slack/notifications/stats/');
+  },
+
+  // Activity timeline
+  getTimeline: (params?: {
+    types?: string;
+    provider?: string;
+    dedupe?: boolean;
+    cursor?: string;
+    limit?: number;
+  }) => {
+    const api = createAuthenticatedRequest();
+    return api.get<{
+      results: TimelineEntry[];
+      next_cursor: string | null;
+    }>('/timeline/', { params });
+  },
+
   // GitHub Repositories
   getGitHubRepositories: (params?: {
     sort?: 'created' | 'updated' | 'pushed' | 'full_name';
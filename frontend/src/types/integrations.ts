@@ -32,7 +32,7 @@ export interface Provider {
 }
 
 export interface CalendarEvent {
-  id: number;
+  id: number | string;
   integration: number;
   provider_event_id: string;
   title: string;
@@ -61,17 +61,113 @@ export interface EmailMessage {
   updated_at: string;
 }
 
+export type SyncPhase = 'token_refresh' | 'fetch' | 'parse' | 'db_write' | 'other';
+
+export interface SyncMetrics {
+  duration_ms: number;
+  phases: Record<SyncPhase, number>;
+  http_calls: number;
+  bytes_downloaded: number;
+  retries: number;
+  rate_limit_wait_ms: number;
+  peak_memory_bytes?: number;
+}
+
+export interface Percentiles {
+  p50: number | null;
+  p95: number | null;
+  p99: number | null;
+  max: number | null;
+}
+
+export interface ProviderSyncMetrics {
+  syncs: number;
+  failed: number;
+  duration_ms: Percentiles;
+  phases: Record<SyncPhase, Percentiles>;
+  http_calls?: Percentiles;
+  bytes_downloaded?: Percentiles;
+  retries?: Percentiles;
+  rate_limit_wait_ms?: Percentiles;
+  peak_memory_bytes?: Percentiles;
+}
+
+export interface SyncMetricsSummary {
+  window_days: number;
+  providers: Record<string, ProviderSyncMetrics>;
+}
+
 export interface SyncLog {
   id: number;
   integration: number;
-  sync_type: 'calendar' | 'email' | 'full';
-  status: 'pending' | 'running' | 'completed' | 'failed';
-  items_synced: number;
+  sync_type: 'calendar' | 'email' | 'messages' | 'full';
+  status: 'started' | 'completed' | 'failed' | 'partial';
+  items_processed: number;
+  items_created: number;
+  items_updated: number;
+  items_deleted: number;
   error_message: string | null;
+  metrics: Partial<SyncMetrics>;
   started_at: string;
   completed_at: string | null;
 }
 
+export interface TimelineEntry {
+  type: 'event' | 'email' | 'sync';
+  timestamp: string;
+  item: CalendarEvent | EmailMessage | SyncLog;
+}
+
+export interface CalendarFeedToken {
+  id: number;
+  name: string;
+  token: string;
+  feed_url: string;
+  is_active: boolean;
+  last_used_at: string | null;
+  created_at: string;
+}
+
+export interface SlackChannel {
+  id: number;
+  integration: number;
+  channel_id: string;
+  name: string;
+  is_private: boolean;
+  is_archived: boolean;
+  is_member: boolean;
+  topic: string;
+  purpose: string;
+  num_members: number;
+  synced_at: string;
+}
+
+export interface SlackMessage {
+  id: number;
+  channel: number;
+  channel_name: string;
+  ts: string;
+  thread_ts: string;
+  slack_user_id: string;
+  text: string;
+  subtype: string;
+  reply_count: number;
+  sent_at: string;
+  edited_at: string | null;
+}
+
+export interface SlackNotificationSettings {
+  enabled: boolean;
+  channel: string;
+  events: Array<'sync_completed' | 'sync_failed'>;
+}
+
+export interface SlackNotificationStats {
+  window_seconds: number;
+  counts: { pending: number; sent: number; failed: number };
+  latency_ms: { p50: number | null; p95: number | null; p99: number | null; max: number | null };
+}
+
 export interface OAuthCallbackData {
   code: string;
   provider: string;
@@ -79,7 +175,7 @@ export interface OAuthCallbackData {
 }
 
 export interface ManualSyncData {
-  sync_type: 'calendar' | 'email' | 'full';
+  sync_type: 'calendar' | 'email' | 'messages' | 'full';
 }
 
 export interface GitHubRepository {